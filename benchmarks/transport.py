@@ -0,0 +1,233 @@
+"""Benchmarks of the transport and serialization hot paths of grpc4bmi.
+
+Serves :class:`test.fake_models.SyntheticModel` with a :class:`grpc4bmi.bmi_grpc_server.BmiServer`
+in this process and/or in a ``run-bmi-server`` subprocess and measures latency and throughput of
+value and grid calls for a range of array sizes and types.
+
+Run from the root of the repository with
+
+.. code-block:: sh
+
+    python -m benchmarks.transport --output before.json
+    # change the wire format
+    python -m benchmarks.transport --output after.json
+    python -m benchmarks.transport --compare before.json after.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent import futures
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+import grpc
+import numpy
+
+from grpc4bmi import bmi_pb2_grpc
+from grpc4bmi.bmi_client_subproc import BmiClientSubProcess
+from grpc4bmi.bmi_grpc_client import BmiClient
+from grpc4bmi.bmi_grpc_server import BmiServer
+from grpc4bmi.constants import GRPC_MAX_MESSAGE_LENGTH
+from grpc4bmi.reserve import reserve_values
+from test.fake_models import SyntheticModel
+
+try:
+    from importlib.metadata import version
+except ImportError:
+    # Python 3.7
+    from pkg_resources import get_distribution
+
+    def version(distribution_name: str) -> str:
+        return get_distribution(distribution_name).version
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VAR = 'plate_surface__temperature'
+DEFAULT_SIZES = [1, 10 ** 3, 10 ** 5, 10 ** 6, 10 ** 7]
+DEFAULT_DTYPES = ['float64', 'float32', 'int64', 'int32']
+MODES = ['inprocess', 'subprocess']
+
+
+@contextmanager
+def inprocess_client() -> Iterator[BmiClient]:
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=1))
+    bmi_pb2_grpc.add_BmiServiceServicer_to_server(BmiServer(SyntheticModel()), server)
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+    try:
+        yield BmiClient(BmiClient.create_grpc_channel(port), timeout=10)
+    finally:
+        server.stop(0)
+
+
+@contextmanager
+def subprocess_client() -> Iterator[BmiClient]:
+    # The test package of the standard library shadows our test directory, so add test directory itself to path
+    client = BmiClientSubProcess('fake_models.SyntheticModel', path=os.path.join(ROOT, 'test'), timeout=30)
+    try:
+        yield client
+    finally:
+        del client
+
+
+def summarize(latencies: List[float], nbytes: int) -> Dict[str, float]:
+    """Latency percentiles in seconds and throughput in bytes per second."""
+    latencies = numpy.array(latencies)
+    p50, p90, p99 = numpy.percentile(latencies, [50, 90, 99])
+    return {
+        'calls': len(latencies),
+        'latency_min': float(latencies.min()),
+        'latency_p50': float(p50),
+        'latency_p90': float(p90),
+        'latency_p99': float(p99),
+        'latency_max': float(latencies.max()),
+        'bytes_per_call': nbytes,
+        'throughput': nbytes * len(latencies) / float(latencies.sum()),
+    }
+
+
+def measure(call: Callable[[], object], nbytes: int, repeat: int, max_seconds: float) -> Dict[str, float]:
+    """Calls ``call`` ``repeat`` times or until max_seconds have passed, but at least 3 times."""
+    latencies = []
+    deadline = time.perf_counter() + max_seconds
+    while len(latencies) < repeat and (len(latencies) < 3 or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies, nbytes)
+
+
+def cases(client: BmiClient, size: int, dtype: str) -> Dict[str, Callable[[], object]]:
+    dest = reserve_values(client, VAR)
+    values = numpy.ones(size, dtype=dtype)
+    nindices = min(size, 1000)
+    indices = numpy.random.default_rng(42).choice(size, nindices, replace=False)
+    dest_at_indices = numpy.empty(nindices, dtype=dtype)
+    grid = client.get_var_grid(VAR)
+    shape = numpy.empty(1, dtype=numpy.int64)
+    spacing = numpy.empty(1, dtype=numpy.float64)
+    origin = numpy.empty(1, dtype=numpy.float64)
+    return {
+        'get_value': lambda: client.get_value(VAR, dest),
+        'set_value': lambda: client.set_value(VAR, values),
+        'get_value_at_indices': lambda: client.get_value_at_indices(VAR, dest_at_indices, indices),
+        'set_value_at_indices': lambda: client.set_value_at_indices(VAR, indices, dest_at_indices),
+        'get_grid_shape': lambda: client.get_grid_shape(grid, shape),
+        'get_grid_spacing': lambda: client.get_grid_spacing(grid, spacing),
+        'get_grid_origin': lambda: client.get_grid_origin(grid, origin),
+        'get_var_nbytes': lambda: client.get_var_nbytes(VAR),
+    }
+
+
+def payload(name: str, size: int, itemsize: int) -> int:
+    if name in ('get_value', 'set_value'):
+        return size * itemsize
+    if name.endswith('at_indices'):
+        return min(size, 1000) * itemsize
+    return 0
+
+
+def run(modes: List[str], sizes: List[int], dtypes: List[str], methods: Optional[List[str]],
+        repeat: int, max_seconds: float) -> List[Dict[str, object]]:
+    results = []
+    clients = {'inprocess': inprocess_client, 'subprocess': subprocess_client}
+    with tempfile.TemporaryDirectory(prefix='grpc4bmi-bench') as config_dir:
+        for mode in modes:
+            with clients[mode]() as client:
+                for dtype in dtypes:
+                    for size in sizes:
+                        config_file = os.path.join(config_dir, f'{dtype}-{size}.json')
+                        with open(config_file, 'w') as f:
+                            json.dump({'size': size, 'dtype': dtype}, f)
+                        client.initialize(config_file)
+                        itemsize = numpy.dtype(dtype).itemsize
+                        # get_value of arrays bigger than a message is split into get_value_at_indices calls
+                        path = 'single' if size * itemsize <= GRPC_MAX_MESSAGE_LENGTH else 'chunked'
+                        for name, call in cases(client, size, dtype).items():
+                            if methods and name not in methods:
+                                continue
+                            result = {'mode': mode, 'method': name, 'dtype': dtype, 'size': size, 'path': path}
+                            try:
+                                result.update(measure(call, payload(name, size, itemsize), repeat, max_seconds))
+                            except grpc.RpcError as e:
+                                result['error'] = f'{e.code().name}: {e.details()}'
+                            except Exception as e:
+                                result['error'] = repr(e)
+                            results.append(result)
+                            print(format_result(result), file=sys.stderr)
+    return results
+
+
+def format_result(result: Dict[str, object]) -> str:
+    case = f"{result['mode']:10} {result['method']:22} {result['dtype']:8} {result['size']:>10} {result['path']:8}"
+    if 'error' in result:
+        return f"{case} error: {result['error']}"
+    return f"{case} p50={result['latency_p50'] * 1000:10.3f}ms p99={result['latency_p99'] * 1000:10.3f}ms " \
+           f"{result['throughput'] / 1e6:10.1f}MB/s"
+
+
+def environment() -> Dict[str, str]:
+    return {
+        'grpc4bmi': version('grpc4bmi'),
+        'grpcio': grpc.__version__,
+        'numpy': numpy.__version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def compare(before_file: str, after_file: str):
+    """Prints change in median latency for each case present in both result files."""
+    def by_case(path):
+        with open(path) as f:
+            results = json.load(f)['results']
+        return {(r['mode'], r['method'], r['dtype'], r['size']): r for r in results if 'error' not in r}
+
+    before, after = by_case(before_file), by_case(after_file)
+    for case in sorted(before.keys() & after.keys()):
+        old, new = before[case]['latency_p50'], after[case]['latency_p50']
+        change = (new - old) / old * 100 if old else math.nan
+        mode, method, dtype, size = case
+        print(f'{mode:10} {method:22} {dtype:8} {size:>10} '
+              f'{old * 1000:10.3f}ms -> {new * 1000:10.3f}ms {change:+7.1f}%')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Benchmark grpc4bmi transport and serialization',
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--modes', nargs='+', default=MODES, choices=MODES,
+                        help='Where to run the server')
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES,
+                        help='Number of elements of variable, up to 100000000')
+    parser.add_argument('--dtypes', nargs='+', default=DEFAULT_DTYPES, help='Types of variable')
+    parser.add_argument('--methods', nargs='+', default=None, help='Only benchmark these methods')
+    parser.add_argument('--repeat', type=int, default=50, help='Maximum number of calls per case')
+    parser.add_argument('--max-seconds', type=float, default=2.0,
+                        help='Stop repeating a case after this many seconds, a case is run at least 3 times')
+    parser.add_argument('--output', '-o', default=None, help='JSON file to write results to')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'),
+                        help='Compare two result files instead of running benchmarks')
+    return parser
+
+
+def main(argv=sys.argv[1:]):
+    args = build_parser().parse_args(argv)
+    if args.compare:
+        compare(*args.compare)
+        return
+    results = run(args.modes, args.sizes, args.dtypes, args.methods, args.repeat, args.max_seconds)
+    document = {'environment': environment(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(document, f, indent=2)
+    else:
+        json.dump(document, sys.stdout, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Accumulate values of variables over time steps on the server, like a monthly mean or an annual maximum.
+
+An accumulator is updated in place after each time step, so a client only has to fetch it once per period instead of
+fetching the values of each time step. NaN values are ignored.
+"""
+from typing import Dict, NamedTuple, Optional
+
+import numpy
+
+from grpc4bmi.reserve import reserve_values
+
+ACCUMULATIONS = ('mean', 'sum', 'min', 'max')
+
+
+class AccumulatedValues(NamedTuple):
+    values: numpy.ndarray
+    #: Model time at which accumulation started
+    start_time: float
+    #: Model time of last accumulated time step
+    end_time: float
+    #: Number of accumulated time steps
+    steps: int
+
+
+class Accumulator(object):
+    """Running mean, sum, minimum or maximum of a variable.
+
+    Args:
+        variable: Name of variable
+        operation: One of :data:`ACCUMULATIONS`
+        start_time: Model time at which accumulation starts
+        period: If larger than zero then every period of model time the accumulation is completed and a new one is
+            started. The last completed accumulation is kept in :attr:`completed`.
+    """
+
+    def __init__(self, variable: str, operation: str, start_time: float, period: float = 0.0):
+        if operation not in ACCUMULATIONS:
+            raise ValueError(f'Unknown accumulation {operation}, choose from {", ".join(ACCUMULATIONS)}')
+        if period < 0:
+            raise ValueError(f'Period should not be negative, got {period}')
+        self.variable = variable
+        self.operation = operation
+        self.period = period
+        self.completed: Optional[AccumulatedValues] = None
+        #: Accumulation returned by the last :func:`take`
+        self.taken: Optional[AccumulatedValues] = None
+        self._reset(start_time)
+
+    def _reset(self, start_time: float):
+        self.start_time = start_time
+        self.end_time = start_time
+        self.steps = 0
+        self.total: Optional[numpy.ndarray] = None
+        self.count: Optional[numpy.ndarray] = None
+
+    def add(self, values: numpy.ndarray, time: float):
+        """Adds values of a time step at model time."""
+        if self.period > 0 and time > self.start_time + self.period:
+            if self.steps:
+                self.completed = self.result()
+            # Skip periods without time steps, so periods stay aligned with start time
+            periods = numpy.floor((time - self.start_time) / self.period)
+            if time == self.start_time + periods * self.period:
+                periods -= 1
+            self._reset(self.start_time + periods * self.period)
+        valid = ~numpy.isnan(values) if values.dtype.kind == 'f' else numpy.ones(values.shape, dtype=bool)
+        if self.total is None:
+            self.total = numpy.full(values.shape, numpy.nan if self.operation in ('min', 'max') else 0.0)
+            self.count = numpy.zeros(values.shape, dtype=numpy.int64)
+        if self.operation in ('mean', 'sum'):
+            numpy.add(self.total, values, out=self.total, where=valid)
+        elif self.operation == 'min':
+            numpy.fmin(self.total, values, out=self.total)
+        else:
+            numpy.fmax(self.total, values, out=self.total)
+        self.count += valid
+        self.steps += 1
+        self.end_time = time
+
+    def result(self) -> AccumulatedValues:
+        """Current accumulation."""
+        if self.total is None:
+            values = numpy.empty(0)
+        elif self.operation == 'mean':
+            with numpy.errstate(invalid='ignore', divide='ignore'):
+                values = self.total / self.count
+        else:
+            values = self.total.copy()
+        return AccumulatedValues(values, self.start_time, self.end_time, self.steps)
+
+    def reset(self):
+        """Starts a new accumulation at the time of the last accumulated time step."""
+        self._reset(self.end_time)
+
+    def take(self) -> AccumulatedValues:
+        """Returns current accumulation and starts a new one."""
+        self.taken = self.result()
+        self.reset()
+        return self.taken
+
+
+def accumulate(accumulators: Dict[str, Accumulator], model, time: float):
+    """Adds current values of model to accumulators, fetching each variable once."""
+    values = {}
+    for accumulator in accumulators.values():
+        name = accumulator.variable
+        if name not in values:
+            values[name] = model.get_value(name, reserve_values(model, name))
+        accumulator.add(values[name], time)
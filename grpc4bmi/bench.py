@@ -0,0 +1,253 @@
+"""Load generator for a running BMI gRPC server.
+
+Connects to a server, discovers its variables and grids and replays a workload from one or more concurrent clients.
+Reports latency histograms and throughput per method.
+"""
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy
+from bmipy import Bmi
+
+from grpc4bmi.bmi_grpc_client import BmiClient
+from grpc4bmi.metrics import LATENCY_BUCKETS, ClientMetrics
+from grpc4bmi.reserve import reserve_values
+
+log = logging.getLogger(__name__)
+
+WORKLOADS = ['step', 'fetch', 'indices', 'metadata']
+
+
+class Variable(NamedTuple):
+    name: str
+    grid: int
+    type: str
+    size: int
+    is_output: bool
+
+
+def discover(model: Bmi) -> List[Variable]:
+    """Describes the input and output variables of a model."""
+    inputs = set(model.get_input_var_names())
+    outputs = set(model.get_output_var_names())
+    variables = []
+    for name in sorted(inputs | outputs):
+        itemsize = model.get_var_itemsize(name)
+        size = model.get_var_nbytes(name) // itemsize if itemsize else 0
+        variables.append(Variable(name, model.get_var_grid(name), model.get_var_type(name), size, name in outputs))
+    return variables
+
+
+def _fetch(model: Bmi, variables: List[Variable], dests: Dict[str, numpy.ndarray]):
+    for variable in variables:
+        if variable.is_output:
+            model.get_value(variable.name, dests[variable.name])
+
+
+def build_workload(name: str, model: Bmi, variables: List[Variable], indices: int, seed: int) -> Callable[[], None]:
+    """Returns a callable which runs a single iteration of the named workload.
+
+    Workloads:
+
+    * step: update followed by get_value of all output variables
+    * fetch: get_value of all output variables
+    * indices: get_value_at_indices of random indices of all output variables
+    * metadata: time, variable and grid information calls
+    """
+    dests = {v.name: reserve_values(model, v.name) for v in variables if v.is_output}
+    if name == 'step':
+        def step():
+            model.update()
+            _fetch(model, variables, dests)
+        return step
+    if name == 'fetch':
+        return lambda: _fetch(model, variables, dests)
+    if name == 'indices':
+        rng = numpy.random.default_rng(seed)
+        outputs = [v for v in variables if v.is_output and v.size > 0]
+        subsets = {v.name: numpy.empty(min(indices, v.size), dtype=dests[v.name].dtype) for v in outputs}
+
+        def read_indices():
+            for variable in outputs:
+                subset = subsets[variable.name]
+                inds = rng.choice(variable.size, subset.size, replace=False)
+                model.get_value_at_indices(variable.name, subset, inds)
+        return read_indices
+    if name == 'metadata':
+        grids = sorted({v.grid for v in variables})
+
+        def metadata():
+            model.get_current_time()
+            model.get_time_step()
+            for variable in variables:
+                model.get_var_grid(variable.name)
+                model.get_var_type(variable.name)
+                model.get_var_units(variable.name)
+                model.get_var_itemsize(variable.name)
+                model.get_var_nbytes(variable.name)
+            for grid in grids:
+                model.get_grid_type(grid)
+                model.get_grid_rank(grid)
+                model.get_grid_size(grid)
+        return metadata
+    raise ValueError(f'Unknown workload {name}, choose from {WORKLOADS}')
+
+
+class BenchResult(NamedTuple):
+    seconds: float
+    iterations: int
+    errors: List[str]
+    metrics: ClientMetrics
+
+
+def run(connect: Callable[[], BmiClient], workload: str, clients: int = 1, duration: float = 10.0,
+        iterations: Optional[int] = None, indices: int = 100) -> BenchResult:
+    """Runs a workload from concurrent clients.
+
+    The clock starts once all clients have set up their workload, so the setup is not measured.
+
+    Args:
+        connect: Callable which returns a new client connected to the server
+        workload: Name of workload, see :func:`build_workload`
+        clients: Number of concurrent clients, each with its own connection
+        duration: Seconds to run the workload for
+        iterations: Number of iterations per client. If set then duration is ignored
+        indices: Number of random indices per variable for the indices workload
+    """
+    metrics = ClientMetrics()
+    models = [connect() for _ in range(clients)]
+    variables = discover(models[0])
+    counts = [0] * clients
+    errors = []
+    clock = {}
+
+    def start_clock():
+        clock['start'] = time.perf_counter()
+        clock['deadline'] = clock['start'] + duration
+
+    ready = threading.Barrier(clients, action=start_clock)
+
+    def load(number):
+        model = models[number]
+        try:
+            iteration = build_workload(workload, model, variables, indices, seed=number)
+        except Exception as e:
+            log.exception(f'Client {number} failed to set up workload')
+            errors.append(repr(e))
+            iteration = None
+        ready.wait()
+        if iteration is None:
+            return
+        model.instrument(metrics)
+        deadline = clock['deadline']
+        try:
+            while (counts[number] < iterations) if iterations is not None else (time.perf_counter() < deadline):
+                iteration()
+                counts[number] += 1
+        except Exception as e:
+            log.exception(f'Client {number} failed')
+            errors.append(repr(e))
+
+    threads = [threading.Thread(target=load, args=(number,), name=f'bench-{number}') for number in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return BenchResult(time.perf_counter() - clock['start'], sum(counts), errors, metrics)
+
+
+def _bucket_counts(counts: Sequence[int]) -> Dict[str, int]:
+    return {('+Inf' if bound == float('inf') else repr(bound)): int(count)
+            for bound, count in zip(LATENCY_BUCKETS, counts)}
+
+
+def report(result: BenchResult) -> Dict[str, object]:
+    """Summary of run with latency percentiles, histogram and throughput per method."""
+    methods = {}
+    summaries = result.metrics.as_dict()
+    buckets = result.metrics.latency_buckets()
+    for method, summary in summaries.items():
+        summary['calls_per_second'] = summary['calls'] / result.seconds
+        summary['bytes_per_second'] = (summary['request_bytes'] + summary['response_bytes']) / result.seconds
+        summary['histogram'] = _bucket_counts(buckets[method])
+        methods[method] = summary
+    return {
+        'seconds': result.seconds,
+        'iterations': result.iterations,
+        'iterations_per_second': result.iterations / result.seconds,
+        'errors': result.errors,
+        'methods': methods,
+    }
+
+
+def format_report(summary: Dict[str, object]) -> str:
+    lines = [f"{summary['iterations']} iterations in {summary['seconds']:.2f}s "
+             f"({summary['iterations_per_second']:.1f}/s)"]
+    for error in summary['errors']:
+        lines.append(f'error: {error}')
+    for method, m in summary['methods'].items():
+        lines.append(f"\n{method}: {m['calls']} calls, {m['errors']} errors, {m['calls_per_second']:.1f} calls/s, "
+                     f"{m['bytes_per_second'] / 1e6:.2f} MB/s")
+        lines.append(f"  p50={m['latency_p50'] * 1000:.3f}ms p90={m['latency_p90'] * 1000:.3f}ms "
+                     f"p99={m['latency_p99'] * 1000:.3f}ms max={m['latency_max'] * 1000:.3f}ms")
+        peak = max(m['histogram'].values())
+        for bound, count in m['histogram'].items():
+            if count:
+                bar = '#' * max(1, round(40 * count / peak))
+                lines.append(f'  <= {bound:>7}s {count:>8} {bar}')
+    return '\n'.join(lines)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Load generator for a running BMI GRPC server",
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("--host", default="localhost", help="Host of the BMI GRPC server")
+    parser.add_argument("--port", "-p", metavar="N", default=0, type=int,
+                        help="Network port of the BMI GRPC server. "
+                             "If 0, uses the BMI_PORT environment variable or 50051")
+    parser.add_argument("--initialize", metavar="CONFIG_FILE", default=None,
+                        help="Initialize model with config file before running workload. "
+                             "Config file path is relative to server")
+    parser.add_argument("--workload", "-w", default="fetch", choices=WORKLOADS,
+                        help="Workload to replay. "
+                             "step: update and fetch all output variables; "
+                             "fetch: get all output variables; "
+                             "indices: get random indices of all output variables; "
+                             "metadata: time, variable and grid information calls")
+    parser.add_argument("--clients", "-c", default=1, type=int, help="Number of concurrent clients")
+    parser.add_argument("--duration", "-d", default=10.0, type=float, help="Seconds to run workload")
+    parser.add_argument("--iterations", "-i", default=None, type=int,
+                        help="Iterations per client, if set then duration is ignored")
+    parser.add_argument("--indices", default=100, type=int,
+                        help="Number of random indices per variable for indices workload")
+    parser.add_argument("--timeout", default=30, type=float, help="Seconds to wait for server to be ready")
+    parser.add_argument("--output", "-o", default=None, help="Write report as JSON to this file")
+    return parser
+
+
+def main(argv=sys.argv[1:]):
+    args = build_parser().parse_args(argv)
+
+    def connect():
+        return BmiClient(BmiClient.create_grpc_channel(port=args.port, host=args.host), timeout=args.timeout)
+
+    if args.initialize is not None:
+        connect().initialize(args.initialize)
+    result = run(connect, args.workload, clients=args.clients, duration=args.duration,
+                 iterations=args.iterations, indices=args.indices)
+    summary = report(result)
+    print(format_report(summary))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
+    if result.errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
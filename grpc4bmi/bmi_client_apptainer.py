@@ -10,7 +10,7 @@ from packaging.specifiers import SpecifierSet
 from packaging.version import Version
 from typeguard import typechecked
 
-from grpc4bmi.bmi_grpc_client import BmiClient
+from grpc4bmi.bmi_grpc_client import BmiClient, READINESS_CHANNEL_OPTIONS, wait_until_ready
 from grpc4bmi.exceptions import ApptainerVersionException, DeadContainerException
 
 SUPPORTED_APPTAINER_VERSIONS = '>=1.0.0-rc.2'  # First apptainer release with binaries
@@ -78,14 +78,16 @@ class BmiClientApptainer(BmiClient):
               # After checking output in work_dir, clean up
               work_dir.cleanup()
 
-        delay (int): Seconds to wait for Apptainer container to startup, before connecting to it
+        delay (int): Seconds to wait for Apptainer container to startup, before polling it for readiness.
 
-            Increase when container takes a long time to startup.
+            The client polls the container until the server inside answers, so a delay is normally not needed.
 
         timeout (int): Seconds to wait for gRPC client to connect to server.
 
             By default will try forever to connect to gRPC server inside container.
             Set to low number to escape endless wait.
+            When the container exits while waiting a :class:`grpc4bmi.exceptions.DeadContainerException`
+            is raised.
 
         capture_logs (bool): Whether to capture stdout and stderr of container .
 
@@ -238,14 +240,19 @@ class BmiClientApptainer(BmiClient):
             stdout = subprocess.DEVNULL
         self.container = subprocess.Popen(args, preexec_fn=os.setsid, stderr=subprocess.STDOUT, stdout=stdout)
         time.sleep(delay)
-        returncode = self.container.poll()
-        if returncode is not None:
-            raise DeadContainerException(
-                f'apptainer container {image} prematurely exited with code {returncode}',
-                returncode,
-                self.logs()
-            )
-        super(BmiClientApptainer, self).__init__(BmiClient.create_grpc_channel(port=port, host=host), timeout=timeout)
+
+        def raise_if_dead():
+            returncode = self.container.poll()
+            if returncode is not None:
+                raise DeadContainerException(
+                    f'apptainer container {image} prematurely exited with code {returncode}',
+                    returncode,
+                    self.logs()
+                )
+
+        channel = BmiClient.create_grpc_channel(port=port, host=host, options=READINESS_CHANNEL_OPTIONS)
+        wait_until_ready(channel, timeout=timeout, is_alive=raise_if_dead)
+        super(BmiClientApptainer, self).__init__(channel, timeout=timeout)
 
     def __del__(self):
         if hasattr(self, "container"):
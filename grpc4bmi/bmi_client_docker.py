@@ -4,10 +4,11 @@ from os.path import abspath
 from typing import Iterable
 
 import docker
+import docker.errors
 from docker.models.containers import Container
 from typeguard import typechecked
 
-from grpc4bmi.bmi_grpc_client import BmiClient
+from grpc4bmi.bmi_grpc_client import BmiClient, READINESS_CHANNEL_OPTIONS, wait_until_ready
 from grpc4bmi.exceptions import DeadContainerException
 
 
@@ -34,7 +35,10 @@ class BmiClientDocker(BmiClient):
 
             Enable to get logs when container dies prematurely.
 
-        delay (int): Seconds to wait for Docker container to startup, before connecting to it
+        delay (int): Seconds to wait for Docker container to startup, before polling it for readiness.
+
+            The client polls the container until the server inside answers, so a delay is normally not needed.
+
         timeout (int): Seconds to wait for gRPC client to connect to server
         extra_volumes (Dict[str,Dict]): Extra volumes to attach to Docker container.
             The key is either the hosts path or a volume name and the value is a dictionary with the keys:
@@ -48,12 +52,12 @@ class BmiClientDocker(BmiClient):
 
                 {'/data/shared/forcings/': {'bind': '/forcings', 'mode': 'ro'}}
 
-            Increase when container takes a long time to startup.
-
         timeout (int): Seconds to wait for gRPC client to connect to server.
 
             By default will try forever to connect to gRPC server inside container.
             Set to low number to escape endless wait.
+            When the container exits while waiting a :class:`grpc4bmi.exceptions.DeadContainerException`
+            is raised.
 
     See :py:class:`grpc4bmi.bmi_client_apptainer.BmiClientApptainer` for examples using `input_dirs` and `work_dir`.
     """
@@ -61,7 +65,7 @@ class BmiClientDocker(BmiClient):
     @typechecked
     def __init__(self, image: str, work_dir: str, image_port=50051, host=None,
                  input_dirs: Iterable[str] = tuple(),
-                 user=os.getuid(), remove=False, delay=5,
+                 user=os.getuid(), remove=False, delay=0,
                  timeout=None):
         if type(input_dirs) == str:
             msg = f'type of argument "input_dirs" must be collections.abc.Iterable; ' \
@@ -90,16 +94,23 @@ class BmiClientDocker(BmiClient):
                                                remove=remove,
                                                detach=True)
         time.sleep(delay)
-        if not remove:
-            # Only able to reload, read logs on exited container when remove=False
-            self.container.reload()
+
+        def raise_if_dead():
+            try:
+                self.container.reload()
+            except docker.errors.NotFound:
+                # Container started with remove=True is gone together with its exit code and logs
+                msg = f'Failed to start Docker container with image {image}, container was removed'
+                raise DeadContainerException(msg, None, '')
             if self.container.status == 'exited':
                 exitcode = self.container.attrs["State"]["ExitCode"]
                 logs = self.logs()
                 msg = f'Failed to start Docker container with image {image}, Container log: {logs}'
                 raise DeadContainerException(msg, exitcode, logs)
 
-        super(BmiClientDocker, self).__init__(BmiClient.create_grpc_channel(port=port, host=host), timeout=timeout)
+        channel = BmiClient.create_grpc_channel(port=port, host=host, options=READINESS_CHANNEL_OPTIONS)
+        wait_until_ready(channel, timeout=timeout, is_alive=raise_if_dead)
+        super(BmiClientDocker, self).__init__(channel, timeout=timeout)
 
     def __del__(self):
         if hasattr(self, 'container'):
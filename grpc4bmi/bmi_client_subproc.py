@@ -2,7 +2,8 @@ import os
 import subprocess
 import time
 
-from grpc4bmi.bmi_grpc_client import BmiClient
+from grpc4bmi.bmi_grpc_client import BmiClient, READINESS_CHANNEL_OPTIONS, wait_until_ready
+from grpc4bmi.exceptions import DeadContainerException
 
 
 class BmiClientSubProcess(BmiClient):
@@ -11,11 +12,14 @@ class BmiClientSubProcess(BmiClient):
     BMI GRPC client that owns its server process, i.e. initiates and destroys the BMI server upon its own construction or
     respective destruction. The server is a forked subprocess running the run_server command.
 
+    The client polls the server until it answers, when the server process exits before that a
+    :class:`grpc4bmi.exceptions.DeadContainerException` is raised.
+
     >>> from grpc4bmi.bmi_client_subproc import BmiClientSubProcess
     >>> mymodel = BmiClientSubProcess(<PACKAGE>.<MODULE>.<CLASS>)
     """
 
-    def __init__(self, module_name, path=None, timeout=None, delay=1):
+    def __init__(self, module_name, path=None, timeout=None, delay=0):
         host = "localhost"
         port = BmiClient.get_unique_port(host)
         name_options = ["--name", module_name]
@@ -23,7 +27,19 @@ class BmiClientSubProcess(BmiClient):
         path_options = ["--path", path] if path else []
         self.pipe = subprocess.Popen(["run-bmi-server"] + name_options + port_options + path_options, env=dict(os.environ))
         time.sleep(delay)
-        super(BmiClientSubProcess, self).__init__(BmiClient.create_grpc_channel(port=port, host=host), timeout=timeout)
+
+        def raise_if_dead():
+            returncode = self.pipe.poll()
+            if returncode is not None:
+                raise DeadContainerException(
+                    f'run-bmi-server process for {module_name} prematurely exited with code {returncode}',
+                    returncode,
+                    ''
+                )
+
+        channel = BmiClient.create_grpc_channel(port=port, host=host, options=READINESS_CHANNEL_OPTIONS)
+        wait_until_ready(channel, timeout=timeout, is_alive=raise_if_dead)
+        super(BmiClientSubProcess, self).__init__(channel, timeout=timeout)
 
     def __del__(self):
         self.pipe.kill()
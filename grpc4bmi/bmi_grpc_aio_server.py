@@ -0,0 +1,149 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from . import bmi_pb2, bmi_pb2_grpc
+from .concurrency import CacheMiss, SerializedModel, cache_only
+
+
+class _Aborted(Exception):
+    def __init__(self, code, details, trailing_metadata=None):
+        super().__init__(details)
+        self.code = code
+        self.details = details
+        self.trailing_metadata = trailing_metadata
+
+
+class _ModelThreadContext(object):
+    """Servicer context handed to the synchronous servicer while it runs on the model thread.
+
+    The asyncio context can only abort from the event loop, so an abort is raised as exception and replayed by the
+    event loop once the model thread returns. All other attributes are forwarded to the asyncio context.
+    """
+
+    def __init__(self, context):
+        self._context = context
+
+    def abort(self, code, details):
+        raise _Aborted(code, details)
+
+    def abort_with_status(self, status):
+        raise _Aborted(status.code, status.details, status.trailing_metadata)
+
+    def __getattr__(self, item):
+        return getattr(self._context, item)
+
+
+def _dispatch_to_model_thread(name):
+    async def handler(self, request, context):
+        method = getattr(self.servicer, name)
+        loop = asyncio.get_running_loop()
+        # Run in context of call, so context variables like the metrics of the call are available on model thread
+        call_context = contextvars.copy_context()
+        try:
+            return await loop.run_in_executor(self._executor_for(name), call_context.run,
+                                              method, request, _ModelThreadContext(context))
+        except _Aborted as e:
+            await context.abort(e.code, e.details, e.trailing_metadata)
+
+    handler.__name__ = name
+    return handler
+
+
+def _answer_from_cache(name):
+    on_model_thread = _dispatch_to_model_thread(name)
+
+    async def handler(self, request, context):
+        if isinstance(getattr(self.servicer, 'bmi_model_', None), SerializedModel):
+            try:
+                with cache_only():
+                    return getattr(self.servicer, name)(request, _ModelThreadContext(context))
+            except CacheMiss:
+                pass
+            except _Aborted as e:
+                await context.abort(e.code, e.details, e.trailing_metadata)
+        return await on_model_thread(self, request, context)
+
+    handler.__name__ = name
+    return handler
+
+
+def _run_on_event_loop(name):
+    async def handler(self, request, context):
+        return getattr(self.servicer, name)(request, context)
+
+    handler.__name__ = name
+    return handler
+
+
+class BmiAioServer(bmi_pb2_grpc.BmiServiceServicer):
+    """
+    Asyncio front-end for a synchronous BMI servicer, to be registered on a :func:`grpc.aio.server`.
+
+    Every BMI call is dispatched to a single dedicated model thread, so models which are not thread-safe only ever
+    see one call at a time. Other services on the same server, like reflection, and calls which do not use the model,
+    like getStatus, are handled by the event loop and do not wait for a running model call.
+    Metadata calls which the model lock of :class:`grpc4bmi.concurrency.SerializedModel` has cached are answered on
+    the event loop as well, so they are not queued behind a running time step.
+
+    When the servicer keeps snapshots of output variables (``BmiServer(pipeline=True)``) then values are
+    read and encoded on separate encoder threads, so they can be sent while the model thread runs the next time step.
+    Reading a value which has no snapshot calls the model from an encoder thread,
+    which relies on the model lock of :class:`grpc4bmi.concurrency.SerializedModel`.
+
+    Args:
+        servicer: Synchronous servicer, for example :class:`grpc4bmi.bmi_grpc_server.BmiServer`
+        executor: Executor to run the servicer methods on. Defaults to an executor with a single thread.
+    """
+
+    def __init__(self, servicer, executor=None):
+        # type: (BmiAioServer, bmi_pb2_grpc.BmiServiceServicer, ThreadPoolExecutor) -> None
+        super(bmi_pb2_grpc.BmiServiceServicer, self).__init__()
+        self.servicer = servicer
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='bmi-model')
+        self.executor = executor
+        self.encoder = None
+        if getattr(servicer, 'snapshots', None) is not None:
+            self.encoder = ThreadPoolExecutor(thread_name_prefix='bmi-encoder')
+
+    def _executor_for(self, name):
+        if self.encoder is not None and name in PIPELINED_METHODS:
+            return self.encoder
+        return self.executor
+
+    def shutdown(self):
+        """Waits for the running model call to finish and stops the model thread."""
+        self.executor.shutdown(wait=True)
+        if self.encoder is not None:
+            self.encoder.shutdown(wait=True)
+
+    def __repr__(self):
+        # type: (BmiAioServer) -> str
+        return self.servicer.__repr__()
+
+
+#: Methods which do not call the model and are cheap enough to run on the event loop
+EVENT_LOOP_METHODS = {'getStatus', 'getMetrics'}
+
+#: Methods which are run on encoder threads when the servicer keeps snapshots of output variables
+PIPELINED_METHODS = {'getValue', 'getValueAtIndices'}
+
+#: Methods which only call metadata methods of the model, see :data:`grpc4bmi.concurrency.CACHED_METHODS`.
+#: They are answered on the event loop when cached, otherwise on the model thread.
+CACHED_METADATA_METHODS = {
+    'getComponentName', 'getInputItemCount', 'getOutputItemCount', 'getInputVarNames', 'getOutputVarNames',
+    'getTimeUnits', 'getStartTime', 'getEndTime',
+    'getVarGrid', 'getVarType', 'getVarItemSize', 'getVarUnits', 'getVarNBytes', 'getVarLocation',
+    'getGridSize', 'getGridType', 'getGridRank', 'getGridShape', 'getGridSpacing', 'getGridOrigin',
+    'getGridX', 'getGridY', 'getGridZ', 'getGridNodeCount', 'getGridEdgeCount', 'getGridFaceCount',
+    'getGridEdgeNodes', 'getGridFaceNodes', 'getGridFaceEdges', 'getGridNodesPerFace',
+}
+
+for _name in bmi_pb2.DESCRIPTOR.services_by_name['BmiService'].methods_by_name:
+    if _name in EVENT_LOOP_METHODS:
+        setattr(BmiAioServer, _name, _run_on_event_loop(_name))
+    elif _name in CACHED_METADATA_METHODS:
+        setattr(BmiAioServer, _name, _answer_from_cache(_name))
+    else:
+        setattr(BmiAioServer, _name, _dispatch_to_model_thread(_name))
@@ -2,8 +2,10 @@ import logging
 import math
 import os
 import socket
-from contextlib import closing
-from typing import Optional
+import time
+from concurrent import futures
+from contextlib import closing, contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Union
 
 import numpy as np
 from bmipy import Bmi
@@ -15,6 +17,11 @@ from google.rpc import error_details_pb2
 
 from . import bmi_pb2, bmi_pb2_grpc
 from .constants import GRPC_MAX_MESSAGE_LENGTH
+from .accumulate import AccumulatedValues
+from .metrics import ClientMetrics, InstrumentedStub
+from .reduce import as_dict, zone_dicts
+from .subset import CoarsenedValues
+from .tracing import TracedStub, Tracer
 
 log = logging.getLogger(__name__)
 
@@ -47,12 +54,181 @@ def handle_error(exc):
     raise
 
 
+class ServerStatus(NamedTuple):
+    """Status of a BMI server, as returned by :func:`BmiClient.get_status`."""
+    #: State of model, one of ``created``, ``initialized``, ``finalized`` or ``failed``
+    state: str
+    #: Whether the model is running a time step
+    updating: bool
+    #: Time of model after its last initialize or update
+    current_time: float
+
+
+class BmiFuture(futures.Future):
+    """Handle to a BMI call running on the server, as returned by :func:`BmiClient.update_async`.
+
+    It is a :class:`concurrent.futures.Future` so it can also be used with
+    :func:`concurrent.futures.wait` and :func:`concurrent.futures.as_completed`.
+    Errors of the server are raised by :func:`result` in the same way as the blocking client methods raise them.
+
+    Args:
+        call: Future returned by a ``future()`` call on a gRPC stub method
+    """
+
+    def __init__(self, call):
+        super().__init__()
+        self.call = call
+        self.set_running_or_notify_cancel()
+        call.add_done_callback(self._on_call_done)
+
+    def _on_call_done(self, call):
+        try:
+            call.result()
+        except grpc.FutureCancelledError:
+            # Future is already running so can not be cancelled, pass cancellation on as exception
+            self.set_exception(futures.CancelledError())
+        except grpc.RpcError as e:
+            try:
+                handle_error(e)
+            except Exception as remote_exc:
+                self.set_exception(remote_exc)
+        else:
+            self.set_result(None)
+
+    def cancel(self):
+        """Attempts to cancel the call on the server.
+
+        Returns: True if the call was cancelled
+        """
+        return self.call.cancel()
+
+
+def wait_all(handles: Iterable[futures.Future], timeout: Optional[float] = None) -> List:
+    """Waits for all handles to complete.
+
+    Example:
+
+        Run a time step on several models at the same time.
+
+        >>> from grpc4bmi.bmi_grpc_client import wait_all
+        >>> handles = [model.update_async() for model in models]
+        >>> # Do other work while models are stepping
+        >>> wait_all(handles)
+
+    Args:
+        handles: Handles returned by :func:`BmiClient.update_async` or :func:`BmiClient.update_until_async`
+        timeout: Maximum number of seconds to wait for all handles. Waits forever when None.
+
+    Returns: Results of handles in the same order as handles.
+
+    Raises:
+        concurrent.futures.TimeoutError: When not all handles completed within timeout
+        Exception: First error raised by a handle, after all handles have completed
+    """
+    handles = list(handles)
+    _, not_done = futures.wait(handles, timeout=timeout)
+    if not_done:
+        raise futures.TimeoutError(f'{len(not_done)} of {len(handles)} calls did not complete within {timeout}s')
+    return [handle.result() for handle in handles]
+
+
+_NOT_ANSWERED = (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED)
+
+READINESS_CHANNEL_OPTIONS = [
+    # Reconnect quickly to a server that is starting up, default backoff grows to 2 minutes
+    ('grpc.initial_reconnect_backoff_ms', 50),
+    ('grpc.min_reconnect_backoff_ms', 50),
+    ('grpc.max_reconnect_backoff_ms', 1000),
+]
+"""Channel options to use for a channel which is polled with :func:`wait_until_ready`"""
+
+
+def wait_until_ready(channel: grpc.Channel, timeout: Optional[float] = None,
+                     is_alive: Optional[Callable[[], None]] = None,
+                     initial_interval: float = 0.01, max_interval: float = 1.0):
+    """Polls a BMI server until it answers, with exponential backoff between attempts.
+
+    The server is ready when the channel is connected and the server answers a cheap RPC.
+    An error raised by the model counts as an answer.
+
+    Args:
+        channel: Channel to BMI server
+        timeout: Seconds to wait for server. Waits forever when None.
+        is_alive: Called before each attempt, should raise an exception
+            (like :class:`grpc4bmi.exceptions.DeadContainerException`) when the server process has died.
+        initial_interval: Seconds to wait for first attempt
+        max_interval: Maximum seconds to wait for a single attempt
+
+    Raises:
+        grpc.FutureTimeoutError: When server was not ready within timeout
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    stub = bmi_pb2_grpc.BmiServiceStub(channel)
+    # A single future is waited on by all attempts, as each future stays subscribed to the channel until it is done
+    ready = None
+    interval = initial_interval
+    try:
+        while True:
+            if is_alive is not None:
+                is_alive()
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise grpc.FutureTimeoutError(f'BMI server not ready within {timeout}s')
+            attempt = interval if remaining is None else min(interval, remaining)
+            attempt_start = time.monotonic()
+            if ready is None:
+                ready = grpc.channel_ready_future(channel)
+            try:
+                ready.result(timeout=attempt)
+                stub.getComponentName(bmi_pb2.Empty(), timeout=attempt)
+                return
+            except grpc.FutureTimeoutError:
+                pass
+            except grpc.RpcError as e:
+                if e.code() not in _NOT_ANSWERED:
+                    return
+                # Connection was refused without waiting, so wait rest of attempt before trying again
+                time.sleep(max(0.0, attempt - (time.monotonic() - attempt_start)))
+            interval = min(interval * 2, max_interval)
+    finally:
+        if ready is not None:
+            ready.cancel()
+
+
 def _fits_in_message(array):
     """Tests whether array can be passed through a gRPC message with a max message size of 4Mb"""
     array_size = array.size * array.itemsize
     return array_size <= GRPC_MAX_MESSAGE_LENGTH
 
 
+#: Number of values sent per call by methods which send their values in chunks.
+#: An int64 takes up to 10 bytes in a message, the rest is left for the other fields.
+CHUNK_SIZE = GRPC_MAX_MESSAGE_LENGTH // 10 - 1024
+
+
+def _get_chunked(call, request, make_array):
+    """Calls a method which sends values in chunks until all values have been received.
+
+    Args:
+        call: Method of stub, of which the request has start and count fields and the response a size field
+        request: Request of first chunk
+        make_array: Returns values of a response
+
+    Returns: Response to first call and values of all chunks
+    """
+    request.count = CHUNK_SIZE
+    response = call(request)
+    chunks = [make_array(response)]
+    received = chunks[0].size
+    while received < response.size:
+        request.start = received
+        chunks.append(make_array(call(request)))
+        if not chunks[-1].size:
+            raise ValueError(f'Received {received} of {response.size} values, but next chunk is empty')
+        received += chunks[-1].size
+    return response, numpy.concatenate(chunks)
+
+
 class BmiClient(Bmi):
     """
     Client BMI interface, implementing BMI by forwarding every function call via GRPC to the server connected to the
@@ -74,18 +250,20 @@ class BmiClient(Bmi):
             future.result(timeout=timeout)
         else:
             self.stub = stub
+        #: Metrics of calls made by this client, set by :func:`instrument`
+        self.metrics: Optional[ClientMetrics] = None
 
     def __del__(self):
         del self.stub
 
     @staticmethod
-    def create_grpc_channel(port=0, host=None):
+    def create_grpc_channel(port=0, host=None, options=None):
         p, h = port, host
         if h is None:
             h = "localhost"
         if p == 0:
             p = os.environ.get("BMI_PORT", 50051)
-        return grpc.insecure_channel(':'.join([h, str(p)]))
+        return grpc.insecure_channel(':'.join([h, str(p)]), options=options)
 
     @staticmethod
     def get_unique_port(host=None):
@@ -93,6 +271,55 @@ class BmiClient(Bmi):
             s.bind(("" if host is None else host, 0))
             return int(s.getsockname()[1])
 
+    def _instrumented_stub(self) -> InstrumentedStub:
+        if not isinstance(self.stub, InstrumentedStub):
+            self.stub = InstrumentedStub(self.stub)
+        return self.stub
+
+    def instrument(self, metrics: Optional[ClientMetrics] = None) -> ClientMetrics:
+        """Records metrics of all following calls made by this client.
+
+        Args:
+            metrics: Registry to record in, for example to share it between clients.
+                Defaults to a new registry.
+
+        Returns: Metrics registry, also available as :attr:`metrics`.
+        """
+        if self.metrics is None:
+            self.metrics = ClientMetrics() if metrics is None else metrics
+            self._instrumented_stub().sinks.append(self.metrics)
+        return self.metrics
+
+    @contextmanager
+    def profile(self) -> Iterator[ClientMetrics]:
+        """Records metrics of the calls made by this client inside a with block.
+
+        Example:
+
+            >>> with client.profile() as metrics:
+            ...     client.update()
+            ...     client.get_value('Q', dest)
+            >>> metrics.to_json('step.json', indent=2)
+        """
+        metrics = ClientMetrics()
+        stub = self._instrumented_stub()
+        stub.sinks.append(metrics)
+        try:
+            yield metrics
+        finally:
+            stub.sinks.remove(metrics)
+
+    def trace(self, tracer: Tracer):
+        """Records a span for each following call and passes the trace context to the server.
+
+        When the server is traced as well, its spans become children of the spans of this client.
+        See :mod:`grpc4bmi.tracing`.
+        """
+        if isinstance(self.stub, TracedStub):
+            self.stub.tracer = tracer
+        else:
+            self.stub = TracedStub(self.stub, tracer)
+
     def initialize(self, filename: Optional[str]):
         fname = "" if filename is None else filename
         try:
@@ -112,6 +339,20 @@ class BmiClient(Bmi):
         except grpc.RpcError as e:
             handle_error(e)
 
+    def update_async(self) -> BmiFuture:
+        """Same as :func:`update`, but returns a handle instead of waiting for the model to complete the time step.
+
+        Use :func:`BmiFuture.result` or :func:`wait_all` to wait for the time step to complete.
+        """
+        return BmiFuture(self.stub.update.future(bmi_pb2.Empty()))
+
+    def update_until_async(self, time: float) -> BmiFuture:
+        """Same as :func:`update_until`, but returns a handle instead of waiting for the model to reach time.
+
+        Use :func:`BmiFuture.result` or :func:`wait_all` to wait for the model to reach time.
+        """
+        return BmiFuture(self.stub.updateUntil.future(bmi_pb2.GetTimeResponse(time=time)))
+
     def finalize(self):
         try:
             self.stub.finalize(bmi_pb2.Empty())
@@ -280,6 +521,51 @@ class BmiClient(Bmi):
         except grpc.RpcError as e:
             handle_error(e)
 
+    def get_value_in_region(self, name: str, bbox: Sequence[float]) -> np.ndarray:
+        """Values of a variable inside a bounding box.
+
+        The server finds the nodes inside the box once per grid and box, later calls with the same box only
+        send the values. Values which do not fit in a single message are fetched in chunks.
+
+        Args:
+            name: Name of variable, which should have a value per node of its grid
+            bbox: Bounding box as (x min, y min, x max, y max), like (lon min, lat min, lon max, lat max).
+                When x min is larger than x max the box crosses the antimeridian.
+
+        Returns: Values of nodes in box. For a rectilinear grid shaped like the sub-grid, otherwise a list.
+        """
+        try:
+            response, values = _get_chunked(self.stub.getValueInRegion,
+                                            bmi_pb2.GetValueInRegionRequest(name=name, bbox=bbox),
+                                            BmiClient.make_array)
+        except grpc.RpcError as e:
+            handle_error(e)
+        return values.reshape(tuple(response.shape))
+
+    def get_value_coarsened(self, name: str, factors: Union[int, Sequence[int]], method: str = 'mean') \
+            -> CoarsenedValues:
+        """Values of a variable on a structured grid at a lower resolution, like for a preview.
+
+        Args:
+            name: Name of variable, which should have a value per node of its grid
+            factors: Factor to reduce each axis of the grid with, or a single factor for all axes
+            method: ``mean`` to average blocks of nodes, ignoring NaN, or ``stride`` to take every n-th node
+
+        Returns: Values shaped like the coarse grid. For a uniform rectilinear grid also the spacing and origin of
+            the coarse grid, with the origin at the center of the first block when averaging.
+            Values which do not fit in a single message are fetched in chunks.
+        """
+        if isinstance(factors, int):
+            factors = [factors]
+        try:
+            response, values = _get_chunked(self.stub.getValueCoarsened,
+                                            bmi_pb2.GetValueCoarsenedRequest(name=name, factors=factors, method=method),
+                                            BmiClient.make_array)
+        except grpc.RpcError as e:
+            handle_error(e)
+        return CoarsenedValues(values.reshape(tuple(response.shape)), numpy.array(response.spacing),
+                               numpy.array(response.origin))
+
     def set_value(self, name, values):
         try:
             if values.dtype in (numpy.int16, numpy.int32, numpy.int64):
@@ -320,6 +606,29 @@ class BmiClient(Bmi):
         except grpc.RpcError as e:
             handle_error(e)
 
+    def push_value(self, name: str, address: str, dest_name: Optional[str] = None,
+                   src_indices: Optional[numpy.ndarray] = None, dest_indices: Optional[numpy.ndarray] = None):
+        """Lets the server set values of one of its variables on another BMI server.
+
+        The values go from server to server without passing through this client, like for coupling two models.
+
+        Args:
+            name: Name of variable to get
+            address: Address of other server as seen from this server, like ``localhost:50052``
+            dest_name: Name of variable to set on other server, defaults to name
+            src_indices: If set then only get values at these indices
+            dest_indices: If set then set values at these indices on other server, otherwise set the whole variable
+        """
+        request = bmi_pb2.PushValueRequest(name=name, address=address, dest_name=dest_name or '')
+        if src_indices is not None:
+            request.src_indices.extend(numpy.asarray(src_indices).flatten())
+        if dest_indices is not None:
+            request.dest_indices.extend(numpy.asarray(dest_indices).flatten())
+        try:
+            self.stub.pushValue(request)
+        except grpc.RpcError as e:
+            handle_error(e)
+
     def get_grid_size(self, grid):
         try:
             return self.stub.getGridSize(bmi_pb2.GridRequest(grid_id=grid)).size
@@ -436,6 +745,199 @@ class BmiClient(Bmi):
         except grpc.RpcError as e:
             handle_error(e)
 
+    def get_status(self) -> ServerStatus:
+        """Status of the server, which is reported without calling the model.
+
+        So unlike the BMI methods it answers immediately while the model is running a time step.
+        """
+        try:
+            response = self.stub.getStatus(bmi_pb2.Empty())
+            state = bmi_pb2.GetStatusResponse.State.Name(response.state).lower()
+            return ServerStatus(state=state, updating=response.updating, current_time=response.current_time)
+        except grpc.RpcError as e:
+            handle_error(e)
+
+    def get_metrics(self) -> str:
+        """Metrics recorded by the server in Prometheus text format.
+
+        See :class:`grpc4bmi.metrics.ServerMetrics` for which metrics are recorded.
+        """
+        try:
+            return self.stub.getMetrics(bmi_pb2.Empty()).text
+        except grpc.RpcError as e:
+            handle_error(e)
+
+    def dump_profile(self) -> List[str]:
+        """Writes profiles of the model calls made by the server to its profile directory.
+
+        Only works when server was started with ``run-bmi-server --profile DIR``.
+
+        Returns: Paths of written files on the server side
+        """
+        try:
+            return list(self.stub.dumpProfile(bmi_pb2.Empty()).files)
+        except grpc.RpcError as e:
+            handle_error(e)
+
+    def save_state(self, path: str) -> str:
+        """Saves state of model to a file, so it can be restored with :func:`load_state` instead of recomputed.
+
+        See :mod:`grpc4bmi.checkpoint` for how the state is saved.
+
+        Args:
+            path: File on the server side, relative to its work directory, which for a containerized model is the
+                work directory of the container. Absolute paths and paths outside the work directory are refused.
+
+        Returns: How state was saved, either 'native', 'pickle' or 'variables'
+        """
+        try:
+            return self.stub.saveState(bmi_pb2.StateRequest(path=path)).kind
+        except grpc.RpcError as e:
+            handle_error(e)
+
+    def load_state(self, path: str) -> str:
+        """Restores state of model from a file written by :func:`save_state`.
+
+        Args:
+            path: File on the server side, relative to its work directory.
+                Absolute paths and paths outside the work directory are refused.
+
+        Returns: How state was saved, either 'native', 'pickle' or 'variables'
+        """
+        try:
+            return self.stub.loadState(bmi_pb2.StateRequest(path=path)).kind
+        except grpc.RpcError as e:
+            handle_error(e)
+
+    def clone(self, host: str = 'localhost', timeout: Optional[float] = None) -> 'BmiClient':
+        """Starts a copy of the server with the current state of the model and connects to it.
+
+        A model initialized once can then be cloned into ensemble members, instead of initializing each member.
+        Only works when server was started with ``run-bmi-server`` on the same host as the client,
+        for example with :class:`grpc4bmi.bmi_client_subproc.BmiClientSubProcess`.
+        The clone is stopped when the server it was cloned from stops.
+
+        Args:
+            host: Host of server
+            timeout: Seconds to wait for clone to be ready
+
+        Returns: Client connected to clone
+        """
+        try:
+            port = self.stub.clone(bmi_pb2.Empty()).port
+        except grpc.RpcError as e:
+            handle_error(e)
+        return BmiClient(BmiClient.create_grpc_channel(port=port, host=host), timeout=timeout)
+
+    def start_recording(self, path: str, names: Optional[List[str]] = None, interval: int = 1,
+                        chunk_size: Optional[int] = None):
+        """Lets the server write output variables to disk after each update, without sending them to the client.
+
+        The values are written to a Zarr store, see :mod:`grpc4bmi.output`.
+
+        Args:
+            path: Directory on the server side, relative to its work directory, which for a containerized model is
+                the work directory of the container. Absolute paths and paths outside the work directory are refused.
+            names: Names of variables to record, by default all output variables
+            interval: Record every n-th update
+            chunk_size: Number of time steps in a chunk. By default chunks are about 8Mb.
+        """
+        request = bmi_pb2.StartRecordingRequest(path=path, names=names or [], interval=interval,
+                                                chunk_size=chunk_size or 0)
+        try:
+            self.stub.startRecording(request)
+        except grpc.RpcError as e:
+            handle_error(e)
+
+    def stop_recording(self) -> int:
+        """Stops recording started with :func:`start_recording` after all recorded values have been written.
+
+        Recording also stops when the model is finalized.
+
+        Returns: Number of recorded time steps
+        """
+        try:
+            return self.stub.stopRecording(bmi_pb2.Empty()).steps
+        except grpc.RpcError as e:
+            handle_error(e)
+
+    def set_zones(self, name: str, zones: np.ndarray):
+        """Registers zones, like catchments or a mask, on the server for :func:`reduce_value`.
+
+        Args:
+            name: Name to refer to zones with
+            zones: Zone number of each value of a variable, values with zone zero or less are left out.
+                A boolean mask is a single zone with number 1.
+        """
+        try:
+            self.stub.setZones(bmi_pb2.SetZonesRequest(name=name, zones=np.asarray(zones).ravel().astype(np.int64)))
+        except grpc.RpcError as e:
+            handle_error(e)
+
+    def reduce_value(self, name: str, operations: Sequence[str] = ('mean',), indices: Optional[np.ndarray] = None,
+                     zones: Optional[str] = None) -> Union[Dict[str, float], Dict[int, Dict[str, float]]]:
+        """Reduces values of a variable on the server, so only the results are sent.
+
+        Args:
+            name: Name of variable
+            operations: Reductions, see :mod:`grpc4bmi.reduce` for supported reductions
+            indices: If set then only values at these indices are reduced
+            zones: If set then values are reduced per zone of the zones with this name,
+                registered with :func:`set_zones`
+
+        Returns: Result of each operation. With zones, the results of each zone by zone number.
+        """
+        request = bmi_pb2.ReduceValueRequest(name=name, operations=operations, zones=zones or '',
+                                             indices=[] if indices is None else np.asarray(indices).ravel())
+        try:
+            response = self.stub.reduceValue(request)
+        except grpc.RpcError as e:
+            handle_error(e)
+        if zones:
+            return zone_dicts(operations, response.zones, response.values)
+        return as_dict(operations, response.values)
+
+    def add_accumulator(self, name: str, variable: str, operation: str = 'mean', period: float = 0.0):
+        """Lets the server accumulate values of a variable after each update, see :mod:`grpc4bmi.accumulate`.
+
+        Args:
+            name: Name to refer to accumulator with, an existing accumulator with this name is replaced
+            variable: Name of variable
+            operation: One of ``mean``, ``sum``, ``min`` or ``max``
+            period: If larger than zero then every period of model time the accumulation is completed and
+                a new one is started
+        """
+        request = bmi_pb2.AddAccumulatorRequest(name=name, variable=variable, operation=operation, period=period)
+        try:
+            self.stub.addAccumulator(request)
+        except grpc.RpcError as e:
+            handle_error(e)
+
+    def get_accumulator(self, name: str, completed: bool = False, reset: bool = False) -> AccumulatedValues:
+        """Values accumulated by the server.
+
+        Args:
+            name: Name of accumulator
+            completed: If true then return the last completed period instead of the current one
+            reset: If true then start a new accumulation after returning the current one
+
+        Values which do not fit in a single message are fetched in chunks. Unless reset is true,
+        call it between time steps, so all chunks are of the same accumulation.
+        """
+        try:
+            response, values = _get_chunked(self.stub.getAccumulator,
+                                            bmi_pb2.AccumulatorRequest(name=name, completed=completed, reset=reset),
+                                            lambda r: numpy.array(r.values))
+        except grpc.RpcError as e:
+            handle_error(e)
+        return AccumulatedValues(values, response.start_time, response.end_time, response.steps)
+
+    def remove_accumulator(self, name: str):
+        try:
+            self.stub.removeAccumulator(bmi_pb2.AccumulatorRequest(name=name))
+        except grpc.RpcError as e:
+            handle_error(e)
+
     @staticmethod
     def make_array(response):
         if response.HasField("values_int"):
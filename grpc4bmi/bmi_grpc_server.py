@@ -1,4 +1,10 @@
 import logging
+import os
+import secrets
+import threading
+from contextlib import nullcontext
+from functools import partial
+from typing import Optional
 
 import numpy
 from bmipy import Bmi
@@ -7,6 +13,18 @@ from google.protobuf import any_pb2
 from google.rpc import code_pb2, status_pb2, error_details_pb2
 import traceback
 
+from grpc4bmi.accumulate import Accumulator, accumulate
+from grpc4bmi.checkpoint import load_state, save_state
+from grpc4bmi.clone import Cloner, NotClonableError
+from grpc4bmi.concurrency import SerializedModel
+from grpc4bmi.metrics import ServerMetrics, TimedModel
+from grpc4bmi.output import OutputWriter
+from grpc4bmi.peers import Peers, push_value
+from grpc4bmi.pipeline import OutputSnapshots
+from grpc4bmi.profiling import ProfiledModel
+from grpc4bmi.reduce import Zones, check_operations, reduce_values
+from grpc4bmi.subset import RegionCache, coarsen_grid
+from grpc4bmi.tracing import Tracer, TracedModel
 from grpc4bmi.reserve import reserve_values, reserve_grid_shape, reserve_grid_nodes, reserve_grid_padding, \
     reserve_values_at_indices
 from . import bmi_pb2, bmi_pb2_grpc
@@ -14,6 +32,24 @@ from . import bmi_pb2, bmi_pb2_grpc
 log = logging.getLogger(__name__)
 
 
+def _value_response(message_type, values):
+    """Encodes array as GetValueResponse or GetValueAtIndicesResponse message."""
+    if values.dtype in (numpy.int64, numpy.int32, numpy.int16):
+        return message_type(values_int=bmi_pb2.IntArrayMessage(values=values.flatten()))
+    if values.dtype in (numpy.float32, numpy.float16):
+        return message_type(values_float=bmi_pb2.FloatArrayMessage(values=values.flatten()))
+    if values.dtype == numpy.float64:
+        return message_type(values_double=bmi_pb2.DoubleArrayMessage(values=values.flatten()))
+    raise NotImplementedError("Arrays with type %s cannot be transmitted through this GRPC channel" % values.dtype)
+
+
+def _chunk(values, request):
+    """Flattened values in chunk of request, all values when count of request is zero."""
+    values = values.ravel()
+    stop = request.start + request.count if request.count else values.size
+    return values[request.start:stop]
+
+
 class BmiServer(bmi_pb2_grpc.BmiServiceServicer):
     """
     BMI Server class, wrapping an existing python implementation and exposing it via GRPC across the memory space (to
@@ -24,15 +60,98 @@ class BmiServer(bmi_pb2_grpc.BmiServiceServicer):
         model: Bmi model object which must be wrapped by grpc
         debug: If true then returns stacktrace in an error response.
                 The stacktrace is returned in the trailing metadata as a DebugInfo (https://github.com/googleapis/googleapis/blob/07244bb797ddd6e0c1c15b02b4467a9a5729299f/google/rpc/error_details.proto#L46-L52) message.
+        metrics: If set then time spent in model is recorded and metrics can be fetched with getMetrics.
+                The other metrics are recorded by a :class:`grpc4bmi.metrics.MetricsInterceptor` on the server.
+        tracer: If set then a span is recorded for each call to the model.
+                Spans of calls are recorded by a :class:`grpc4bmi.tracing.TracingInterceptor` on the server.
+        profile_dir: If set then each model method is profiled and profiles are written to this directory
+                with dumpProfile, see :class:`grpc4bmi.profiling.ProfiledModel`.
+        serialize: If true then calls to the model are made one at a time and metadata is cached,
+                so the server can be called by concurrent clients. See :class:`grpc4bmi.concurrency.SerializedModel`.
+        pipeline: If true then output variables are copied after each time step and values are returned from
+                these copies without calling the model. So values of a time step can be sent while the model
+                runs the next time step. See :class:`grpc4bmi.pipeline.OutputSnapshots`.
+        cloner: If set then the server can be cloned with the clone call into a new server process
+                which starts with the current state of the model. See :class:`grpc4bmi.clone.Cloner`.
+        work_dir: Directory in which clients can save and load states and record output. Paths sent by clients are
+                relative to it and may not point outside it. Defaults to the current working directory.
     """
 
-    def __init__(self, model, debug=False):
-        # type: (BmiServer, Bmi, bool) -> None
+    def __init__(self, model, debug=False, metrics=None, tracer=None, profile_dir=None, serialize=True,
+                 pipeline=False, cloner=None, work_dir=None):
+        # type: (BmiServer, Bmi, bool, Optional[ServerMetrics], Optional[Tracer], Optional[str], bool, bool, Optional[Cloner], Optional[str]) -> None
         super(bmi_pb2_grpc.BmiServiceServicer, self).__init__()
-        self.bmi_model_ = model
+        self.origin = model
+        self.profiler = None
+        if profile_dir is not None:
+            model = self.profiler = ProfiledModel(model, profile_dir)
+        if tracer is not None:
+            model = TracedModel(model, tracer)
+        if metrics is not None:
+            model = TimedModel(model)
+        # Outermost, so waiting for the lock is not counted as time spent in model
+        self.bmi_model_ = SerializedModel(model) if serialize else model
+        self.regions = RegionCache(self.bmi_model_)
+        self.snapshots = None
+        if pipeline:
+            self.snapshots = OutputSnapshots(self.bmi_model_, partial(_value_response, bmi_pb2.GetValueResponse))
         self.debug = debug
-
-    def exception_handler(self, exc, context):
+        self.metrics = metrics
+        self.cloner = cloner
+        self.work_dir = work_dir
+        self.recording = None
+        #: Zones registered with setZones, by name
+        self.zones = {}
+        #: Accumulators registered with addAccumulator, by name
+        self.accumulators = {}
+        # Guards accumulators, which are updated after each time step while other calls add, read or remove them
+        self._accumulators_lock = threading.Lock()
+        #: Random identifier of server, returned by getStatus
+        self.server_id = secrets.token_hex(16)
+        #: Clients of other servers which values are pushed to
+        self.peers = Peers(server_id=self.server_id)
+        self.state = bmi_pb2.GetStatusResponse.CREATED
+        self.updating = False
+        self.current_time = 0.0
+        self.state_listeners = []
+
+    def add_state_listener(self, listener):
+        """Registers a callable which is called with the new state whenever the state of the model changes.
+
+        The state is one of the :class:`bmi_pb2.GetStatusResponse.State` values.
+        """
+        self.state_listeners.append(listener)
+
+    def _set_state(self, state):
+        self.state = state
+        for listener in self.state_listeners:
+            listener(state)
+
+    def _take_snapshots(self):
+        if self.snapshots is not None:
+            self.snapshots.take()
+
+    def _exclusive(self):
+        # Lock which keeps other clients from calling the model
+        return self.bmi_model_.lock if isinstance(self.bmi_model_, SerializedModel) else nullcontext()
+
+    def _record_outputs(self):
+        if self.recording is not None:
+            self.recording.record()
+
+    def _accumulate(self):
+        with self._accumulators_lock:
+            if self.accumulators:
+                accumulate(self.accumulators, self.bmi_model_, self.current_time)
+
+    def _track_time(self):
+        # Remember time of model, so status can be reported without calling the model
+        try:
+            self.current_time = self.bmi_model_.get_current_time()
+        except Exception:
+            log.debug('Unable to get current time of model', exc_info=True)
+
+    def exception_handler(self, exc, context, code=code_pb2.INTERNAL):
         log.exception(exc)
         detail = any_pb2.Any()
         if self.debug:
@@ -43,7 +162,7 @@ class BmiServer(bmi_pb2_grpc.BmiServiceServicer):
                 )
             )
         status = status_pb2.Status(
-            code=code_pb2.INTERNAL,
+            code=code,
             message=str(exc),
             details=[detail]
         )
@@ -54,30 +173,61 @@ class BmiServer(bmi_pb2_grpc.BmiServiceServicer):
         if not ifile:
             ifile = None
         try:
+            if self.snapshots is not None:
+                self.snapshots.invalidate()
+            self.regions.clear()
             self.bmi_model_.initialize(ifile)
+            self._track_time()
+            self._take_snapshots()
+            self._set_state(bmi_pb2.GetStatusResponse.INITIALIZED)
             return bmi_pb2.Empty()
         except Exception as e:
+            self._set_state(bmi_pb2.GetStatusResponse.FAILED)
             self.exception_handler(e, context)
 
+    def _step(self, step, *args):
+        """Runs a time step of the model, followed by the work of the server after each time step.
+
+        Only an exception of the model marks it as failed, an exception of the server afterwards is raised as is.
+        """
+        self.updating = True
+        try:
+            try:
+                step(*args)
+            except Exception:
+                self._set_state(bmi_pb2.GetStatusResponse.FAILED)
+                raise
+            self._track_time()
+            self._take_snapshots()
+            self._record_outputs()
+            self._accumulate()
+        finally:
+            self.updating = False
+
     def update(self, request, context):
         try:
-            self.bmi_model_.update()
+            self._step(self.bmi_model_.update)
             return bmi_pb2.Empty()
         except Exception as e:
             self.exception_handler(e, context)
 
     def updateUntil(self, request, context):
         try:
-            self.bmi_model_.update_until(request.time)
+            self._step(self.bmi_model_.update_until, request.time)
             return bmi_pb2.Empty()
         except Exception as e:
             self.exception_handler(e, context)
 
     def finalize(self, request, context):
         try:
+            if self.snapshots is not None:
+                self.snapshots.invalidate()
+            self.stop_recording()
             self.bmi_model_.finalize()
+            self._set_state(bmi_pb2.GetStatusResponse.FINALIZED)
             return bmi_pb2.Empty()
         except Exception as e:
+            self._set_state(bmi_pb2.GetStatusResponse.FAILED)
             self.exception_handler(e, context)
 
     def getComponentName(self, request, context):
@@ -177,15 +327,13 @@ class BmiServer(bmi_pb2_grpc.BmiServiceServicer):
 
     def getValue(self, request, context):
         try:
+            if self.snapshots is not None:
+                response = self.snapshots.response(request.name)
+                if response is not None:
+                    return response
             values = reserve_values(self.bmi_model_, request.name)
             values = self.bmi_model_.get_value(request.name, values)
-            if values.dtype in (numpy.int64, numpy.int32, numpy.int16):
-                return bmi_pb2.GetValueResponse(values_int=bmi_pb2.IntArrayMessage(values=values.flatten()))
-            if values.dtype in (numpy.float32, numpy.float16):
-                return bmi_pb2.GetValueResponse(values_float=bmi_pb2.FloatArrayMessage(values=values.flatten()))
-            if values.dtype == numpy.float64:
-                return bmi_pb2.GetValueResponse(values_double=bmi_pb2.DoubleArrayMessage(values=values.flatten()))
-            raise NotImplementedError("Arrays with type %s cannot be transmitted through this GRPC channel" % values.dtype)
+            return _value_response(bmi_pb2.GetValueResponse, values)
         except Exception as e:
             self.exception_handler(e, context)
 
@@ -195,20 +343,62 @@ class BmiServer(bmi_pb2_grpc.BmiServiceServicer):
     def getValueAtIndices(self, request, context):
         try:
             indices = numpy.array(request.indices)
-            values = reserve_values_at_indices(self.bmi_model_, request.name, indices)
-            values = self.bmi_model_.get_value_at_indices(request.name, values, indices)
-            if values.dtype in (numpy.int64, numpy.int32, numpy.int16):
-                return bmi_pb2.GetValueAtIndicesResponse(values_int=bmi_pb2.IntArrayMessage(values=values.flatten()))
-            if values.dtype in (numpy.float32, numpy.float16):
-                return bmi_pb2.GetValueAtIndicesResponse(values_float=bmi_pb2.FloatArrayMessage(values=values.flatten()))
-            if values.dtype == numpy.float64:
-                return bmi_pb2.GetValueAtIndicesResponse(values_double=bmi_pb2.DoubleArrayMessage(values=values.flatten()))
-            raise NotImplementedError("Arrays with type %s cannot be transmitted through this GRPC channel" % values.dtype)
+            values = None
+            if self.snapshots is not None:
+                values = self.snapshots.values_at_indices(request.name, indices)
+            if values is None:
+                values = reserve_values_at_indices(self.bmi_model_, request.name, indices)
+                values = self.bmi_model_.get_value_at_indices(request.name, values, indices)
+            return _value_response(bmi_pb2.GetValueAtIndicesResponse, values)
+        except Exception as e:
+            self.exception_handler(e, context)
+
+    def getValueInRegion(self, request, context):
+        try:
+            grid = self.bmi_model_.get_var_grid(request.name)
+            size = self.bmi_model_.get_var_nbytes(request.name) // self.bmi_model_.get_var_itemsize(request.name)
+            grid_size = self.bmi_model_.get_grid_size(grid)
+            if size != grid_size:
+                raise ValueError(f'Variable {request.name} has {size} values, '
+                                 f'but a region can only be cut from a value per node of its grid of {grid_size} nodes')
+            indices, shape = self.regions.indices(grid, request.bbox)
+            values = None
+            if self.snapshots is not None:
+                values = self.snapshots.values_at_indices(request.name, indices)
+            if values is None:
+                values = reserve_values_at_indices(self.bmi_model_, request.name, indices)
+                values = self.bmi_model_.get_value_at_indices(request.name, values, indices)
+            response = _value_response(bmi_pb2.GetValueInRegionResponse, _chunk(values, request))
+            response.shape.extend(shape)
+            response.size = values.size
+            return response
+        except Exception as e:
+            self.exception_handler(e, context)
+
+    def getValueCoarsened(self, request, context):
+        try:
+            values = None
+            if self.snapshots is not None:
+                size = self.bmi_model_.get_var_nbytes(request.name) // self.bmi_model_.get_var_itemsize(request.name)
+                values = self.snapshots.values_at_indices(request.name, numpy.arange(size))
+            if values is None:
+                values = reserve_values(self.bmi_model_, request.name)
+                values = self.bmi_model_.get_value(request.name, values)
+            grid = self.bmi_model_.get_var_grid(request.name)
+            coarse = coarsen_grid(self.bmi_model_, grid, values, request.factors, request.method or 'mean')
+            response = _value_response(bmi_pb2.GetValueCoarsenedResponse, _chunk(coarse.values, request))
+            response.shape.extend(coarse.values.shape)
+            response.size = coarse.values.size
+            response.spacing.extend(coarse.spacing)
+            response.origin.extend(coarse.origin)
+            return response
         except Exception as e:
             self.exception_handler(e, context)
 
     def setValue(self, request, context):
         try:
+            if self.snapshots is not None:
+                self.snapshots.invalidate(request.name)
             if request.HasField("values_int"):
                 array = numpy.array(request.values_int.values, dtype=numpy.int64)
                 self.bmi_model_.set_value(request.name, array)
@@ -224,6 +414,8 @@ class BmiServer(bmi_pb2_grpc.BmiServiceServicer):
 
     def setValueAtIndices(self, request, context):
         try:
+            if self.snapshots is not None:
+                self.snapshots.invalidate(request.name)
             index_array = numpy.array(request.indices)
             if request.HasField("values_int"):
                 array = numpy.array(request.values_int.values, dtype=numpy.int64)
@@ -238,6 +430,22 @@ class BmiServer(bmi_pb2_grpc.BmiServiceServicer):
         except Exception as e:
             self.exception_handler(e, context)
 
+    def pushValue(self, request, context):
+        try:
+            if self.peers.is_self(request.address):
+                # Set locally, a call to itself would wait forever when the model is called from a single thread
+                peer = self.bmi_model_
+                if self.snapshots is not None:
+                    self.snapshots.invalidate(request.dest_name or request.name)
+            else:
+                peer = self.peers.client(request.address)
+            src_indices = numpy.array(request.src_indices) if request.src_indices else None
+            dest_indices = numpy.array(request.dest_indices) if request.dest_indices else None
+            push_value(self.bmi_model_, request.name, peer, request.dest_name, src_indices, dest_indices)
+            return bmi_pb2.Empty()
+        except Exception as e:
+            self.exception_handler(e, context)
+
     def getGridSize(self, request, context):
         try:
             return bmi_pb2.GetGridSizeResponse(size=self.bmi_model_.get_grid_size(request.grid_id))
@@ -357,6 +565,197 @@ class BmiServer(bmi_pb2_grpc.BmiServiceServicer):
         except Exception as e:
             self.exception_handler(e, context)
 
+    def getStatus(self, request, context):
+        # Does not call the model, so it answers while the model is busy
+        return bmi_pb2.GetStatusResponse(state=self.state, updating=self.updating, current_time=self.current_time,
+                                         server_id=self.server_id)
+
+    def getMetrics(self, request, context):
+        try:
+            if self.metrics is None:
+                raise ValueError('Metrics are not recorded by this server')
+            return bmi_pb2.GetMetricsResponse(text=self.metrics.to_prometheus())
+        except Exception as e:
+            self.exception_handler(e, context)
+
+    def dumpProfile(self, request, context):
+        try:
+            if self.profiler is None:
+                raise ValueError('Model is not profiled by this server')
+            return bmi_pb2.DumpProfileResponse(files=self.profiler.dump())
+        except Exception as e:
+            self.exception_handler(e, context)
+
+    def save_state(self, path):
+        # type: (BmiServer, str) -> str
+        """Saves state of model to a file, see :func:`grpc4bmi.checkpoint.save_state`."""
+        with self._exclusive():
+            return save_state(self.origin, path)
+
+    def load_state(self, path):
+        # type: (BmiServer, str) -> str
+        """Restores state of model from a file, see :func:`grpc4bmi.checkpoint.load_state`."""
+        with self._exclusive():
+            kind = load_state(self.origin, path, initialized=self.state != bmi_pb2.GetStatusResponse.CREATED)
+            if isinstance(self.bmi_model_, SerializedModel):
+                self.bmi_model_.cache = {}
+        self.regions.clear()
+        if self.snapshots is not None:
+            self.snapshots.invalidate()
+        self._track_time()
+        self._take_snapshots()
+        self._set_state(bmi_pb2.GetStatusResponse.INITIALIZED)
+        return kind
+
+    def work_path(self, path):
+        # type: (BmiServer, str) -> str
+        """Path of a file in the work directory for a path sent by a client.
+
+        Raises:
+            ValueError: When path is absolute or points outside the work directory,
+                so a client can not read or write other files of the server.
+        """
+        if not path:
+            raise ValueError('Path should not be empty')
+        if os.path.isabs(path):
+            raise ValueError(f'Path {path} should be relative to the work directory of the server')
+        work_dir = os.path.realpath(self.work_dir or os.getcwd())
+        if os.path.commonpath([work_dir, os.path.realpath(os.path.join(work_dir, path))]) != work_dir:
+            raise ValueError(f'Path {path} is outside the work directory of the server')
+        return path if self.work_dir is None else os.path.join(self.work_dir, path)
+
+    def saveState(self, request, context):
+        try:
+            return bmi_pb2.StateResponse(kind=self.save_state(self.work_path(request.path)))
+        except Exception as e:
+            self.exception_handler(e, context)
+
+    def loadState(self, request, context):
+        try:
+            return bmi_pb2.StateResponse(kind=self.load_state(self.work_path(request.path)))
+        except Exception as e:
+            self.exception_handler(e, context)
+
+    def clone(self, request, context):
+        try:
+            if self.cloner is None:
+                raise NotClonableError('Server can not be cloned, start it with run-bmi-server to make it clonable')
+            return bmi_pb2.CloneResponse(port=self.cloner.clone(self.save_state))
+        except NotClonableError as e:
+            self.exception_handler(e, context, code_pb2.FAILED_PRECONDITION)
+        except Exception as e:
+            self.exception_handler(e, context)
+
+    def stop_recording(self):
+        # type: (BmiServer) -> int
+        """Stops recording of output variables, after writing all recorded values.
+
+        Returns: Number of recorded time steps
+        """
+        recording, self.recording = self.recording, None
+        if recording is None:
+            return 0
+        recording.close()
+        return recording.time.length
+
+    def startRecording(self, request, context):
+        try:
+            if self.recording is not None:
+                raise ValueError(f'Already recording output to {self.recording.path}')
+            self.recording = OutputWriter(self.bmi_model_, self.work_path(request.path), names=list(request.names),
+                                          interval=request.interval or 1, chunk_size=request.chunk_size or None)
+            return bmi_pb2.Empty()
+        except Exception as e:
+            self.exception_handler(e, context)
+
+    def stopRecording(self, request, context):
+        try:
+            return bmi_pb2.StopRecordingResponse(steps=self.stop_recording())
+        except Exception as e:
+            self.exception_handler(e, context)
+
+    def setZones(self, request, context):
+        try:
+            if not request.name:
+                raise ValueError('Zones should have a name')
+            self.zones[request.name] = Zones(numpy.array(request.zones, dtype=numpy.int64))
+            return bmi_pb2.Empty()
+        except Exception as e:
+            self.exception_handler(e, context)
+
+    def reduceValue(self, request, context):
+        try:
+            operations = list(request.operations)
+            check_operations(operations)
+            zones = None
+            if request.zones:
+                if request.zones not in self.zones:
+                    raise ValueError(f'Unknown zones {request.zones}, register them with setZones first')
+                if len(request.indices):
+                    raise ValueError('Reduce either values at indices or values per zone, not both')
+                zones = self.zones[request.zones]
+            if len(request.indices):
+                indices = numpy.array(request.indices)
+                values = reserve_values_at_indices(self.bmi_model_, request.name, indices)
+                values = self.bmi_model_.get_value_at_indices(request.name, values, indices)
+            else:
+                values = reserve_values(self.bmi_model_, request.name)
+                values = self.bmi_model_.get_value(request.name, values)
+            reduced = reduce_values(values, operations, zones)
+            return bmi_pb2.ReduceValueResponse(values=reduced.ravel(), zones=zones.ids if zones is not None else [])
+        except Exception as e:
+            self.exception_handler(e, context)
+
+    def _accumulator(self, name):
+        if name not in self.accumulators:
+            raise ValueError(f'Unknown accumulator {name}, register it with addAccumulator first')
+        return self.accumulators[name]
+
+    def addAccumulator(self, request, context):
+        try:
+            if not request.name:
+                raise ValueError('Accumulator should have a name')
+            # Check variable exists
+            self.bmi_model_.get_var_type(request.variable)
+            accumulator = Accumulator(request.variable, request.operation, self.current_time, request.period)
+            with self._accumulators_lock:
+                self.accumulators[request.name] = accumulator
+            return bmi_pb2.Empty()
+        except Exception as e:
+            self.exception_handler(e, context)
+
+    def getAccumulator(self, request, context):
+        try:
+            with self._accumulators_lock:
+                accumulator = self._accumulator(request.name)
+                if request.completed:
+                    if accumulator.completed is None:
+                        raise ValueError(f'Accumulator {request.name} has not completed a period yet')
+                    result = accumulator.completed
+                elif request.reset and request.start > 0:
+                    # Later chunks are taken from the accumulation which was reset by the first chunk
+                    if accumulator.taken is None:
+                        raise ValueError(f'Accumulator {request.name} has not been reset yet')
+                    result = accumulator.taken
+                elif request.reset:
+                    result = accumulator.take()
+                else:
+                    result = accumulator.result()
+            return bmi_pb2.GetAccumulatorResponse(values=_chunk(result.values, request), start_time=result.start_time,
+                                                  end_time=result.end_time, steps=result.steps,
+                                                  size=result.values.size)
+        except Exception as e:
+            self.exception_handler(e, context)
+
+    def removeAccumulator(self, request, context):
+        try:
+            with self._accumulators_lock:
+                self._accumulator(request.name)
+                del self.accumulators[request.name]
+            return bmi_pb2.Empty()
+        except Exception as e:
+            self.exception_handler(e, context)
+
     def __repr__(self):
         # type: (BmiServer) -> str
         return self.bmi_model_.__repr__()
@@ -124,6 +124,16 @@ class BmiServiceStub(object):
                 request_serializer=grpc4bmi_dot_bmi__pb2.GetValueAtIndicesRequest.SerializeToString,
                 response_deserializer=grpc4bmi_dot_bmi__pb2.GetValueAtIndicesResponse.FromString,
                 )
+        self.getValueInRegion = channel.unary_unary(
+                '/bmi.BmiService/getValueInRegion',
+                request_serializer=grpc4bmi_dot_bmi__pb2.GetValueInRegionRequest.SerializeToString,
+                response_deserializer=grpc4bmi_dot_bmi__pb2.GetValueInRegionResponse.FromString,
+                )
+        self.getValueCoarsened = channel.unary_unary(
+                '/bmi.BmiService/getValueCoarsened',
+                request_serializer=grpc4bmi_dot_bmi__pb2.GetValueCoarsenedRequest.SerializeToString,
+                response_deserializer=grpc4bmi_dot_bmi__pb2.GetValueCoarsenedResponse.FromString,
+                )
         self.setValue = channel.unary_unary(
                 '/bmi.BmiService/setValue',
                 request_serializer=grpc4bmi_dot_bmi__pb2.SetValueRequest.SerializeToString,
@@ -134,6 +144,11 @@ class BmiServiceStub(object):
                 request_serializer=grpc4bmi_dot_bmi__pb2.SetValueAtIndicesRequest.SerializeToString,
                 response_deserializer=grpc4bmi_dot_bmi__pb2.Empty.FromString,
                 )
+        self.pushValue = channel.unary_unary(
+                '/bmi.BmiService/pushValue',
+                request_serializer=grpc4bmi_dot_bmi__pb2.PushValueRequest.SerializeToString,
+                response_deserializer=grpc4bmi_dot_bmi__pb2.Empty.FromString,
+                )
         self.getGridSize = channel.unary_unary(
                 '/bmi.BmiService/getGridSize',
                 request_serializer=grpc4bmi_dot_bmi__pb2.GridRequest.SerializeToString,
@@ -214,6 +229,71 @@ class BmiServiceStub(object):
                 request_serializer=grpc4bmi_dot_bmi__pb2.GridRequest.SerializeToString,
                 response_deserializer=grpc4bmi_dot_bmi__pb2.GetGridNodesPerFaceResponse.FromString,
                 )
+        self.getStatus = channel.unary_unary(
+                '/bmi.BmiService/getStatus',
+                request_serializer=grpc4bmi_dot_bmi__pb2.Empty.SerializeToString,
+                response_deserializer=grpc4bmi_dot_bmi__pb2.GetStatusResponse.FromString,
+                )
+        self.getMetrics = channel.unary_unary(
+                '/bmi.BmiService/getMetrics',
+                request_serializer=grpc4bmi_dot_bmi__pb2.Empty.SerializeToString,
+                response_deserializer=grpc4bmi_dot_bmi__pb2.GetMetricsResponse.FromString,
+                )
+        self.dumpProfile = channel.unary_unary(
+                '/bmi.BmiService/dumpProfile',
+                request_serializer=grpc4bmi_dot_bmi__pb2.Empty.SerializeToString,
+                response_deserializer=grpc4bmi_dot_bmi__pb2.DumpProfileResponse.FromString,
+                )
+        self.saveState = channel.unary_unary(
+                '/bmi.BmiService/saveState',
+                request_serializer=grpc4bmi_dot_bmi__pb2.StateRequest.SerializeToString,
+                response_deserializer=grpc4bmi_dot_bmi__pb2.StateResponse.FromString,
+                )
+        self.loadState = channel.unary_unary(
+                '/bmi.BmiService/loadState',
+                request_serializer=grpc4bmi_dot_bmi__pb2.StateRequest.SerializeToString,
+                response_deserializer=grpc4bmi_dot_bmi__pb2.StateResponse.FromString,
+                )
+        self.clone = channel.unary_unary(
+                '/bmi.BmiService/clone',
+                request_serializer=grpc4bmi_dot_bmi__pb2.Empty.SerializeToString,
+                response_deserializer=grpc4bmi_dot_bmi__pb2.CloneResponse.FromString,
+                )
+        self.startRecording = channel.unary_unary(
+                '/bmi.BmiService/startRecording',
+                request_serializer=grpc4bmi_dot_bmi__pb2.StartRecordingRequest.SerializeToString,
+                response_deserializer=grpc4bmi_dot_bmi__pb2.Empty.FromString,
+                )
+        self.stopRecording = channel.unary_unary(
+                '/bmi.BmiService/stopRecording',
+                request_serializer=grpc4bmi_dot_bmi__pb2.Empty.SerializeToString,
+                response_deserializer=grpc4bmi_dot_bmi__pb2.StopRecordingResponse.FromString,
+                )
+        self.setZones = channel.unary_unary(
+                '/bmi.BmiService/setZones',
+                request_serializer=grpc4bmi_dot_bmi__pb2.SetZonesRequest.SerializeToString,
+                response_deserializer=grpc4bmi_dot_bmi__pb2.Empty.FromString,
+                )
+        self.reduceValue = channel.unary_unary(
+                '/bmi.BmiService/reduceValue',
+                request_serializer=grpc4bmi_dot_bmi__pb2.ReduceValueRequest.SerializeToString,
+                response_deserializer=grpc4bmi_dot_bmi__pb2.ReduceValueResponse.FromString,
+                )
+        self.addAccumulator = channel.unary_unary(
+                '/bmi.BmiService/addAccumulator',
+                request_serializer=grpc4bmi_dot_bmi__pb2.AddAccumulatorRequest.SerializeToString,
+                response_deserializer=grpc4bmi_dot_bmi__pb2.Empty.FromString,
+                )
+        self.getAccumulator = channel.unary_unary(
+                '/bmi.BmiService/getAccumulator',
+                request_serializer=grpc4bmi_dot_bmi__pb2.AccumulatorRequest.SerializeToString,
+                response_deserializer=grpc4bmi_dot_bmi__pb2.GetAccumulatorResponse.FromString,
+                )
+        self.removeAccumulator = channel.unary_unary(
+                '/bmi.BmiService/removeAccumulator',
+                request_serializer=grpc4bmi_dot_bmi__pb2.AccumulatorRequest.SerializeToString,
+                response_deserializer=grpc4bmi_dot_bmi__pb2.Empty.FromString,
+                )
 
 
 class BmiServiceServicer(object):
@@ -351,6 +431,18 @@ class BmiServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def getValueInRegion(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def getValueCoarsened(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def setValue(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -363,6 +455,12 @@ class BmiServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def pushValue(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def getGridSize(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -459,6 +557,84 @@ class BmiServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def getStatus(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def getMetrics(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def dumpProfile(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def saveState(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def loadState(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def clone(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def startRecording(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def stopRecording(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def setZones(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def reduceValue(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def addAccumulator(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def getAccumulator(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def removeAccumulator(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_BmiServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -572,6 +748,16 @@ def add_BmiServiceServicer_to_server(servicer, server):
                     request_deserializer=grpc4bmi_dot_bmi__pb2.GetValueAtIndicesRequest.FromString,
                     response_serializer=grpc4bmi_dot_bmi__pb2.GetValueAtIndicesResponse.SerializeToString,
             ),
+            'getValueInRegion': grpc.unary_unary_rpc_method_handler(
+                    servicer.getValueInRegion,
+                    request_deserializer=grpc4bmi_dot_bmi__pb2.GetValueInRegionRequest.FromString,
+                    response_serializer=grpc4bmi_dot_bmi__pb2.GetValueInRegionResponse.SerializeToString,
+            ),
+            'getValueCoarsened': grpc.unary_unary_rpc_method_handler(
+                    servicer.getValueCoarsened,
+                    request_deserializer=grpc4bmi_dot_bmi__pb2.GetValueCoarsenedRequest.FromString,
+                    response_serializer=grpc4bmi_dot_bmi__pb2.GetValueCoarsenedResponse.SerializeToString,
+            ),
             'setValue': grpc.unary_unary_rpc_method_handler(
                     servicer.setValue,
                     request_deserializer=grpc4bmi_dot_bmi__pb2.SetValueRequest.FromString,
@@ -582,6 +768,11 @@ def add_BmiServiceServicer_to_server(servicer, server):
                     request_deserializer=grpc4bmi_dot_bmi__pb2.SetValueAtIndicesRequest.FromString,
                     response_serializer=grpc4bmi_dot_bmi__pb2.Empty.SerializeToString,
             ),
+            'pushValue': grpc.unary_unary_rpc_method_handler(
+                    servicer.pushValue,
+                    request_deserializer=grpc4bmi_dot_bmi__pb2.PushValueRequest.FromString,
+                    response_serializer=grpc4bmi_dot_bmi__pb2.Empty.SerializeToString,
+            ),
             'getGridSize': grpc.unary_unary_rpc_method_handler(
                     servicer.getGridSize,
                     request_deserializer=grpc4bmi_dot_bmi__pb2.GridRequest.FromString,
@@ -662,6 +853,71 @@ def add_BmiServiceServicer_to_server(servicer, server):
                     request_deserializer=grpc4bmi_dot_bmi__pb2.GridRequest.FromString,
                     response_serializer=grpc4bmi_dot_bmi__pb2.GetGridNodesPerFaceResponse.SerializeToString,
             ),
+            'getStatus': grpc.unary_unary_rpc_method_handler(
+                    servicer.getStatus,
+                    request_deserializer=grpc4bmi_dot_bmi__pb2.Empty.FromString,
+                    response_serializer=grpc4bmi_dot_bmi__pb2.GetStatusResponse.SerializeToString,
+            ),
+            'getMetrics': grpc.unary_unary_rpc_method_handler(
+                    servicer.getMetrics,
+                    request_deserializer=grpc4bmi_dot_bmi__pb2.Empty.FromString,
+                    response_serializer=grpc4bmi_dot_bmi__pb2.GetMetricsResponse.SerializeToString,
+            ),
+            'dumpProfile': grpc.unary_unary_rpc_method_handler(
+                    servicer.dumpProfile,
+                    request_deserializer=grpc4bmi_dot_bmi__pb2.Empty.FromString,
+                    response_serializer=grpc4bmi_dot_bmi__pb2.DumpProfileResponse.SerializeToString,
+            ),
+            'saveState': grpc.unary_unary_rpc_method_handler(
+                    servicer.saveState,
+                    request_deserializer=grpc4bmi_dot_bmi__pb2.StateRequest.FromString,
+                    response_serializer=grpc4bmi_dot_bmi__pb2.StateResponse.SerializeToString,
+            ),
+            'loadState': grpc.unary_unary_rpc_method_handler(
+                    servicer.loadState,
+                    request_deserializer=grpc4bmi_dot_bmi__pb2.StateRequest.FromString,
+                    response_serializer=grpc4bmi_dot_bmi__pb2.StateResponse.SerializeToString,
+            ),
+            'clone': grpc.unary_unary_rpc_method_handler(
+                    servicer.clone,
+                    request_deserializer=grpc4bmi_dot_bmi__pb2.Empty.FromString,
+                    response_serializer=grpc4bmi_dot_bmi__pb2.CloneResponse.SerializeToString,
+            ),
+            'startRecording': grpc.unary_unary_rpc_method_handler(
+                    servicer.startRecording,
+                    request_deserializer=grpc4bmi_dot_bmi__pb2.StartRecordingRequest.FromString,
+                    response_serializer=grpc4bmi_dot_bmi__pb2.Empty.SerializeToString,
+            ),
+            'stopRecording': grpc.unary_unary_rpc_method_handler(
+                    servicer.stopRecording,
+                    request_deserializer=grpc4bmi_dot_bmi__pb2.Empty.FromString,
+                    response_serializer=grpc4bmi_dot_bmi__pb2.StopRecordingResponse.SerializeToString,
+            ),
+            'setZones': grpc.unary_unary_rpc_method_handler(
+                    servicer.setZones,
+                    request_deserializer=grpc4bmi_dot_bmi__pb2.SetZonesRequest.FromString,
+                    response_serializer=grpc4bmi_dot_bmi__pb2.Empty.SerializeToString,
+            ),
+            'reduceValue': grpc.unary_unary_rpc_method_handler(
+                    servicer.reduceValue,
+                    request_deserializer=grpc4bmi_dot_bmi__pb2.ReduceValueRequest.FromString,
+                    response_serializer=grpc4bmi_dot_bmi__pb2.ReduceValueResponse.SerializeToString,
+            ),
+            'addAccumulator': grpc.unary_unary_rpc_method_handler(
+                    servicer.addAccumulator,
+                    request_deserializer=grpc4bmi_dot_bmi__pb2.AddAccumulatorRequest.FromString,
+                    response_serializer=grpc4bmi_dot_bmi__pb2.Empty.SerializeToString,
+            ),
+            'getAccumulator': grpc.unary_unary_rpc_method_handler(
+                    servicer.getAccumulator,
+                    request_deserializer=grpc4bmi_dot_bmi__pb2.AccumulatorRequest.FromString,
+                    response_serializer=grpc4bmi_dot_bmi__pb2.GetAccumulatorResponse.SerializeToString,
+            ),
+            'removeAccumulator': grpc.unary_unary_rpc_method_handler(
+                    servicer.removeAccumulator,
+                    request_deserializer=grpc4bmi_dot_bmi__pb2.AccumulatorRequest.FromString,
+                    response_serializer=grpc4bmi_dot_bmi__pb2.Empty.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'bmi.BmiService', rpc_method_handlers)
@@ -1046,6 +1302,40 @@ class BmiService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def getValueInRegion(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/bmi.BmiService/getValueInRegion',
+            grpc4bmi_dot_bmi__pb2.GetValueInRegionRequest.SerializeToString,
+            grpc4bmi_dot_bmi__pb2.GetValueInRegionResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def getValueCoarsened(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/bmi.BmiService/getValueCoarsened',
+            grpc4bmi_dot_bmi__pb2.GetValueCoarsenedRequest.SerializeToString,
+            grpc4bmi_dot_bmi__pb2.GetValueCoarsenedResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def setValue(request,
             target,
@@ -1080,6 +1370,23 @@ class BmiService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def pushValue(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/bmi.BmiService/pushValue',
+            grpc4bmi_dot_bmi__pb2.PushValueRequest.SerializeToString,
+            grpc4bmi_dot_bmi__pb2.Empty.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def getGridSize(request,
             target,
@@ -1351,3 +1658,224 @@ class BmiService(object):
             grpc4bmi_dot_bmi__pb2.GetGridNodesPerFaceResponse.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def getStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/bmi.BmiService/getStatus',
+            grpc4bmi_dot_bmi__pb2.Empty.SerializeToString,
+            grpc4bmi_dot_bmi__pb2.GetStatusResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def getMetrics(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/bmi.BmiService/getMetrics',
+            grpc4bmi_dot_bmi__pb2.Empty.SerializeToString,
+            grpc4bmi_dot_bmi__pb2.GetMetricsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def dumpProfile(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/bmi.BmiService/dumpProfile',
+            grpc4bmi_dot_bmi__pb2.Empty.SerializeToString,
+            grpc4bmi_dot_bmi__pb2.DumpProfileResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def saveState(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/bmi.BmiService/saveState',
+            grpc4bmi_dot_bmi__pb2.StateRequest.SerializeToString,
+            grpc4bmi_dot_bmi__pb2.StateResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def loadState(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/bmi.BmiService/loadState',
+            grpc4bmi_dot_bmi__pb2.StateRequest.SerializeToString,
+            grpc4bmi_dot_bmi__pb2.StateResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def clone(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/bmi.BmiService/clone',
+            grpc4bmi_dot_bmi__pb2.Empty.SerializeToString,
+            grpc4bmi_dot_bmi__pb2.CloneResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def startRecording(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/bmi.BmiService/startRecording',
+            grpc4bmi_dot_bmi__pb2.StartRecordingRequest.SerializeToString,
+            grpc4bmi_dot_bmi__pb2.Empty.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def stopRecording(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/bmi.BmiService/stopRecording',
+            grpc4bmi_dot_bmi__pb2.Empty.SerializeToString,
+            grpc4bmi_dot_bmi__pb2.StopRecordingResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def setZones(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/bmi.BmiService/setZones',
+            grpc4bmi_dot_bmi__pb2.SetZonesRequest.SerializeToString,
+            grpc4bmi_dot_bmi__pb2.Empty.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def reduceValue(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/bmi.BmiService/reduceValue',
+            grpc4bmi_dot_bmi__pb2.ReduceValueRequest.SerializeToString,
+            grpc4bmi_dot_bmi__pb2.ReduceValueResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def addAccumulator(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/bmi.BmiService/addAccumulator',
+            grpc4bmi_dot_bmi__pb2.AddAccumulatorRequest.SerializeToString,
+            grpc4bmi_dot_bmi__pb2.Empty.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def getAccumulator(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/bmi.BmiService/getAccumulator',
+            grpc4bmi_dot_bmi__pb2.AccumulatorRequest.SerializeToString,
+            grpc4bmi_dot_bmi__pb2.GetAccumulatorResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def removeAccumulator(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/bmi.BmiService/removeAccumulator',
+            grpc4bmi_dot_bmi__pb2.AccumulatorRequest.SerializeToString,
+            grpc4bmi_dot_bmi__pb2.Empty.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
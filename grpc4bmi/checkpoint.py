@@ -0,0 +1,104 @@
+"""Save the state of a BMI model to a file and restore it later, for example to skip a spin-up.
+
+The state is saved with the first of these ways which works for the model:
+
+1. Native hooks. A model which has ``save_state(path)`` and ``load_state(path)`` methods writes and reads the file itself.
+2. Pickle. The whole model object is pickled, with :mod:`cloudpickle` when it is installed.
+   On load, the attributes of the model are replaced by the attributes of the pickled model.
+3. Variables. The values of all input and output variables are saved with ``get_value``.
+   On load, the input variables are set with ``set_value``.
+   The current time of the model can not be restored this way.
+"""
+import logging
+import os
+import pickle
+
+from grpc4bmi.reserve import reserve_values
+
+try:
+    import cloudpickle
+except ImportError:
+    cloudpickle = None
+
+log = logging.getLogger(__name__)
+
+#: Value of format key in a checkpoint written by :func:`save_state`
+STATE_FORMAT = 'grpc4bmi-state'
+
+
+def has_state_hooks(model) -> bool:
+    """Whether model saves and loads its own state."""
+    return callable(getattr(model, 'save_state', None)) and callable(getattr(model, 'load_state', None))
+
+
+def _variables(model):
+    names = set(model.get_input_var_names()) | set(model.get_output_var_names())
+    return {name: model.get_value(name, reserve_values(model, name)) for name in names}
+
+
+def save_state(model, path: str) -> str:
+    """Saves state of model to a file.
+
+    Args:
+        model: BMI model
+        path: File to write state to. A relative path is relative to the current working directory.
+
+    Returns: How state was saved, either 'native', 'pickle' or 'variables'
+    """
+    if has_state_hooks(model):
+        model.save_state(path)
+        return 'native'
+    try:
+        dumps = cloudpickle.dumps if cloudpickle is not None else pickle.dumps
+        checkpoint = {'format': STATE_FORMAT, 'kind': 'pickle', 'model': dumps(model)}
+    except Exception:
+        log.info(f'Unable to pickle {model!r}, saving values of its variables instead', exc_info=True)
+        checkpoint = {
+            'format': STATE_FORMAT,
+            'kind': 'variables',
+            'time': model.get_current_time(),
+            'values': _variables(model),
+        }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'wb') as f:
+        pickle.dump(checkpoint, f)
+    return checkpoint['kind']
+
+
+def load_state(model, path: str, initialized: bool = True) -> str:
+    """Restores state of model from a file written by :func:`save_state`.
+
+    Args:
+        model: BMI model
+        path: File to read state from
+        initialized: Whether model has been initialized. Values of variables can only be restored into an
+            initialized model.
+
+    Returns: How state was saved, either 'native', 'pickle' or 'variables'
+    """
+    if has_state_hooks(model):
+        model.load_state(path)
+        return 'native'
+    with open(path, 'rb') as f:
+        checkpoint = pickle.load(f)
+    if not isinstance(checkpoint, dict) or checkpoint.get('format') != STATE_FORMAT:
+        raise ValueError(f'{path} is not a state saved by grpc4bmi')
+    if checkpoint['kind'] == 'pickle':
+        saved = pickle.loads(checkpoint['model'])
+        if type(saved) is not type(model):
+            raise ValueError(f'State in {path} is of a {type(saved).__name__} model, not of a {type(model).__name__}')
+        # Replace attributes instead of the object, so references to the model stay valid
+        vars(model).clear()
+        vars(model).update(vars(saved))
+    else:
+        if not initialized:
+            raise ValueError(f'State in {path} holds values of variables, '
+                             f'which can only be restored into an initialized model')
+        inputs = set(model.get_input_var_names())
+        for name, values in checkpoint['values'].items():
+            if name in inputs:
+                model.set_value(name, values)
+        if model.get_current_time() != checkpoint['time']:
+            log.warning(f'Restored variables of model at time {checkpoint["time"]}, '
+                        f'but model is at time {model.get_current_time()}')
+    return checkpoint['kind']
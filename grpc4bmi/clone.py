@@ -0,0 +1,88 @@
+"""Start copies of an initialized BMI server, so ensemble members do not each have to initialize a model.
+
+A gRPC server process can not be forked safely, the threads of gRPC are not copied and a child can hang on locks
+held by them. So a clone is a new ``run-bmi-server`` process which restores the state saved by the server,
+see :mod:`grpc4bmi.checkpoint`.
+"""
+import logging
+import os
+import subprocess
+import tempfile
+from typing import Callable, List
+
+from grpc4bmi.bmi_grpc_client import BmiClient, READINESS_CHANNEL_OPTIONS, wait_until_ready
+from grpc4bmi.exceptions import DeadContainerException
+
+log = logging.getLogger(__name__)
+
+#: Kinds of saved state from which a clone can be started, see :func:`grpc4bmi.checkpoint.save_state`
+CLONABLE_KINDS = ('native', 'pickle')
+
+
+class NotClonableError(RuntimeError):
+    """Raised when the state of a model can not be saved in a way a clone can restore."""
+
+
+class Cloner(object):
+    """Starts clones of a server in new processes and stops them.
+
+    Args:
+        command: Command which runs the server, without port and state options.
+            The options ``--port N --load-state FILE`` are appended to it.
+        timeout: Seconds to wait for a clone to be ready
+    """
+
+    def __init__(self, command: List[str], timeout: float = 60):
+        self.command = command
+        self.timeout = timeout
+        self.processes: List[subprocess.Popen] = []
+
+    def clone(self, save: Callable[[str], str], host: str = 'localhost') -> int:
+        """Saves state with ``save(path)`` and starts a server which restores it.
+
+        Args:
+            save: Saves state to path and returns how, one of :data:`CLONABLE_KINDS`.
+                A state with only the values of variables can not be restored into the uninitialized model of a
+                clone and does not include the time of the model.
+            host: Host to check readiness of clone on
+
+        Raises:
+            NotClonableError: When state was not saved natively or pickled
+
+        Returns: Port of new server
+        """
+        fd, path = tempfile.mkstemp(prefix='grpc4bmi-clone-', suffix='.state')
+        os.close(fd)
+        try:
+            kind = save(path)
+            if kind not in CLONABLE_KINDS:
+                raise NotClonableError(f'Model can only be cloned when it has save_state and load_state methods '
+                                       f'or can be pickled, its state was saved as {kind}')
+            port = BmiClient.get_unique_port(host)
+            env = dict(os.environ, BMI_PORT=str(port))
+            process = subprocess.Popen(self.command + ['--port', str(port), '--load-state', path], env=env)
+            self.processes.append(process)
+
+            def raise_if_dead():
+                returncode = process.poll()
+                if returncode is not None:
+                    raise DeadContainerException(f'Clone exited prematurely with code {returncode}', returncode, '')
+
+            channel = BmiClient.create_grpc_channel(port=port, host=host, options=READINESS_CHANNEL_OPTIONS)
+            wait_until_ready(channel, timeout=self.timeout, is_alive=raise_if_dead)
+            channel.close()
+            log.info(f'Started clone with pid {process.pid} on port {port}')
+            return port
+        finally:
+            os.remove(path)
+
+    def stop(self):
+        """Stops all clones."""
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self.processes = []
@@ -0,0 +1,146 @@
+"""Serialize calls to a BMI model which is served to concurrent clients."""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy
+
+from grpc4bmi.metrics import _model_seconds
+
+#: BMI methods of which the result does not change between initialize and finalize
+CACHED_METHODS = frozenset({
+    'get_component_name',
+    'get_input_item_count',
+    'get_output_item_count',
+    'get_input_var_names',
+    'get_output_var_names',
+    'get_time_units',
+    'get_start_time',
+    'get_end_time',
+    'get_var_grid',
+    'get_var_type',
+    'get_var_itemsize',
+    'get_var_units',
+    'get_var_nbytes',
+    'get_var_location',
+    'get_grid_type',
+    'get_grid_rank',
+    'get_grid_size',
+    'get_grid_shape',
+    'get_grid_spacing',
+    'get_grid_origin',
+    'get_grid_x',
+    'get_grid_y',
+    'get_grid_z',
+    'get_grid_node_count',
+    'get_grid_edge_count',
+    'get_grid_face_count',
+    'get_grid_edge_nodes',
+    'get_grid_face_nodes',
+    'get_grid_face_edges',
+    'get_grid_nodes_per_face',
+})
+
+#: BMI methods which clear the cache of metadata
+RESET_METHODS = frozenset({'initialize', 'finalize'})
+
+_cache_only = contextvars.ContextVar('grpc4bmi_cache_only', default=False)
+
+
+class CacheMiss(BaseException):
+    """Raised by :class:`SerializedModel` inside :func:`cache_only` for a call which needs the model.
+
+    Derived from BaseException, so it is not caught by the ``except Exception`` around servicer methods.
+    """
+
+
+@contextmanager
+def cache_only():
+    """Lets :class:`SerializedModel` answer calls from its cache only and raise :class:`CacheMiss` otherwise.
+
+    Used to answer metadata calls without waiting for, or calling, the model.
+    """
+    token = _cache_only.set(True)
+    try:
+        yield
+    finally:
+        _cache_only.reset(token)
+
+
+class SerializedModel(object):
+    """Wrapper around a BMI model which makes calls to the model one at a time.
+
+    Most models, like Python, R and Julia models, are not thread-safe.
+    All calls are made while holding a lock, except for the methods in :data:`CACHED_METHODS`.
+    Their results do not change between initialize and finalize, so after the first call they are answered from a
+    cache without waiting for the lock. A monitoring client can then ask for metadata while another client runs a
+    time step. Inside :func:`cache_only` a call which is not answered from the cache raises :class:`CacheMiss`,
+    so a server which calls the model from a single thread can answer cached calls elsewhere.
+
+    The time spent waiting for the lock is added to the metrics of the current call,
+    see :class:`grpc4bmi.metrics.ServerMetrics`.
+
+    Args:
+        origin: BMI model to wrap
+    """
+
+    def __init__(self, origin):
+        self.origin = origin
+        self.lock = threading.Lock()
+        self.cache = {}
+
+    def _locked(self, call):
+        if _cache_only.get():
+            raise CacheMiss()
+        start = time.perf_counter()
+        with self.lock:
+            timer = _model_seconds.get()
+            if timer is not None:
+                timer.queue_seconds += time.perf_counter() - start
+            return call()
+
+    def __getattr__(self, item):
+        attr = getattr(self.origin, item)
+        if not callable(attr):
+            return attr
+
+        if item in RESET_METHODS:
+            def reset(*args, **kwargs):
+                def call():
+                    try:
+                        return attr(*args, **kwargs)
+                    finally:
+                        self.cache = {}
+                return self._locked(call)
+            return reset
+
+        if item not in CACHED_METHODS:
+            return lambda *args, **kwargs: self._locked(lambda: attr(*args, **kwargs))
+
+        def cached(*args):
+            # Last argument of grid methods returning an array is the array to fill
+            dest = args[-1] if args and isinstance(args[-1], numpy.ndarray) else None
+            key = (item,) + (args[:-1] if dest is not None else args)
+            try:
+                value = self.cache[key]
+            except TypeError:
+                # Unhashable arguments can not be cached
+                return self._locked(lambda: attr(*args))
+            except KeyError:
+                def call():
+                    result = attr(*args)
+                    # Store while holding lock, so a concurrent initialize can not be overtaken.
+                    # Store the returned array as models may return a new array and leave dest unfilled.
+                    self.cache[key] = numpy.array(result, copy=True) if dest is not None else result
+                    return result
+                return self._locked(call)
+            if dest is None:
+                return value
+            numpy.copyto(src=value, dst=dest)
+            return dest
+
+        return cached
+
+    def __repr__(self):
+        return self.origin.__repr__()
@@ -0,0 +1,279 @@
+"""Couple BMI models which exchange variables while they run.
+
+Models are advanced together in coupling steps with update_until. Before a model runs a step, the variables it
+receives from other models are copied into it. The exchanges form a dependency graph, a model only waits for the
+models it receives values from. Models which do not depend on each other run at the same time and values are
+copied while other models are still running, so a coupled run takes about as long as its slowest model.
+"""
+import logging
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy
+from bmipy import Bmi
+
+from grpc4bmi.reserve import reserve_values, reserve_values_at_indices
+
+log = logging.getLogger(__name__)
+
+
+class CoupledModel(NamedTuple):
+    model: Bmi
+    #: Model time at coupler time zero
+    offset: float = 0.0
+    #: Model time units per coupler time unit
+    scale: float = 1.0
+
+    def model_time(self, time: float) -> float:
+        """Converts coupler time to model time."""
+        return self.offset + self.scale * time
+
+    def coupler_time(self, time: float) -> float:
+        """Converts model time to coupler time."""
+        return (time - self.offset) / self.scale
+
+
+class Exchange(NamedTuple):
+    """Variable of a model which is copied to a variable of another model, see :func:`Coupler.add_exchange`."""
+    source: str
+    source_var: str
+    target: str
+    target_var: str
+    lagged: bool = False
+    src_indices: Optional[numpy.ndarray] = None
+    dest_indices: Optional[numpy.ndarray] = None
+    transform: Optional[Callable[[numpy.ndarray], numpy.ndarray]] = None
+    address: Optional[str] = None
+
+
+def _run_after(dependencies: Sequence[Future], fn, *args):
+    for dependency in dependencies:
+        dependency.result()
+    return fn(*args)
+
+
+class Coupler(object):
+    """Runs BMI models side by side, exchanging variables every coupling step.
+
+    Any :class:`bmipy.Bmi` can be coupled, like a model in this process, a
+    :class:`grpc4bmi.bmi_grpc_client.BmiClient` or a containerized model.
+    Models should be initialized before they are added and are not finalized by the coupler.
+
+    Calls to a single model are made one after another in the order of the coupling steps,
+    calls to different models are made concurrently.
+
+    Example:
+
+        River routing receives runoff of a hydrology model every day,
+        groundwater receives the river level of the day before.
+
+        >>> coupler = Coupler(step=1.0)
+        >>> coupler.add_model('hydrology', hydrology)
+        >>> coupler.add_model('river', river)
+        >>> coupler.add_model('groundwater', groundwater, scale=86400.0)  # in seconds instead of days
+        >>> coupler.add_exchange('hydrology', 'runoff', 'river', 'lateral_inflow')
+        >>> coupler.add_exchange('river', 'water_level', 'groundwater', 'river_stage', lagged=True)
+        >>> with coupler:
+        ...     coupler.run(365.0)
+
+    Args:
+        step: Coupling time step in coupler time
+        start_time: Coupler time at start. Defaults to the latest current time of the models.
+        max_workers: Maximum number of calls made at the same time. Defaults to number of models and exchanges.
+        lookahead: Number of coupling steps a model may run ahead of the models it does not depend on
+    """
+
+    def __init__(self, step: float, start_time: Optional[float] = None, max_workers: Optional[int] = None,
+                 lookahead: int = 1):
+        if step <= 0:
+            raise ValueError(f'Step should be larger than zero, got {step}')
+        if lookahead < 0:
+            raise ValueError(f'Lookahead should not be negative, got {lookahead}')
+        self.step = step
+        #: Coupler time up to which all models have been run
+        self.time = start_time
+        self.max_workers = max_workers
+        self.lookahead = lookahead
+        self.models: Dict[str, CoupledModel] = {}
+        self.exchanges: List[Exchange] = []
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self._order: Optional[List[str]] = None
+        # Last submitted call of each model, every call of a model waits for the previous one
+        self._last: Dict[str, Future] = {}
+
+    def add_model(self, name: str, model: Bmi, offset: float = 0.0, scale: float = 1.0):
+        """Adds an initialized model.
+
+        Time of model is ``offset + scale * coupler time``.
+        """
+        if name in self.models:
+            raise ValueError(f'Model {name} has already been added')
+        if scale <= 0:
+            raise ValueError(f'Scale should be larger than zero, got {scale}')
+        self.models[name] = CoupledModel(model, offset, scale)
+        self._order = None
+
+    def add_exchange(self, source: str, source_var: str, target: str, target_var: str, lagged: bool = False,
+                     src_indices: Optional[numpy.ndarray] = None, dest_indices: Optional[numpy.ndarray] = None,
+                     transform: Optional[Callable[[numpy.ndarray], numpy.ndarray]] = None,
+                     address: Optional[str] = None):
+        """Copies a variable of a model to a variable of another model before every coupling step of the target.
+
+        Args:
+            source: Name of model to get values from
+            source_var: Name of variable to get
+            target: Name of model to set values on
+            target_var: Name of variable to set
+            lagged: If false then target waits until source has run the same step and receives the values at the
+                end of the step. If true then target receives the values at the start of the step, so source and
+                target run the step at the same time. Exchanges which are not lagged should not form a cycle.
+            src_indices: If set then only get values at these indices
+            dest_indices: If set then set values at these indices, otherwise set the whole variable
+            transform: Function called with the values before they are set, like a unit conversion or regridding
+            address: Address of target server as seen from source server. If set then source should be a
+                :class:`grpc4bmi.bmi_grpc_client.BmiClient` which pushes the values directly to target with
+                :func:`grpc4bmi.bmi_grpc_client.BmiClient.push_value`.
+        """
+        for name in (source, target):
+            if name not in self.models:
+                raise ValueError(f'Unknown model {name}, add it with add_model first')
+        if source == target:
+            raise ValueError(f'Model {source} can not exchange with itself')
+        if address is not None and transform is not None:
+            raise ValueError('Values pushed to an address can not be transformed')
+        self.exchanges.append(Exchange(source, source_var, target, target_var, lagged,
+                                       src_indices, dest_indices, transform, address))
+        self._order = None
+
+    def dependencies(self) -> Dict[str, List[str]]:
+        """Models which each model waits for within a coupling step."""
+        graph = {name: [] for name in self.models}
+        for exchange in self.exchanges:
+            if not exchange.lagged and exchange.source not in graph[exchange.target]:
+                graph[exchange.target].append(exchange.source)
+        return graph
+
+    def order(self) -> List[str]:
+        """Models in order in which a coupling step is started, each model comes after the models it waits for.
+
+        Raises:
+            ValueError: When exchanges which are not lagged form a cycle
+        """
+        if self._order is None:
+            waiting = self.dependencies()
+            order = []
+            while waiting:
+                ready = [name for name, sources in waiting.items() if not set(sources) - set(order)]
+                if not ready:
+                    raise ValueError(f'Exchanges between models {", ".join(waiting)} form a cycle, '
+                                     f'make at least one of them lagged')
+                order.extend(ready)
+                for name in ready:
+                    del waiting[name]
+            self._order = order
+        return self._order
+
+    def _submit(self, names: Sequence[str], fn, *args) -> Future:
+        dependencies = [self._last[name] for name in names if name in self._last]
+        future = self.executor.submit(_run_after, dependencies, fn, *args)
+        for name in names:
+            self._last[name] = future
+        return future
+
+    def _get(self, exchange: Exchange) -> numpy.ndarray:
+        model = self.models[exchange.source].model
+        if exchange.src_indices is not None:
+            values = reserve_values_at_indices(model, exchange.source_var, exchange.src_indices)
+            values = model.get_value_at_indices(exchange.source_var, values, exchange.src_indices)
+        else:
+            values = model.get_value(exchange.source_var, reserve_values(model, exchange.source_var))
+        if exchange.transform is not None:
+            values = exchange.transform(values)
+        return values
+
+    def _set(self, exchange: Exchange, values: Future):
+        model = self.models[exchange.target].model
+        values = values.result()
+        if exchange.dest_indices is not None:
+            model.set_value_at_indices(exchange.target_var, exchange.dest_indices, values)
+        else:
+            model.set_value(exchange.target_var, values)
+
+    def _push(self, exchange: Exchange):
+        self.models[exchange.source].model.push_value(exchange.source_var, exchange.address, exchange.target_var,
+                                                      exchange.src_indices, exchange.dest_indices)
+
+    def _update(self, name: str, time: float):
+        coupled = self.models[name]
+        coupled.model.update_until(coupled.model_time(time))
+
+    def _submit_exchange(self, exchange: Exchange) -> List[Future]:
+        if exchange.address is not None:
+            return [self._submit([exchange.source, exchange.target], self._push, exchange)]
+        # Getting and setting are separate calls, so source does not wait for target to finish its previous step
+        values = self._submit([exchange.source], self._get, exchange)
+        return [values, self._submit([exchange.target], self._set, exchange, values)]
+
+    def _submit_step(self, time: float) -> List[Future]:
+        # Calls only wait for calls submitted before them, so the executor can not deadlock
+        futures = []
+        for exchange in self.exchanges:
+            if exchange.lagged:
+                futures.extend(self._submit_exchange(exchange))
+        for name in self.order():
+            for exchange in self.exchanges:
+                if exchange.target == name and not exchange.lagged:
+                    futures.extend(self._submit_exchange(exchange))
+            futures.append(self._submit([name], self._update, name, time))
+        return futures
+
+    def run(self, end_time: float):
+        """Runs all models in coupling steps until end time in coupler time.
+
+        The last step is shortened to end at end time.
+        When a call fails, no further steps are started and the exception is raised once the started calls have
+        finished. The models are then at different times.
+        """
+        if not self.models:
+            raise ValueError('No models to run, add them with add_model first')
+        self.order()
+        if self.time is None:
+            self.time = max(coupled.coupler_time(coupled.model.get_current_time())
+                            for coupled in self.models.values())
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers or len(self.models) + len(self.exchanges),
+                                               thread_name_prefix='coupler')
+        steps: Deque[List[Future]] = deque()
+        submitted = self.time
+        error = None
+        while True:
+            if error is None and submitted < end_time and len(steps) <= self.lookahead:
+                submitted = min(submitted + self.step, end_time)
+                steps.append(self._submit_step(submitted))
+            elif steps:
+                for future in steps.popleft():
+                    try:
+                        future.result()
+                    except Exception as e:
+                        error = error or e
+                if error is None:
+                    self.time = min(self.time + self.step, end_time)
+            else:
+                break
+        self._last = {}
+        if error is not None:
+            log.error(f'Coupled run failed after coupler time {self.time}')
+            raise error
+
+    def close(self):
+        """Stops calling models. The models are not finalized."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,183 @@
+"""Run many copies of a BMI model in lockstep."""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy
+from bmipy import Bmi
+
+from grpc4bmi.reserve import reserve_values
+
+log = logging.getLogger(__name__)
+
+
+class EnsembleFailedError(RuntimeError):
+    """Raised when an ensemble is called while none of its members are active."""
+
+
+class Ensemble(object):
+    """Ensemble of BMI models which are called concurrently.
+
+    Every broadcasted call is made on all members at the same time, so a step of the ensemble takes as long as its
+    slowest member instead of the sum of all members.
+
+    A member which raises an exception is taken out of the ensemble, the other members keep running.
+    The exception is stored in :attr:`errors` under the index of the member.
+    Gathered and scattered values only include the :attr:`active` members.
+    When all members have failed, calls raise :class:`EnsembleFailedError`.
+
+    Example:
+
+        Run 50 members of a containerized model, each with its own work directory and config file.
+
+        >>> from grpc4bmi.bmi_client_docker import BmiClientDocker
+        >>> from grpc4bmi.ensemble import Ensemble
+        >>> members = [{'image': 'ewatercycle/walrus-grpc4bmi:v0.3.1', 'work_dir': f'/tmp/member{i}'}
+        ...            for i in range(50)]
+        >>> with Ensemble.launch(BmiClientDocker, members) as ensemble:
+        ...     ensemble.initialize([f'/tmp/member{i}/config.yml' for i in range(50)])
+        ...     ensemble.update_until(367500)
+        ...     states = ensemble.get_value('Q')  # array with shape (50, size)
+        ...     ensemble.set_value('Q', states * 1.1)
+
+    Args:
+        members: BMI models which form the ensemble
+        max_workers: Maximum number of members called at the same time. Defaults to all members.
+    """
+
+    def __init__(self, members: Sequence[Bmi], max_workers: Optional[int] = None):
+        self.members: List[Bmi] = list(members)
+        #: Exceptions of failed members by member index
+        self.errors: Dict[int, Exception] = {}
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or max(len(self.members), 1),
+                                           thread_name_prefix='ensemble')
+
+    @classmethod
+    def launch(cls, factory: Callable[..., Bmi], member_kwargs: Iterable[Mapping[str, Any]],
+               max_workers: Optional[int] = None) -> 'Ensemble':
+        """Launches members in parallel.
+
+        A member which fails to launch is recorded in :attr:`errors` and is not part of the ensemble.
+
+        Args:
+            factory: Callable which launches a member, for example
+                :class:`grpc4bmi.bmi_client_docker.BmiClientDocker` or
+                :class:`grpc4bmi.bmi_client_apptainer.BmiClientApptainer`.
+            member_kwargs: Keyword arguments for factory, one mapping per member.
+            max_workers: Maximum number of members launched or called at the same time.
+                Defaults to all members.
+        """
+        member_kwargs = list(member_kwargs)
+        ensemble = cls([None] * len(member_kwargs), max_workers=max_workers)
+        launches = [ensemble.executor.submit(factory, **kwargs) for kwargs in member_kwargs]
+        for index, launch in enumerate(launches):
+            try:
+                ensemble.members[index] = launch.result()
+            except Exception as e:
+                log.exception(f'Member {index} of ensemble failed to launch')
+                ensemble.errors[index] = e
+        return ensemble
+
+    @property
+    def active(self) -> List[int]:
+        """Indices of members which have not failed."""
+        return [index for index in range(len(self.members)) if index not in self.errors]
+
+    def _map(self, fn: Callable[[int, Bmi], Any]) -> List[Any]:
+        """Calls fn(index, member) concurrently for each active member.
+
+        Returns: Results of the members which are still active afterwards, in member order.
+
+        Raises:
+            EnsembleFailedError: When no members are active before or after the calls
+        """
+        indices = self.active
+        if not indices:
+            raise EnsembleFailedError(f'All {len(self.members)} members of ensemble have failed, see errors')
+        calls = [self.executor.submit(fn, index, self.members[index]) for index in indices]
+        results = []
+        for index, call in zip(indices, calls):
+            try:
+                results.append(call.result())
+            except Exception as e:
+                log.exception(f'Member {index} of ensemble failed, removing it from ensemble')
+                self.errors[index] = e
+        if not self.active:
+            raise EnsembleFailedError(f'All {len(self.members)} members of ensemble have failed, see errors') \
+                from self.errors[indices[-1]]
+        return results
+
+    def _per_member(self, value, name):
+        if isinstance(value, str) or value is None or not isinstance(value, Sequence):
+            return [value] * len(self.members)
+        if len(value) != len(self.members):
+            raise ValueError(f'Expected {len(self.members)} values for {name}, got {len(value)}')
+        return list(value)
+
+    def call(self, method: str, *args) -> List[Any]:
+        """Calls a BMI method with the same arguments on all active members.
+
+        Returns: Return values of active members
+        """
+        return self._map(lambda _, member: getattr(member, method)(*args))
+
+    def initialize(self, config_files: Union[Optional[str], Sequence[Optional[str]]] = None):
+        """Initializes all members.
+
+        Args:
+            config_files: Config file for all members or a sequence with a config file for each member.
+        """
+        config_files = self._per_member(config_files, 'config_files')
+        self._map(lambda index, member: member.initialize(config_files[index]))
+
+    def update(self):
+        self.call('update')
+
+    def update_until(self, time: float):
+        self.call('update_until', time)
+
+    def finalize(self):
+        self.call('finalize')
+
+    def get_current_time(self) -> numpy.ndarray:
+        """Current time of each active member."""
+        return numpy.array(self.call('get_current_time'))
+
+    def get_value(self, name: str) -> numpy.ndarray:
+        """Gathers a variable from all active members.
+
+        Returns: Array with shape (number of active members, size of variable)
+        """
+        def gather(_, member):
+            return member.get_value(name, reserve_values(member, name))
+
+        return numpy.stack(self._map(gather))
+
+    def set_value(self, name: str, values: numpy.ndarray):
+        """Scatters values into active members.
+
+        Args:
+            name: Name of variable
+            values: Array with first dimension of size number of active members
+        """
+        indices = self.active
+        if len(values) != len(indices):
+            raise ValueError(f'Expected values for {len(indices)} active members, got {len(values)}')
+        rows = dict(zip(indices, values))
+        self._map(lambda index, member: member.set_value(name, numpy.ascontiguousarray(rows[index])))
+
+    def close(self):
+        """Stops calling members and drops references to them, which stops containerized members."""
+        self.executor.shutdown(wait=True)
+        self.members = []
+        self.errors = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        """Number of members, including failed members, see :attr:`active` for the members which still run."""
+        return len(self.members)
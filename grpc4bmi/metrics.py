@@ -0,0 +1,465 @@
+"""Per-RPC latency and throughput metrics of BMI gRPC servers and clients.
+
+Server metrics are collected by an interceptor on the server and can be rendered in the
+`Prometheus text format <https://prometheus.io/docs/instrumenting/exposition_formats/>`_.
+Client metrics are collected by wrapping the stub of a :class:`grpc4bmi.bmi_grpc_client.BmiClient`.
+"""
+import bisect
+import contextvars
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+import grpc
+import numpy
+
+log = logging.getLogger(__name__)
+
+#: Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+                   60.0, 120.0, 300.0, float('inf'))
+
+# Seconds spent in model during the current call, set by the interceptor and increased by TimedModel
+_model_seconds = contextvars.ContextVar('grpc4bmi_model_seconds', default=None)
+
+
+class _Timer(object):
+    def __init__(self):
+        self.seconds = 0.0
+        self.queue_seconds = 0.0
+
+
+class MethodMetrics(object):
+    """Metrics of a single RPC method."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self.latency_seconds = 0.0
+        self.model_seconds = 0.0
+        self.queue_seconds = 0.0
+        self.serialization_seconds = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+
+class ServerMetrics(object):
+    """Thread-safe registry of metrics per RPC method.
+
+    For each method the following is recorded:
+
+    * number of calls and number of calls which raised an error
+    * histogram of the time spent in the handler
+    * time spent in calls to the model, see :class:`TimedModel`
+    * time spent waiting for other calls to the model to complete,
+      see :class:`grpc4bmi.concurrency.SerializedModel`
+    * time spent on protobuf encoding and decoding of requests and responses
+    * bytes received in requests and sent in responses
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.methods = {}
+
+    def _method(self, method):
+        if method not in self.methods:
+            self.methods[method] = MethodMetrics()
+        return self.methods[method]
+
+    def observe_call(self, method, seconds, model_seconds, failed=False, queue_seconds=0.0):
+        with self._lock:
+            metrics = self._method(method)
+            metrics.calls += 1
+            if failed:
+                metrics.errors += 1
+            metrics.latency_buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            metrics.latency_seconds += seconds
+            metrics.model_seconds += model_seconds
+            metrics.queue_seconds += queue_seconds
+
+    def observe_request(self, method, nbytes, seconds):
+        with self._lock:
+            metrics = self._method(method)
+            metrics.request_bytes += nbytes
+            metrics.serialization_seconds += seconds
+
+    def observe_response(self, method, nbytes, seconds):
+        with self._lock:
+            metrics = self._method(method)
+            metrics.response_bytes += nbytes
+            metrics.serialization_seconds += seconds
+
+    def to_prometheus(self) -> str:
+        """Renders metrics in Prometheus text format."""
+        with self._lock:
+            methods = sorted(self.methods.items())
+            lines = []
+
+            def counter(name, help_text, attr):
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} counter')
+                for method, metrics in methods:
+                    lines.append(f'{name}{{method="{method}"}} {getattr(metrics, attr)}')
+
+            counter('grpc4bmi_server_calls_total', 'Number of completed calls.', 'calls')
+            counter('grpc4bmi_server_errors_total', 'Number of calls which returned an error.', 'errors')
+            name = 'grpc4bmi_server_latency_seconds'
+            lines.append(f'# HELP {name} Time spent in handler, excluding protobuf encoding and decoding.')
+            lines.append(f'# TYPE {name} histogram')
+            for method, metrics in methods:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, metrics.latency_buckets):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{name}_bucket{{method="{method}",le="{le}"}} {cumulative}')
+                lines.append(f'{name}_sum{{method="{method}"}} {metrics.latency_seconds}')
+                lines.append(f'{name}_count{{method="{method}"}} {metrics.calls}')
+            counter('grpc4bmi_server_model_seconds_total', 'Time spent in calls to the model.', 'model_seconds')
+            counter('grpc4bmi_server_queue_seconds_total',
+                    'Time spent waiting for other calls to the model to complete.', 'queue_seconds')
+            counter('grpc4bmi_server_serialization_seconds_total',
+                    'Time spent on protobuf encoding and decoding of messages.', 'serialization_seconds')
+            counter('grpc4bmi_server_request_bytes_total', 'Bytes received in requests.', 'request_bytes')
+            counter('grpc4bmi_server_response_bytes_total', 'Bytes sent in responses.', 'response_bytes')
+        return '\n'.join(lines) + '\n'
+
+
+class TimedModel(object):
+    """Wrapper around a BMI model which adds the time spent in the model to the metrics of the current call.
+
+    Args:
+        origin: BMI model to wrap
+    """
+
+    def __init__(self, origin):
+        self.origin = origin
+
+    def __getattr__(self, item):
+        attr = getattr(self.origin, item)
+        if not callable(attr):
+            return attr
+
+        def timed(*args, **kwargs):
+            timer = _model_seconds.get()
+            if timer is None:
+                return attr(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                timer.seconds += time.perf_counter() - start
+
+        return timed
+
+    def __repr__(self):
+        return self.origin.__repr__()
+
+
+def _timed_deserializer(metrics, method, deserializer):
+    def deserialize(data):
+        start = time.perf_counter()
+        message = deserializer(data) if deserializer else data
+        metrics.observe_request(method, len(data), time.perf_counter() - start)
+        return message
+    return deserialize
+
+
+def _timed_serializer(metrics, method, serializer):
+    def serialize(message):
+        start = time.perf_counter()
+        data = serializer(message) if serializer else message
+        metrics.observe_response(method, len(data), time.perf_counter() - start)
+        return data
+    return serialize
+
+
+def _instrument(metrics, method, handler, behavior):
+    return grpc.unary_unary_rpc_method_handler(
+        behavior,
+        request_deserializer=_timed_deserializer(metrics, method, handler.request_deserializer),
+        response_serializer=_timed_serializer(metrics, method, handler.response_serializer),
+    )
+
+
+class MetricsInterceptor(grpc.ServerInterceptor):
+    """Server interceptor which records metrics of unary calls.
+
+    Args:
+        metrics: Registry to record metrics in
+    """
+
+    def __init__(self, metrics: ServerMetrics):
+        self.metrics = metrics
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+        method = handler_call_details.method
+        behavior = handler.unary_unary
+
+        def timed_behavior(request, context):
+            timer = _Timer()
+            token = _model_seconds.set(timer)
+            start = time.perf_counter()
+            failed = True
+            try:
+                response = behavior(request, context)
+                failed = False
+                return response
+            finally:
+                _model_seconds.reset(token)
+                self.metrics.observe_call(method, time.perf_counter() - start, timer.seconds, failed,
+                                          timer.queue_seconds)
+
+        return _instrument(self.metrics, method, handler, timed_behavior)
+
+
+class AioMetricsInterceptor(grpc.aio.ServerInterceptor):
+    """Same as :class:`MetricsInterceptor`, but for a :func:`grpc.aio.server`.
+
+    Model time is only recorded when the model thread runs in the context of the call,
+    like :class:`grpc4bmi.bmi_grpc_aio_server.BmiAioServer` does.
+    """
+
+    def __init__(self, metrics: ServerMetrics):
+        self.metrics = metrics
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+        method = handler_call_details.method
+        behavior = handler.unary_unary
+
+        async def timed_behavior(request, context):
+            timer = _Timer()
+            token = _model_seconds.set(timer)
+            start = time.perf_counter()
+            failed = True
+            try:
+                response = await behavior(request, context)
+                failed = False
+                return response
+            finally:
+                _model_seconds.reset(token)
+                self.metrics.observe_call(method, time.perf_counter() - start, timer.seconds, failed,
+                                          timer.queue_seconds)
+
+        return _instrument(self.metrics, method, handler, timed_behavior)
+
+
+def start_http_server(metrics: ServerMetrics, port: int, host: str = '') -> ThreadingHTTPServer:
+    """Serves metrics in Prometheus text format over HTTP from a background thread.
+
+    Args:
+        metrics: Metrics to serve
+        port: Port to listen on
+        host: Host to listen on, defaults to all interfaces
+
+    Returns: The HTTP server, call its ``shutdown()`` method to stop serving.
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = metrics.to_prometheus().encode('utf8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            log.debug(format, *args)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True)
+    thread.start()
+    log.info(f'Serving metrics at http://{host or "0.0.0.0"}:{server.server_address[1]}/metrics')
+    return server
+
+
+#: Maximum number of latencies kept per method by a client to compute percentiles from
+LATENCY_SAMPLE_SIZE = 10000
+
+
+class ClientMethodMetrics(object):
+    """Metrics of a single RPC method as seen by the client.
+
+    Memory use does not grow with the number of calls. Total, maximum and histogram of latencies are exact,
+    percentiles are computed from a uniform random sample of at most :data:`LATENCY_SAMPLE_SIZE` latencies.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        #: Sample of latencies in seconds
+        self.latencies: List[float] = []
+        self.seconds_total = 0.0
+        self.latency_max = 0.0
+        #: Number of calls per bucket of :data:`LATENCY_BUCKETS`
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def observe_latency(self, seconds: float):
+        self.seconds_total += seconds
+        self.latency_max = max(self.latency_max, seconds)
+        self.latency_buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        # Reservoir sampling, every latency has the same chance to be in the sample
+        if len(self.latencies) < LATENCY_SAMPLE_SIZE:
+            self.latencies.append(seconds)
+        else:
+            index = random.randrange(self.calls)
+            if index < LATENCY_SAMPLE_SIZE:
+                self.latencies[index] = seconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        latencies = numpy.array(self.latencies)
+        p50, p90, p99 = numpy.percentile(latencies, [50, 90, 99]) if len(latencies) else (0.0, 0.0, 0.0)
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'seconds_total': self.seconds_total,
+            'latency_p50': float(p50),
+            'latency_p90': float(p90),
+            'latency_p99': float(p99),
+            'latency_max': self.latency_max,
+            'request_bytes': self.request_bytes,
+            'response_bytes': self.response_bytes,
+        }
+
+
+class ClientMetrics(object):
+    """Thread-safe registry of metrics per RPC method as seen by a client.
+
+    For each method the number of calls and errors, the wall time spent waiting for the server
+    and the bytes of the sent requests and received responses are recorded.
+    The wall time includes network transfer and protobuf encoding on both sides,
+    so comparing it with the server metrics tells whether a call is network-bound.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.methods: Dict[str, ClientMethodMetrics] = {}
+
+    def observe(self, method: str, seconds: float, request_bytes: int, response_bytes: int, failed=False):
+        with self._lock:
+            if method not in self.methods:
+                self.methods[method] = ClientMethodMetrics()
+            metrics = self.methods[method]
+            metrics.calls += 1
+            if failed:
+                metrics.errors += 1
+            metrics.observe_latency(seconds)
+            metrics.request_bytes += request_bytes
+            metrics.response_bytes += response_bytes
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Metrics per method name, with latency percentiles in seconds.
+
+        Example:
+
+            >>> client.metrics.as_dict()['getValue']
+            {'calls': 10, 'errors': 0, 'seconds_total': 0.0123, 'latency_p50': 0.0011, ...}
+        """
+        with self._lock:
+            return {method: metrics.as_dict() for method, metrics in sorted(self.methods.items())}
+
+    def latencies(self) -> Dict[str, List[float]]:
+        """Latencies in seconds of a sample of the recorded calls, per method name.
+
+        All latencies are kept up to :data:`LATENCY_SAMPLE_SIZE` calls of a method.
+        """
+        with self._lock:
+            return {method: list(metrics.latencies) for method, metrics in self.methods.items()}
+
+    def latency_buckets(self) -> Dict[str, List[int]]:
+        """Number of recorded calls per bucket of :data:`LATENCY_BUCKETS`, per method name."""
+        with self._lock:
+            return {method: list(metrics.latency_buckets) for method, metrics in self.methods.items()}
+
+    def to_json(self, file=None, **kwargs) -> str:
+        """Dumps metrics as JSON.
+
+        Args:
+            file: When given, path of file to write JSON to.
+            kwargs: Keyword arguments passed to :func:`json.dumps`, like ``indent``.
+
+        Returns: The JSON document
+        """
+        document = json.dumps(self.as_dict(), **kwargs)
+        if file is not None:
+            with open(file, 'w') as f:
+                f.write(document)
+        return document
+
+    def reset(self):
+        with self._lock:
+            self.methods = {}
+
+
+def _message_size(message) -> int:
+    byte_size = getattr(message, 'ByteSize', None)
+    return byte_size() if callable(byte_size) else 0
+
+
+class _InstrumentedMethod(object):
+    def __init__(self, name, method, stub):
+        self.name = name
+        self.method = method
+        self.stub = stub
+
+    def _observe(self, start, request, response, failed):
+        seconds = time.perf_counter() - start
+        request_bytes = _message_size(request)
+        response_bytes = 0 if failed else _message_size(response)
+        for metrics in list(self.stub.sinks):
+            metrics.observe(self.name, seconds, request_bytes, response_bytes, failed)
+
+    def __call__(self, request, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = self.method(request, *args, **kwargs)
+        except Exception:
+            self._observe(start, request, None, True)
+            raise
+        self._observe(start, request, response, False)
+        return response
+
+    def future(self, request, *args, **kwargs):
+        start = time.perf_counter()
+        call = self.method.future(request, *args, **kwargs)
+
+        def on_done(done):
+            failed = done.cancelled() or done.exception() is not None
+            self._observe(start, request, None if failed else done.result(), failed)
+
+        call.add_done_callback(on_done)
+        return call
+
+
+class InstrumentedStub(object):
+    """Wrapper around a BMI gRPC stub which records every call in the metrics registries in :attr:`sinks`.
+
+    Wraps the stub instead of the channel, so it also works for a custom stub passed to
+    :class:`grpc4bmi.bmi_grpc_client.BmiClient`.
+
+    Args:
+        stub: Stub to wrap, usually a :class:`grpc4bmi.bmi_pb2_grpc.BmiServiceStub`
+    """
+
+    def __init__(self, stub):
+        self.stub = stub
+        #: Registries calls are recorded in
+        self.sinks: List[ClientMetrics] = []
+
+    def __getattr__(self, item):
+        attr = getattr(self.stub, item)
+        if not callable(attr) or item.startswith('_'):
+            return attr
+        return _InstrumentedMethod(item, attr, self)
@@ -0,0 +1,297 @@
+"""Stream output variables of a BMI model to disk while the model runs.
+
+Values are written to a directory in the `Zarr version 2 <https://zarr.readthedocs.io/en/stable/spec/v2.html>`_ format
+without compression, which can be opened with ``zarr.open(path)`` or ``xarray.open_zarr(path)``.
+Each variable is an array with time as first dimension, followed by the shape of its grid for structured grids or
+the number of values for other grids. The ``time`` array holds the model time of each recorded time step.
+Coordinates of uniform rectilinear and rectilinear grids are written as well.
+
+Writing happens on a background thread from a bounded queue, so disk I/O overlaps the next time step
+and memory use does not grow with the length of a run.
+"""
+import json
+import logging
+import math
+import os
+import queue
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy
+
+from grpc4bmi.reserve import reserve_values
+from grpc4bmi.subset import STRUCTURED_GRIDS, axis_coordinates
+
+log = logging.getLogger(__name__)
+
+#: Bytes of a chunk of a variable, used to choose the number of time steps in a chunk
+CHUNK_BYTES = 2 ** 23
+
+TIME_CHUNK_SIZE = 1024
+
+_STOP = object()
+
+
+def _write_json(path: str, document):
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+
+
+def _fill_value(dtype: numpy.dtype):
+    if dtype.kind == 'f':
+        return 'NaN'
+    if dtype.kind == 'b':
+        return False
+    return 0
+
+
+class ZarrArray(object):
+    """Array in a Zarr store which grows along its first dimension by appending values.
+
+    Appended values are collected into a chunk, which is written when full or on :func:`flush`.
+
+    Args:
+        path: Directory of array
+        shape: Shape of a single item
+        dtype: Type of values
+        chunk_size: Number of items in a chunk
+        dimensions: Names of dimensions, including the first dimension
+        attributes: Extra attributes of array, like units
+    """
+
+    def __init__(self, path: str, shape: Tuple[int, ...], dtype: numpy.dtype, chunk_size: int,
+                 dimensions: Sequence[str], attributes: Optional[Dict[str, object]] = None):
+        self.path = path
+        self.shape = tuple(shape)
+        self.dtype = numpy.dtype(dtype)
+        self.chunk_size = chunk_size
+        self.length = 0
+        self.chunk = numpy.empty((chunk_size,) + self.shape, dtype=self.dtype)
+        os.makedirs(path, exist_ok=True)
+        _write_json(os.path.join(path, '.zattrs'), dict(attributes or {}, _ARRAY_DIMENSIONS=list(dimensions)))
+        self._write_metadata()
+
+    def _write_metadata(self):
+        _write_json(os.path.join(self.path, '.zarray'), {
+            'zarr_format': 2,
+            'shape': [self.length] + list(self.shape),
+            'chunks': [self.chunk_size] + list(self.shape),
+            'dtype': self.dtype.str,
+            'compressor': None,
+            'fill_value': _fill_value(self.dtype),
+            'order': 'C',
+            'filters': None,
+        })
+
+    def _write_chunk(self, filled: int):
+        if filled < self.chunk_size:
+            # Chunks at the end of an array are stored in full
+            self.chunk[filled:] = numpy.nan if self.dtype.kind == 'f' else 0
+        index = (self.length - 1) // self.chunk_size
+        key = '.'.join([str(index)] + ['0'] * len(self.shape))
+        with open(os.path.join(self.path, key), 'wb') as f:
+            f.write(self.chunk.tobytes())
+
+    def append(self, values: numpy.ndarray):
+        filled = self.length % self.chunk_size
+        self.chunk[filled] = numpy.reshape(values, self.shape)
+        self.length += 1
+        if filled + 1 == self.chunk_size:
+            self._write_chunk(self.chunk_size)
+            self._write_metadata()
+
+    def flush(self):
+        """Writes the partially filled chunk and the current length."""
+        filled = self.length % self.chunk_size
+        if filled:
+            self._write_chunk(filled)
+        self._write_metadata()
+
+
+def write_coordinate(store: str, name: str, values: numpy.ndarray, dimension: str):
+    """Writes a one dimensional coordinate array to a Zarr store."""
+    values = numpy.asarray(values)
+    path = os.path.join(store, name)
+    os.makedirs(path, exist_ok=True)
+    _write_json(os.path.join(path, '.zattrs'), {'_ARRAY_DIMENSIONS': [dimension]})
+    _write_json(os.path.join(path, '.zarray'), {
+        'zarr_format': 2,
+        'shape': [values.size],
+        'chunks': [max(values.size, 1)],
+        'dtype': values.dtype.str,
+        'compressor': None,
+        'fill_value': _fill_value(values.dtype),
+        'order': 'C',
+        'filters': None,
+    })
+    with open(os.path.join(path, '0'), 'wb') as f:
+        f.write(numpy.ascontiguousarray(values).tobytes())
+
+
+def read_array(store: str, name: str) -> numpy.ndarray:
+    """Reads a whole array written by :class:`OutputWriter`, without needing zarr to be installed."""
+    path = os.path.join(store, name)
+    with open(os.path.join(path, '.zarray')) as f:
+        metadata = json.load(f)
+    shape, chunks, dtype = metadata['shape'], metadata['chunks'], numpy.dtype(metadata['dtype'])
+    values = numpy.empty(shape, dtype=dtype)
+    for index in range(math.ceil(shape[0] / chunks[0])):
+        key = '.'.join([str(index)] + ['0'] * (len(shape) - 1))
+        chunk = numpy.fromfile(os.path.join(path, key), dtype=dtype).reshape(chunks)
+        start = index * chunks[0]
+        stop = min(start + chunks[0], shape[0])
+        values[start:stop] = chunk[:stop - start]
+    return values
+
+
+def _grid_layout(model, name: str) -> Tuple[Tuple[int, ...], List[str], Dict[str, numpy.ndarray]]:
+    """Shape, dimension names and coordinates of values of a variable."""
+    grid = model.get_var_grid(name)
+    size = model.get_var_nbytes(name) // model.get_var_itemsize(name)
+    grid_type = model.get_grid_type(grid)
+    if grid_type in STRUCTURED_GRIDS:
+        rank = model.get_grid_rank(grid)
+        shape = model.get_grid_shape(grid, numpy.empty(rank, dtype=numpy.int64))
+        if int(numpy.prod(shape)) == size and rank <= 3:
+            dimensions = [f'{axis}_{grid}' for axis in ['z', 'y', 'x'][3 - rank:]]
+            axes = axis_coordinates(model, grid)
+            coordinates = dict(zip(dimensions, axes)) if axes is not None else {}
+            return tuple(int(n) for n in shape), dimensions, coordinates
+    return (size,), [f'{model.get_var_location(name)}_{grid}'], {}
+
+
+class OutputWriter(object):
+    """Writes values of variables of a model to a Zarr store after each time step.
+
+    Call :func:`record` after each time step. The values are copied and written on a background thread.
+    When the writer falls behind more than ``queue_size`` time steps, :func:`record` waits.
+
+    Args:
+        model: Initialized BMI model
+        path: Directory of Zarr store to write
+        names: Names of variables to record, by default all output variables
+        interval: Record every n-th call of :func:`record`
+        chunk_size: Number of time steps in a chunk. By default chunks are about 8Mb.
+        queue_size: Maximum number of time steps waiting to be written
+    """
+
+    def __init__(self, model, path: str, names: Optional[Sequence[str]] = None, interval: int = 1,
+                 chunk_size: Optional[int] = None, queue_size: int = 4):
+        if interval < 1:
+            raise ValueError(f'Interval should be at least 1, got {interval}')
+        self.model = model
+        self.path = path
+        self.names = list(names) if names else list(model.get_output_var_names())
+        self.interval = interval
+        self.calls = 0
+        self.error: Optional[BaseException] = None
+        os.makedirs(path, exist_ok=True)
+        _write_json(os.path.join(path, '.zgroup'), {'zarr_format': 2})
+        _write_json(os.path.join(path, '.zattrs'), {'component_name': model.get_component_name()})
+        self.arrays: Dict[str, ZarrArray] = {}
+        self.dests: Dict[str, numpy.ndarray] = {}
+        for name in self.names:
+            shape, dimensions, coordinates = _grid_layout(model, name)
+            dest = reserve_values(model, name)
+            steps = chunk_size or max(1, CHUNK_BYTES // max(dest.nbytes, 1))
+            self.arrays[name] = ZarrArray(os.path.join(path, name), shape, dest.dtype, steps, ['time'] + dimensions,
+                                          {'units': model.get_var_units(name)})
+            self.dests[name] = dest
+            for dimension, values in coordinates.items():
+                write_coordinate(path, dimension, values, dimension)
+        self.time = ZarrArray(os.path.join(path, 'time'), (), numpy.dtype(numpy.float64), TIME_CHUNK_SIZE,
+                              ['time'], {'units': model.get_time_units()})
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = threading.Thread(target=self._write, name='grpc4bmi-output-writer', daemon=True)
+        self.thread.start()
+
+    def _write(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                break
+            if self.error is not None:
+                continue
+            time, values = item
+            try:
+                self.time.append(time)
+                for name, value in values.items():
+                    self.arrays[name].append(value)
+            except BaseException as e:
+                log.exception(f'Unable to write output to {self.path}')
+                self.error = e
+        try:
+            for array in [self.time] + list(self.arrays.values()):
+                array.flush()
+        except BaseException as e:
+            log.exception(f'Unable to write output to {self.path}')
+            self.error = self.error or e
+
+    def _raise_error(self):
+        if self.error is not None:
+            raise IOError(f'Writing output to {self.path} failed: {self.error!r}') from self.error
+
+    def record(self):
+        """Copies current values of variables and queues them for writing, at every ``interval`` call."""
+        self._raise_error()
+        self.calls += 1
+        if self.calls % self.interval:
+            return
+        values = {name: self.model.get_value(name, self.dests[name]).copy() for name in self.names}
+        self.queue.put((self.model.get_current_time(), values))
+
+    def close(self):
+        """Writes all queued values and waits for the writer to finish."""
+        if self.thread.is_alive():
+            self.queue.put(_STOP)
+            self.thread.join()
+        self._raise_error()
+
+
+class OutputRecorder(object):
+    """Wrapper around a BMI model which writes output variables to disk after each update.
+
+    See :class:`OutputWriter` for the arguments. The writer is created at the first update, as variables can only be
+    described after the model has been initialized. Call :func:`close` or finalize to write all recorded values.
+
+    >>> model = OutputRecorder(MyBmi(), 'output.zarr', names=['discharge'])
+    >>> model.initialize(config_file)
+    >>> while model.get_current_time() < model.get_end_time():
+    ...     model.update()
+    >>> model.finalize()
+    """
+
+    def __init__(self, origin, path: str, names: Optional[Sequence[str]] = None, interval: int = 1,
+                 chunk_size: Optional[int] = None, queue_size: int = 4):
+        self.origin = origin
+        self.path = path
+        self.options = dict(names=names, interval=interval, chunk_size=chunk_size, queue_size=queue_size)
+        self.writer: Optional[OutputWriter] = None
+
+    def _record(self):
+        if self.writer is None:
+            self.writer = OutputWriter(self.origin, self.path, **self.options)
+        self.writer.record()
+
+    def update(self):
+        self.origin.update()
+        self._record()
+
+    def update_until(self, time: float):
+        self.origin.update_until(time)
+        self._record()
+
+    def finalize(self):
+        self.close()
+        self.origin.finalize()
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def __getattr__(self, item):
+        return getattr(self.origin, item)
+
+    def __repr__(self):
+        return self.origin.__repr__()
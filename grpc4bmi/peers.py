@@ -0,0 +1,116 @@
+"""Send values of a variable from one BMI server directly to another BMI server.
+
+In a coupled run values normally travel from server A to the client and from the client to server B.
+With :func:`push_value` server A sets the values on server B itself, so they cross the network once
+and the client only coordinates the exchange.
+"""
+import threading
+from typing import Dict, Optional
+
+import grpc
+import numpy
+
+from grpc4bmi import bmi_pb2, bmi_pb2_grpc
+from grpc4bmi.bmi_grpc_client import BmiClient
+from grpc4bmi.reserve import reserve_values, reserve_values_at_indices
+
+
+def push_value(model, name: str, peer, dest_name: Optional[str] = None,
+               src_indices: Optional[numpy.ndarray] = None, dest_indices: Optional[numpy.ndarray] = None):
+    """Copies values of a variable of a model to a variable of another model.
+
+    Args:
+        model: BMI model to get values from
+        name: Name of variable to get
+        peer: BMI model to set values on
+        dest_name: Name of variable to set, defaults to name
+        src_indices: If set then only get values at these indices
+        dest_indices: If set then set values at these indices, otherwise set the whole variable
+
+    Returns: Number of values copied
+    """
+    if src_indices is not None:
+        values = reserve_values_at_indices(model, name, src_indices)
+        values = model.get_value_at_indices(name, values, src_indices)
+    else:
+        values = reserve_values(model, name)
+        values = model.get_value(name, values)
+    dest_name = dest_name or name
+    if dest_indices is not None:
+        if len(dest_indices) != values.size:
+            raise ValueError(f'Got {len(dest_indices)} destination indices for {values.size} values of {name}')
+        peer.set_value_at_indices(dest_name, dest_indices, values)
+    else:
+        peer.set_value(dest_name, values)
+    return values.size
+
+
+class Peers(object):
+    """Clients of other BMI servers, connected once per address and reused by later calls.
+
+    Connecting happens outside the lock, so a slow peer does not hold up calls to other peers.
+
+    Args:
+        timeout: Seconds to wait for a connection to a new address
+        server_id: Identifier of the server which owns the peers, see :func:`is_self`
+    """
+
+    def __init__(self, timeout: Optional[float] = 10.0, server_id: Optional[str] = None):
+        self.timeout = timeout
+        self.server_id = server_id
+        self._lock = threading.Lock()
+        self.clients: Dict[str, BmiClient] = {}
+        self.channels: Dict[str, grpc.Channel] = {}
+        # Whether address is the server itself, by address
+        self._is_self: Dict[str, bool] = {}
+
+    def client(self, address: str) -> BmiClient:
+        """Client of BMI server at address, like ``localhost:50051``."""
+        with self._lock:
+            client = self.clients.get(address)
+        if client is not None:
+            return client
+        channel = grpc.insecure_channel(address)
+        try:
+            client = BmiClient(channel, timeout=self.timeout)
+        except grpc.FutureTimeoutError:
+            channel.close()
+            raise ConnectionError(f'Unable to connect to BMI server at {address}')
+        with self._lock:
+            if address not in self.clients:
+                self.channels[address] = channel
+                self.clients[address] = client
+                return client
+            existing = self.clients[address]
+        # Another call connected to the same address in the meantime
+        channel.close()
+        return existing
+
+    def is_self(self, address: str) -> bool:
+        """Whether address is of the server which owns the peers.
+
+        Asks the server at address for its identifier with getStatus, which does not wait for the model.
+        So a server which calls its model from a single thread can recognize itself while it is calling the model.
+        """
+        if self.server_id is None:
+            return False
+        with self._lock:
+            known = self._is_self.get(address)
+        if known is not None:
+            return known
+        with grpc.insecure_channel(address) as channel:
+            try:
+                status = bmi_pb2_grpc.BmiServiceStub(channel).getStatus(bmi_pb2.Empty(), timeout=self.timeout,
+                                                                        wait_for_ready=True)
+            except grpc.RpcError as e:
+                raise ConnectionError(f'Unable to connect to BMI server at {address}') from e
+        with self._lock:
+            self._is_self[address] = status.server_id == self.server_id
+        return status.server_id == self.server_id
+
+    def close(self):
+        with self._lock:
+            for channel in self.channels.values():
+                channel.close()
+            self.channels = {}
+            self.clients = {}
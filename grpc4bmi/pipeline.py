@@ -0,0 +1,106 @@
+"""Snapshots of model output, so values can be sent while the model runs its next time step."""
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy
+
+from grpc4bmi.reserve import reserve_values
+
+log = logging.getLogger(__name__)
+
+
+class OutputSnapshots(object):
+    """Double buffered copies of all output variables of a model.
+
+    After each time step :func:`take` copies the output variables into the inactive buffer of each variable
+    and makes it the active buffer. Values are then read from the active buffer without calling the model,
+    so encoding and sending a response can happen on another thread while the model runs the next time step.
+    A buffer which is still being read when it should be overwritten is replaced by a new buffer.
+
+    Args:
+        model: BMI model to take snapshots of
+        encode: Callable which converts an array to a response message. The response of the active buffer is
+            encoded once and reused for the following reads.
+    """
+
+    def __init__(self, model, encode: Callable[[numpy.ndarray], object]):
+        self.model = model
+        self.encode = encode
+        self._lock = threading.Lock()
+        self.buffers: Dict[str, List[Optional[numpy.ndarray]]] = {}
+        #: Index of active buffer per variable, only contains variables with a valid snapshot
+        self.active: Dict[str, int] = {}
+        self.readers: Dict[tuple, int] = {}
+        self.responses: Dict[str, object] = {}
+
+    def take(self):
+        """Copies current values of all output variables into snapshots."""
+        for name in self.model.get_output_var_names():
+            index = 1 - self.active.get(name, 1)
+            with self._lock:
+                buffers = self.buffers.setdefault(name, [None, None])
+                if self.readers.get((name, index)):
+                    buffers[index] = None
+                buffer = buffers[index]
+            try:
+                if buffer is None or buffer.nbytes != self.model.get_var_nbytes(name):
+                    buffer = reserve_values(self.model, name)
+                self.model.get_value(name, buffer)
+            except Exception:
+                log.debug(f'Unable to take snapshot of {name}', exc_info=True)
+                self.invalidate(name)
+                continue
+            with self._lock:
+                buffers[index] = buffer
+                self.active[name] = index
+                self.responses.pop(name, None)
+
+    def invalidate(self, name: Optional[str] = None):
+        """Drops snapshot of a variable or of all variables, so its values are read from the model again."""
+        with self._lock:
+            if name is None:
+                self.active.clear()
+                self.responses.clear()
+            else:
+                self.active.pop(name, None)
+                self.responses.pop(name, None)
+
+    def _acquire(self, name):
+        with self._lock:
+            if name not in self.active:
+                return None, None
+            index = self.active[name]
+            self.readers[(name, index)] = self.readers.get((name, index), 0) + 1
+            return index, self.buffers[name][index]
+
+    def _release(self, name, index):
+        with self._lock:
+            self.readers[(name, index)] -= 1
+
+    def response(self, name: str):
+        """Encoded response of snapshot of variable or None when there is no snapshot."""
+        response = self.responses.get(name)
+        if response is not None:
+            return response
+        index, buffer = self._acquire(name)
+        if buffer is None:
+            return None
+        try:
+            response = self.encode(buffer)
+        finally:
+            self._release(name, index)
+        with self._lock:
+            if self.active.get(name) == index:
+                self.responses[name] = response
+        return response
+
+    def values_at_indices(self, name: str, indices: numpy.ndarray) -> Optional[numpy.ndarray]:
+        """Copy of values of snapshot at indices or None when there is no snapshot."""
+        index, buffer = self._acquire(name)
+        if buffer is None:
+            return None
+        try:
+            return buffer[indices]
+        finally:
+            self._release(name, index)
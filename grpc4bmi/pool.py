@@ -0,0 +1,104 @@
+"""Pool of pre-started BMI clients to hide model startup latency."""
+import logging
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from bmipy import Bmi
+
+log = logging.getLogger(__name__)
+
+
+class ClientPool(object):
+    """Keeps a number of started and connected BMI clients ready for use.
+
+    Starting a container takes seconds. The pool starts clients in the background, so :func:`acquire` can hand out
+    a client which is already running. Every acquired client is replaced by a newly started one in the background.
+
+    A client is handed out only once, as a used model has state. Drop the reference to an acquired client to stop
+    its container.
+
+    Example:
+
+        Pool of 4 Docker containers, each with a fresh work directory.
+
+        >>> from tempfile import mkdtemp
+        >>> from grpc4bmi.bmi_client_docker import BmiClientDocker
+        >>> from grpc4bmi.pool import ClientPool
+        >>> def start():
+        ...     return BmiClientDocker('ewatercycle/walrus-grpc4bmi:v0.3.1', work_dir=mkdtemp(), input_dirs=['/data'])
+        >>> with ClientPool(start, size=4) as pool:
+        ...     for config_file in config_files:
+        ...         model = pool.acquire()
+        ...         model.initialize(config_file)
+        ...         model.update_until(model.get_end_time())
+        ...         del model
+
+    Args:
+        factory: Callable without arguments which starts a client and returns it once it is connected.
+        size: Number of clients to keep ready.
+        max_workers: Maximum number of clients started at the same time. Defaults to size.
+    """
+
+    def __init__(self, factory: Callable[[], Bmi], size: int, max_workers: Optional[int] = None):
+        if size < 1:
+            raise ValueError(f'Pool size must be at least 1, got {size}')
+        self.factory = factory
+        self.size = size
+        self._ready = queue.Queue()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or size, thread_name_prefix='client-pool')
+        for _ in range(size):
+            self._replenish()
+
+    def _replenish(self):
+        self._executor.submit(self.factory).add_done_callback(self._on_started)
+
+    def _on_started(self, started: Future):
+        if self._closed:
+            return
+        exc = started.exception()
+        if exc is not None:
+            log.exception('Failed to start client for pool', exc_info=exc)
+            self._ready.put(exc)
+        else:
+            self._ready.put(started.result())
+
+    @property
+    def ready(self) -> int:
+        """Number of clients ready to be acquired."""
+        return self._ready.qsize()
+
+    def acquire(self, timeout: Optional[float] = None) -> Bmi:
+        """Takes a started client from the pool and starts a replacement in the background.
+
+        Args:
+            timeout: Seconds to wait for a client when none is ready. Waits forever when None.
+
+        Raises:
+            TimeoutError: When no client became ready within timeout.
+            Exception: Exception raised by factory while starting the client.
+        """
+        if self._closed:
+            raise ValueError('Unable to acquire client from closed pool')
+        try:
+            client = self._ready.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f'No client became ready within {timeout}s')
+        self._replenish()
+        if isinstance(client, Exception):
+            raise client
+        return client
+
+    def close(self):
+        """Waits for clients being started and drops all ready clients, which stops their containers."""
+        self._closed = True
+        self._executor.shutdown(wait=True)
+        while not self._ready.empty():
+            self._ready.get_nowait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
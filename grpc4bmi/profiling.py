@@ -0,0 +1,120 @@
+"""Profile the calls a BMI server makes to its model.
+
+Each BMI method of the model gets its own :mod:`cProfile` profile. A profile is written as a ``<method>.prof``
+file, which can be opened with :mod:`pstats` or `snakeviz <https://jiffyclub.github.io/snakeviz/>`_, and as a
+``<method>.collapsed`` file with collapsed stacks, which can be rendered as flamegraph by
+`flamegraph.pl <https://github.com/brendangregg/FlameGraph>`_ or `speedscope <https://www.speedscope.app/>`_.
+"""
+import cProfile
+import logging
+import os
+import pstats
+import threading
+from typing import Dict, List
+
+log = logging.getLogger(__name__)
+
+
+def _label(func) -> str:
+    filename, line, name = func
+    if filename == '~':
+        # Built-in function
+        return name.replace(';', ',')
+    return f'{name} ({os.path.basename(filename)}:{line})'.replace(';', ',')
+
+
+def collapsed_stacks(stats: pstats.Stats) -> Dict[str, int]:
+    """Converts profile statistics to collapsed stacks with microseconds of own time.
+
+    cProfile only records caller and callee pairs, so time of a function called from several places is
+    divided over its callers in proportion to the time spent in it from each caller.
+    """
+    entries = stats.stats
+    callees = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller in callers:
+            callees.setdefault(caller, []).append(func)
+    # Disabling the profiler is recorded as well, but is not part of the profiled code
+    roots = [func for func, (_, _, _, _, callers) in entries.items()
+             if not callers and '_lsprof.Profiler' not in func[2]]
+    stacks = {}
+
+    def walk(func, stack, fraction):
+        _, _, own_time, total_time, _ = entries[func]
+        stack = stack + [_label(func)]
+        microseconds = int(round(own_time * fraction * 1e6))
+        if microseconds > 0:
+            key = ';'.join(stack)
+            stacks[key] = stacks.get(key, 0) + microseconds
+        for callee in callees.get(func, []):
+            if _label(callee) in stack:
+                # Recursion is folded into first occurrence
+                continue
+            callee_total = entries[callee][3]
+            edge_total = entries[callee][4][func][3]
+            if callee_total > 0:
+                walk(callee, stack, fraction * edge_total / callee_total)
+
+    for root in roots:
+        walk(root, [], 1.0)
+    return stacks
+
+
+class ProfiledModel(object):
+    """Wrapper around a BMI model which profiles each BMI method separately.
+
+    Calls to the model are made one at a time, as a profiler can only profile a single thread.
+
+    Args:
+        origin: BMI model to wrap
+        directory: Directory to write profiles to
+    """
+
+    def __init__(self, origin, directory: str):
+        self.origin = origin
+        self.directory = directory
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self._lock = threading.RLock()
+
+    def __getattr__(self, item):
+        attr = getattr(self.origin, item)
+        if not callable(attr):
+            return attr
+
+        def profiled(*args, **kwargs):
+            with self._lock:
+                if item not in self.profiles:
+                    self.profiles[item] = cProfile.Profile()
+                profile = self.profiles[item]
+                profile.enable()
+                try:
+                    return attr(*args, **kwargs)
+                finally:
+                    profile.disable()
+
+        return profiled
+
+    def dump(self) -> List[str]:
+        """Writes profile and collapsed stacks of each called method to directory.
+
+        Profiles keep accumulating, so a later dump includes the calls of an earlier dump.
+
+        Returns: Paths of written files
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        files = []
+        with self._lock:
+            for method, profile in sorted(self.profiles.items()):
+                stats = pstats.Stats(profile)
+                prof_file = os.path.join(self.directory, f'{method}.prof')
+                stats.dump_stats(prof_file)
+                collapsed_file = os.path.join(self.directory, f'{method}.collapsed')
+                with open(collapsed_file, 'w') as f:
+                    for stack, microseconds in sorted(collapsed_stacks(stats).items()):
+                        f.write(f'{stack} {microseconds}\n')
+                files += [prof_file, collapsed_file]
+        log.info(f'Written profiles of {len(self.profiles)} methods to {self.directory}')
+        return files
+
+    def __repr__(self):
+        return self.origin.__repr__()
@@ -0,0 +1,123 @@
+"""Reductions of values of a variable to a few numbers, so a server only has to send those numbers.
+
+Supported operations are ``mean``, ``sum``, ``min``, ``max``, ``std``, ``count``, ``median`` and percentiles
+written as ``p`` followed by the percentage, like ``p90`` or ``p2.5``.
+NaN values are ignored, ``count`` is the number of values which are not NaN.
+
+Values can be reduced as a whole or per zone, see :class:`Zones`.
+"""
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy
+
+OPERATIONS = ('mean', 'sum', 'min', 'max', 'std', 'count', 'median')
+
+
+def _percentile(operation: str) -> float:
+    try:
+        q = float(operation[1:]) if operation.startswith('p') else float('nan')
+    except ValueError:
+        q = float('nan')
+    if not 0 <= q <= 100:
+        raise ValueError(f'Unknown reduction {operation}, choose from {", ".join(OPERATIONS)} or p0 to p100')
+    return q
+
+
+def check_operations(operations: Sequence[str]):
+    """Raises ValueError when an operation is not supported."""
+    if not operations:
+        raise ValueError('No reductions requested')
+    for operation in operations:
+        if operation not in OPERATIONS:
+            _percentile(operation)
+
+
+class Zones(object):
+    """Assignment of each value of a variable to a zone, like a catchment or a mask.
+
+    Values with a zone of zero or less are not part of any zone.
+    The grouping of values by zone is computed once, so reducing per zone is vectorized.
+
+    Args:
+        zones: Zone of each value, a boolean mask is a single zone
+    """
+
+    def __init__(self, zones: numpy.ndarray):
+        zones = numpy.asarray(zones).ravel().astype(numpy.int64)
+        self.size = zones.size
+        selected = numpy.flatnonzero(zones > 0)
+        #: Indices of values sorted by zone
+        self.order = selected[numpy.argsort(zones[selected], kind='stable')]
+        #: Zone numbers in ascending order
+        self.ids, self.starts = numpy.unique(zones[self.order], return_index=True)
+        self.labels = numpy.repeat(numpy.arange(self.ids.size), numpy.diff(numpy.append(self.starts, self.order.size)))
+
+
+def _reduce_segments(values: numpy.ndarray, starts: numpy.ndarray, labels: numpy.ndarray,
+                     operations: Sequence[str]) -> numpy.ndarray:
+    """Reduces consecutive segments of values, returns array with a row per segment and a column per operation."""
+    nsegments = starts.size
+    result = numpy.full((nsegments, len(operations)), numpy.nan)
+    if values.size == 0 or nsegments == 0:
+        for column, operation in enumerate(operations):
+            if operation in ('count', 'sum'):
+                result[:, column] = 0
+        return result
+    valid = ~numpy.isnan(values)
+    zeroed = numpy.where(valid, values, 0.0)
+    count = numpy.bincount(labels, weights=valid, minlength=nsegments)
+    total = numpy.bincount(labels, weights=zeroed, minlength=nsegments)
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+    computed: Dict[str, Callable[[], numpy.ndarray]] = {
+        'count': lambda: count,
+        'sum': lambda: total,
+        'mean': lambda: mean,
+        'min': lambda: numpy.fmin.reduceat(values, starts),
+        'max': lambda: numpy.fmax.reduceat(values, starts),
+        'std': lambda: numpy.sqrt(numpy.bincount(labels, weights=numpy.where(valid, values - mean[labels], 0.0) ** 2,
+                                                 minlength=nsegments) / count),
+    }
+    segments = None
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        for column, operation in enumerate(operations):
+            if operation in computed:
+                result[:, column] = computed[operation]()
+                continue
+            q = 50.0 if operation == 'median' else _percentile(operation)
+            if segments is None:
+                segments = numpy.split(values, starts[1:])
+            result[:, column] = [numpy.nanpercentile(s, q) if numpy.any(~numpy.isnan(s)) else numpy.nan
+                                 for s in segments]
+    return result
+
+
+def reduce_values(values: numpy.ndarray, operations: Sequence[str], zones: Optional[Zones] = None) -> numpy.ndarray:
+    """Reduces values as a whole or per zone.
+
+    Args:
+        values: Values to reduce
+        operations: Names of reductions
+        zones: If set then values are reduced per zone
+
+    Returns: Array with a row per zone, or a single row without zones, and a column per operation
+    """
+    check_operations(operations)
+    values = numpy.asarray(values, dtype=numpy.float64).ravel()
+    if zones is None:
+        return _reduce_segments(values, numpy.zeros(1, dtype=numpy.intp),
+                                numpy.zeros(values.size, dtype=numpy.intp), operations)
+    if values.size != zones.size:
+        raise ValueError(f'Zones are for {zones.size} values, but variable has {values.size} values')
+    return _reduce_segments(values[zones.order], zones.starts, zones.labels, operations)
+
+
+def as_dict(operations: Sequence[str], row: Sequence[float]) -> Dict[str, float]:
+    return {operation: float(value) for operation, value in zip(operations, row)}
+
+
+def zone_dicts(operations: Sequence[str], zones: Sequence[int], values: Sequence[float]) -> Dict[int, Dict[str, float]]:
+    """Reduced values per zone from the flattened rows of :func:`reduce_values`."""
+    n = len(operations)
+    return {int(zone): as_dict(operations, values[i * n:(i + 1) * n]) for i, zone in enumerate(zones)}
+
@@ -0,0 +1,283 @@
+"""Record calls to a BMI model and replay them without the model.
+
+:class:`RecordingModel` wraps a BMI model or a :class:`grpc4bmi.bmi_grpc_client.BmiClient` and writes each BMI call
+with its arguments, result, array payloads and duration to a file.
+:class:`ReplayModel` answers calls from such a file, so code using a model can be benchmarked and tested
+without starting the model itself. A replay can be served with ``run-bmi-server --replay FILE``.
+
+A recording starts with :data:`MAGIC` followed by a record per call.
+A record is two little-endian unsigned 32 bit integers with the length of the header and the length of the payload,
+a JSON header and a payload with the raw bytes of the arrays referenced in the header.
+"""
+import json
+import logging
+import struct
+import threading
+import time
+from typing import Any, BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy
+from bmipy import Bmi
+
+log = logging.getLogger(__name__)
+
+MAGIC = b'BMIREC\x00\x01'
+
+#: Methods which are recorded, other attributes of a wrapped object are passed through
+BMI_METHODS = frozenset(name for name in dir(Bmi) if not name.startswith('_'))
+
+#: Position of argument of a method which is filled by the model and returned
+DEST_ARGUMENTS = {
+    'get_value': 1,
+    'get_value_at_indices': 1,
+    'get_grid_shape': 1,
+    'get_grid_spacing': 1,
+    'get_grid_origin': 1,
+    'get_grid_x': 1,
+    'get_grid_y': 1,
+    'get_grid_z': 1,
+    'get_grid_edge_nodes': 1,
+    'get_grid_face_edges': 1,
+    'get_grid_face_nodes': 1,
+    'get_grid_nodes_per_face': 1,
+}
+
+#: Position of argument of a method with values for the model, these values do not select a recorded call
+SRC_ARGUMENTS = {
+    'set_value': 1,
+    'set_value_at_indices': 2,
+}
+
+_LENGTHS = struct.Struct('<II')
+
+
+class Record(NamedTuple):
+    method: str
+    args: List[Any]
+    result: Any
+    seconds: float
+    error: Optional[str] = None
+
+
+def _encode(value, arrays: List[numpy.ndarray]):
+    if isinstance(value, numpy.ndarray):
+        arrays.append(numpy.ascontiguousarray(value))
+        return {'array': len(arrays) - 1}
+    if isinstance(value, numpy.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [_encode(v, arrays) for v in value]
+    return value
+
+
+def _decode(value, arrays: List[numpy.ndarray]):
+    if isinstance(value, dict):
+        return arrays[value['array']]
+    if isinstance(value, list):
+        return [_decode(v, arrays) for v in value]
+    return value
+
+
+def write_record(file: BinaryIO, record: Record):
+    """Appends a record to a recording."""
+    arrays = []
+    header = {
+        'method': record.method,
+        'args': _encode(record.args, arrays),
+        'result': _encode(record.result, arrays),
+        'seconds': record.seconds,
+        'error': record.error,
+    }
+    header['arrays'] = [[a.dtype.str, a.shape] for a in arrays]
+    encoded = json.dumps(header, separators=(',', ':')).encode()
+    file.write(_LENGTHS.pack(len(encoded), sum(a.nbytes for a in arrays)))
+    file.write(encoded)
+    for array in arrays:
+        file.write(array.data)
+
+
+def read_records(path: str) -> Iterator[Record]:
+    """Reads the records of a recording in the order the calls were made."""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f'{path} is not a BMI recording')
+        while True:
+            lengths = f.read(_LENGTHS.size)
+            if len(lengths) < _LENGTHS.size:
+                return
+            header_length, payload_length = _LENGTHS.unpack(lengths)
+            header = json.loads(f.read(header_length))
+            payload = f.read(payload_length)
+            arrays = []
+            offset = 0
+            for dtype, shape in header['arrays']:
+                dtype = numpy.dtype(dtype)
+                count = int(numpy.prod(shape, dtype=numpy.int64))
+                arrays.append(numpy.frombuffer(payload, dtype, count, offset).reshape(shape))
+                offset += count * dtype.itemsize
+            yield Record(header['method'], _decode(header['args'], arrays), _decode(header['result'], arrays),
+                         header['seconds'], header['error'])
+
+
+class RecordingModel(object):
+    """Wrapper around a BMI model or client which records each BMI call to a file.
+
+    The returned value is recorded as the result of a call, also for methods which fill a dest array,
+    as a model may return a new array and leave dest unfilled.
+    Records are buffered, call :func:`close` to write them all to the file.
+
+    Args:
+        origin: BMI model or client to wrap
+        path: File to write recording to, an existing file is overwritten
+    """
+
+    def __init__(self, origin, path: str):
+        self.origin = origin
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC)
+
+    def _write(self, record: Record):
+        with self._lock:
+            if self._file.closed:
+                log.warning(f'Recording {self.path} is closed, not recording call to {record.method}')
+                return
+            write_record(self._file, record)
+
+    def __getattr__(self, item):
+        attr = getattr(self.origin, item)
+        if not callable(attr) or item not in BMI_METHODS:
+            return attr
+
+        def recorded(*args):
+            start = time.perf_counter()
+            try:
+                result = attr(*args)
+            except Exception as e:
+                self._write(Record(item, list(args), None, time.perf_counter() - start, f'{type(e).__name__}: {e}'))
+                raise
+            seconds = time.perf_counter() - start
+            self._write(Record(item, list(args), result, seconds))
+            return result
+
+        return recorded
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return self.origin.__repr__()
+
+
+def _key_part(value):
+    if isinstance(value, numpy.ndarray):
+        # Same indices should match regardless of their integer type
+        return tuple(value.ravel().tolist())
+    if isinstance(value, numpy.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return tuple(_key_part(v) for v in value)
+    return value
+
+
+def _key(method: str, args) -> Tuple:
+    skip = DEST_ARGUMENTS.get(method, SRC_ARGUMENTS.get(method))
+    return (method,) + tuple(_key_part(arg) for position, arg in enumerate(args) if position != skip)
+
+
+class ReplayModel(object):
+    """BMI model which answers calls with the results of a recording.
+
+    A call returns the result of the next recorded call of the same method with the same arguments.
+    Values passed to set_value and the contents of dest arrays are ignored when matching calls.
+    Once all matching calls have been replayed, the last one is repeated.
+    A call without a matching recorded call raises a LookupError.
+    A recorded call which failed raises a RuntimeError with the recorded error message.
+
+    The type, item size and number of bytes of a variable of which only the values have been recorded are derived
+    from the recorded values, so a server can reserve arrays for them.
+
+    Args:
+        path: Recording written by :class:`RecordingModel`
+        latency: Whether to take as long as the recorded call before returning
+    """
+
+    def __init__(self, path: str, latency: bool = False):
+        self.path = path
+        self.latency = latency
+        self._lock = threading.Lock()
+        self.records: Dict[Tuple, List[Record]] = {}
+        self.cursors: Dict[Tuple, int] = {}
+        self.values: Dict[str, numpy.ndarray] = {}
+        for record in read_records(path):
+            self.records.setdefault(_key(record.method, record.args), []).append(record)
+            if record.method in ('get_value', 'get_value_at_indices') and record.error is None:
+                name = record.args[0]
+                if record.method == 'get_value' or name not in self.values:
+                    self.values[name] = record.result
+
+    def _next(self, key) -> Optional[Record]:
+        with self._lock:
+            records = self.records.get(key)
+            if not records:
+                return None
+            cursor = self.cursors.get(key, 0)
+            self.cursors[key] = min(cursor + 1, len(records) - 1)
+            return records[cursor]
+
+    def _derived(self, method: str, args):
+        values = self.values.get(args[0]) if args else None
+        if values is None:
+            return None
+        if method == 'get_var_type':
+            return str(values.dtype)
+        if method == 'get_var_itemsize':
+            return values.dtype.itemsize
+        if method == 'get_var_nbytes':
+            return values.nbytes
+        return None
+
+    def rewind(self):
+        """Replays recording from the start."""
+        with self._lock:
+            self.cursors.clear()
+
+    def __getattr__(self, item):
+        if item not in BMI_METHODS:
+            raise AttributeError(item)
+
+        def replayed(*args):
+            record = self._next(_key(item, args))
+            if record is None:
+                derived = self._derived(item, args)
+                if derived is not None:
+                    return derived
+                raise LookupError(f'No recorded call of {item} with arguments {args!r} in {self.path}')
+            if self.latency:
+                time.sleep(record.seconds)
+            if record.error is not None:
+                raise RuntimeError(record.error)
+            dest = DEST_ARGUMENTS.get(item)
+            if dest is not None and dest < len(args):
+                numpy.copyto(src=numpy.reshape(record.result, numpy.shape(args[dest])), dst=args[dest])
+                return args[dest]
+            if isinstance(record.result, numpy.ndarray):
+                return record.result.copy()
+            return record.result
+
+        return replayed
+
+    def __repr__(self):
+        return f'ReplayModel({self.path!r})'
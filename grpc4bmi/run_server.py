@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
 import argparse
+import asyncio
 import os
 import logging
 import sys
@@ -12,12 +13,18 @@ import importlib
 from concurrent import futures
 
 import grpc
+from grpc_health.v1 import health, health_pb2, health_pb2_grpc
 from grpc_reflection.v1alpha import reflection
 
 from grpc4bmi.bmi_grpc_legacy_server import BmiLegacyServer02
 from . import bmi_pb2
 from . import bmi_pb2_grpc
 from .bmi_grpc_server import BmiServer
+from .bmi_grpc_aio_server import BmiAioServer
+from .clone import Cloner
+from .metrics import AioMetricsInterceptor, MetricsInterceptor, ServerMetrics, start_http_server
+from .replay import RecordingModel, ReplayModel
+from .tracing import AioTracingInterceptor, ChromeTraceExporter, Tracer, TracingInterceptor
 
 try:
     from .bmi_r_model import BmiR
@@ -36,6 +43,8 @@ ENV_BMI_PACKAGE = "BMI_PACKAGE"
 ENV_BMI_MODULE = "BMI_MODULE"
 ENV_BMI_CLASS = "BMI_CLASS"
 
+BMI_SERVICE_NAME = bmi_pb2.DESCRIPTOR.services_by_name['BmiService'].full_name
+
 kill_server = False
 
 
@@ -74,26 +83,130 @@ def build_r(class_name, source_fn):
     return BmiR(class_name, source_fn)
 
 
-def serve(model, port):
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    bmi_pb2_grpc.add_BmiServiceServicer_to_server(model, server)
-    server.add_insecure_port("[::]:" + str(port))
+def enable_reflection(server):
     service_names = [service.full_name for service in bmi_pb2.DESCRIPTOR.services_by_name.values()]
+    service_names.append(health.SERVICE_NAME)
     service_names.append(reflection.SERVICE_NAME)
     reflection.enable_server_reflection(service_names, server)
+
+
+def bmi_health_status(state):
+    """Health of the BMI service for a model state, only an initialized model is serving."""
+    if state == bmi_pb2.GetStatusResponse.INITIALIZED:
+        return health_pb2.HealthCheckResponse.SERVING
+    return health_pb2.HealthCheckResponse.NOT_SERVING
+
+
+def track_health(model, set_status):
+    """Reports the server as serving and the state of the model as health of the BMI service.
+
+    Args:
+        model: Servicer of BMI service
+        set_status: Callable which sets the health status of a service, like :func:`grpc_health.v1.health.HealthServicer.set`
+    """
+    set_status(health.OVERALL_HEALTH, health_pb2.HealthCheckResponse.SERVING)
+    if hasattr(model, 'add_state_listener'):
+        set_status(BMI_SERVICE_NAME, bmi_health_status(model.state))
+        model.add_state_listener(lambda state: set_status(BMI_SERVICE_NAME, bmi_health_status(state)))
+    else:
+        # Legacy server does not track state of model
+        set_status(BMI_SERVICE_NAME, health_pb2.HealthCheckResponse.SERVING)
+
+
+def serve(model, port, metrics=None, metrics_port=0, tracer=None, workers=10):
+    interceptors = [] if metrics is None else [MetricsInterceptor(metrics)]
+    if tracer is not None:
+        interceptors.append(TracingInterceptor(tracer))
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=workers), interceptors=interceptors)
+    bmi_pb2_grpc.add_BmiServiceServicer_to_server(model, server)
+    health_servicer = health.HealthServicer()
+    health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
+    track_health(model, health_servicer.set)
+    server.add_insecure_port("[::]:" + str(port))
+    enable_reflection(server)
     signal.signal(signal.SIGINT, interrupt)
     signal.signal(signal.SIGABRT, interrupt)
     signal.signal(signal.SIGTERM, interrupt)
+    metrics_server = start_http_server(metrics, metrics_port) if metrics is not None and metrics_port else None
     log.info("Starting GRPC server for %s at port %d" % (model, port))
     server.start()
     try:
         while not kill_server:
             time.sleep(0.1)
-        log.info("Stopping GRPC server for %s at port %d" % (model, port))
-        server.stop(0)
     except KeyboardInterrupt:
-        log.info("Stopping GRPC server for %s at port %d" % (model, port))
-        server.stop(0)
+        pass
+    log.info("Stopping GRPC server for %s at port %d" % (model, port))
+    health_servicer.enter_graceful_shutdown()
+    server.stop(0)
+    if metrics_server is not None:
+        metrics_server.shutdown()
+
+
+def serve_async(model, port, metrics=None, metrics_port=0, tracer=None):
+    """Serve model with an asyncio gRPC server until an interrupt signal is received.
+
+    All model calls are run on a single dedicated thread, see :class:`grpc4bmi.bmi_grpc_aio_server.BmiAioServer`.
+    """
+    asyncio.run(_serve_async(model, port, metrics, metrics_port, tracer))
+
+
+async def _serve_async(model, port, metrics, metrics_port, tracer):
+    interceptors = [] if metrics is None else [AioMetricsInterceptor(metrics)]
+    if tracer is not None:
+        interceptors.append(AioTracingInterceptor(tracer))
+    server = grpc.aio.server(interceptors=interceptors)
+    aio_model = BmiAioServer(model)
+    bmi_pb2_grpc.add_BmiServiceServicer_to_server(aio_model, server)
+    health_servicer = health.aio.HealthServicer()
+    health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
+    loop = asyncio.get_running_loop()
+
+    def set_status(service, status):
+        # State of model changes on model thread, while health servicer must be called from event loop
+        asyncio.run_coroutine_threadsafe(health_servicer.set(service, status), loop)
+
+    track_health(model, set_status)
+    server.add_insecure_port("[::]:" + str(port))
+    enable_reflection(server)
+    stop = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGABRT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    metrics_server = start_http_server(metrics, metrics_port) if metrics is not None and metrics_port else None
+    log.info("Starting asyncio GRPC server for %s at port %d" % (model, port))
+    await server.start()
+    await stop.wait()
+    log.info("Stopping asyncio GRPC server for %s at port %d" % (model, port))
+    await health_servicer.enter_graceful_shutdown()
+    await server.stop(0)
+    aio_model.shutdown()
+    if metrics_server is not None:
+        metrics_server.shutdown()
+
+
+def clone_command(args):
+    """Command which runs a server like the one started with the parsed arguments, for :class:`grpc4bmi.clone.Cloner`.
+
+    Metrics port, trace, profile and record options are left out, as a clone would write to the same port or files.
+    """
+    command = [sys.executable, '-m', 'grpc4bmi.run_server', '--language', args.language, '--workers', str(args.workers)]
+    for option, value in (('--name', args.name), ('--path', args.path), ('--replay', args.replay)):
+        if value is not None:
+            command += [option, value]
+    for option, enabled in (('--debug', args.debug), ('--pipeline', args.pipeline),
+                            ('--replay-latency', args.replay_latency), ('--async', args.use_async)):
+        if enabled:
+            command.append(option)
+    return command
+
+
+def server_metrics(args):
+    """Metrics to record for the parsed arguments.
+
+    Recording adds a little work to every call, so metrics are only recorded when asked for.
+    """
+    if args.metrics or args.metrics_port:
+        return ServerMetrics()
+    return None
 
 
 def main(argv=sys.argv[1:]):
@@ -108,10 +221,14 @@ def main(argv=sys.argv[1:]):
     if path is None:
         path = os.environ.get("BMI_PATH", None)
 
-    if args.language == "R":
+    if args.replay is not None:
+        model = ReplayModel(args.replay, latency=args.replay_latency)
+    elif args.language == "R":
         model = build_r(args.name, path)
     else:
         model = build(args.name, path)
+    if args.record is not None:
+        model = RecordingModel(model, args.record)
 
     port = int(os.environ.get("BMI_PORT", 0))
     if port == 0:
@@ -121,10 +238,35 @@ def main(argv=sys.argv[1:]):
             s.bind(("", 0))
             port = int(s.getsockname()[1])
 
+    metrics = server_metrics(args)
+    tracer = None
+    if args.trace:
+        tracer = Tracer(ChromeTraceExporter(args.trace, f'{args.name or args.replay} at port {port}'))
     if args.bmi_version == '0.2':
-        serve(BmiLegacyServer02(model, args.debug), port)
+        server = BmiLegacyServer02(model, args.debug)
+    else:
+        server = BmiServer(model, args.debug, metrics=metrics, tracer=tracer, profile_dir=args.profile,
+                           pipeline=args.pipeline, cloner=Cloner(clone_command(args)))
+        if args.load_state is not None:
+            server.load_state(args.load_state)
+
+    if args.use_async:
+        serve_async(server, port, metrics, args.metrics_port, tracer)
     else:
-        serve(BmiServer(model, args.debug), port)
+        serve(server, port, metrics, args.metrics_port, tracer, args.workers)
+    if tracer is not None:
+        tracer.exporter.flush()
+        tracer.exporter.close()
+    if getattr(server, 'profiler', None) is not None:
+        server.profiler.dump()
+    if args.record is not None:
+        model.close()
+    if getattr(server, 'cloner', None) is not None:
+        server.cloner.stop()
+    if getattr(server, 'peers', None) is not None:
+        server.peers.close()
+    if getattr(server, 'recording', None) is not None:
+        server.stop_recording()
 
 
 def build_parser():
@@ -149,6 +291,40 @@ def build_parser():
     parser.add_argument("--debug", action="store_true",
                         help="Run server in debug mode. "
                              "Logs running port and errors with stacktraces and returns stacktrace in error response")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Record per-method latency and throughput metrics, which are available with the "
+                             "getMetrics call")
+    parser.add_argument("--metrics-port", metavar="N", default=0, type=int,
+                        help="Record metrics like --metrics and serve them over HTTP in Prometheus text format "
+                             "on network port N")
+    parser.add_argument("--trace", metavar="FILE", default=None, type=str,
+                        help="Record a span for each call and each model method and "
+                             "write them to FILE in Chrome trace format on shutdown")
+    parser.add_argument("--profile", metavar="DIR", default=None, type=str,
+                        help="Profile each model method with cProfile and write a profile and collapsed stacks "
+                             "per method to DIR on shutdown or when requested with the dumpProfile call")
+    parser.add_argument("--workers", metavar="N", default=10, type=int,
+                        help="Number of threads handling calls, not used with --async. "
+                             "Calls to the model are made one at a time, "
+                             "but metadata which does not change after initialization is answered concurrently")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Copy output variables after each time step and return values from these copies, "
+                             "so values of a time step can be sent while the model runs the next time step")
+    parser.add_argument("--record", metavar="FILE", default=None, type=str,
+                        help="Record each call to the model with its arguments, result and duration to FILE")
+    parser.add_argument("--replay", metavar="FILE", default=None, type=str,
+                        help="Instead of running a model, answer calls with the results recorded in FILE "
+                             "by --record or grpc4bmi.replay.RecordingModel")
+    parser.add_argument("--replay-latency", action="store_true",
+                        help="Take as long as the recorded call to answer a replayed call")
+    parser.add_argument("--load-state", metavar="FILE", default=None, type=str,
+                        help="Restore state of model from FILE, written by the saveState call, before serving. "
+                             "Only a state saved by the model itself or pickled can be restored, "
+                             "as the model is not initialized")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Run an asyncio GRPC server. "
+                             "Model calls are run one at a time on a dedicated thread and "
+                             "shutdown does not poll for interrupt signals")
     return parser
 
 
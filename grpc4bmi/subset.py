@@ -0,0 +1,177 @@
+"""Subsets of values of a variable, so a server only has to send the part of a grid a client needs."""
+import threading
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy
+
+#: Grid types with a coordinate vector per axis
+RECTILINEAR_GRIDS = frozenset({'uniform_rectilinear', 'rectilinear'})
+
+
+def axis_coordinates(model, grid: int) -> Optional[List[numpy.ndarray]]:
+    """Coordinates along each axis of a rectilinear grid, in the order of the grid shape (z, y, x).
+
+    Returns: None when grid is not rectilinear
+    """
+    grid_type = model.get_grid_type(grid)
+    if grid_type not in RECTILINEAR_GRIDS:
+        return None
+    rank = model.get_grid_rank(grid)
+    shape = model.get_grid_shape(grid, numpy.empty(rank, dtype=numpy.int64))
+    if grid_type == 'uniform_rectilinear':
+        spacing = model.get_grid_spacing(grid, numpy.empty(rank, dtype=numpy.float64))
+        origin = model.get_grid_origin(grid, numpy.empty(rank, dtype=numpy.float64))
+        return [start + step * numpy.arange(n) for n, start, step in zip(shape, origin, spacing)]
+    getters = [model.get_grid_z, model.get_grid_y, model.get_grid_x][3 - rank:]
+    return [getter(grid, numpy.empty(n, dtype=numpy.float64)) for getter, n in zip(getters, shape)]
+
+
+def _inside(values: numpy.ndarray, low: float, high: float) -> numpy.ndarray:
+    if low > high:
+        # Box crosses the antimeridian, like from 170 to -170 degrees longitude
+        return (values >= low) | (values <= high)
+    return (values >= low) & (values <= high)
+
+
+def region_indices(model, grid: int, bbox: Sequence[float]) -> Tuple[numpy.ndarray, Tuple[int, ...]]:
+    """Indices of the nodes of a grid which are inside a bounding box.
+
+    On a rectilinear grid the nodes inside the box form a sub-grid, its indices are in row-major order of the
+    sub-grid. On other grids the nodes inside the box are a list.
+
+    Args:
+        model: BMI model
+        grid: Grid identifier
+        bbox: Bounding box as (x min, y min, x max, y max), like (lon min, lat min, lon max, lat max).
+            When x min is larger than x max the box crosses the antimeridian.
+
+    Returns: Indices and shape of sub-grid
+    """
+    if len(bbox) != 4:
+        raise ValueError(f'Bounding box should be x min, y min, x max and y max, got {list(bbox)}')
+    xmin, ymin, xmax, ymax = bbox
+    if ymin > ymax:
+        raise ValueError(f'Bounding box has y min {ymin} larger than y max {ymax}')
+    axes = axis_coordinates(model, grid)
+    if axes is not None:
+        if len(axes) < 2:
+            raise ValueError(f'Grid {grid} has rank {len(axes)}, a region needs at least x and y')
+        shape = [axis.size for axis in axes]
+        selected = [numpy.arange(axis.size) for axis in axes]
+        selected[-1] = numpy.flatnonzero(_inside(axes[-1], xmin, xmax))
+        selected[-2] = numpy.flatnonzero(_inside(axes[-2], ymin, ymax))
+        indices = numpy.ravel_multi_index(numpy.ix_(*selected), shape).ravel()
+        return indices, tuple(s.size for s in selected)
+    size = model.get_grid_size(grid)
+    x = model.get_grid_x(grid, numpy.empty(size, dtype=numpy.float64))
+    y = model.get_grid_y(grid, numpy.empty(size, dtype=numpy.float64))
+    indices = numpy.flatnonzero(_inside(x, xmin, xmax) & _inside(y, ymin, ymax))
+    return indices, (indices.size,)
+
+
+class RegionCache(object):
+    """Indices of regions of grids, computed once per grid and bounding box.
+
+    Only the most recently used regions are kept, so a client which moves its box around does not fill the memory.
+    Call :func:`clear` when the grids of the model might have changed, like after initialize.
+
+    Args:
+        model: BMI model
+        max_size: Maximum number of regions to keep
+    """
+
+    def __init__(self, model, max_size: int = 64):
+        self.model = model
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self.regions: 'OrderedDict[Tuple, Tuple[numpy.ndarray, Tuple[int, ...]]]' = OrderedDict()
+
+    def indices(self, grid: int, bbox: Sequence[float]) -> Tuple[numpy.ndarray, Tuple[int, ...]]:
+        key = (grid,) + tuple(float(b) for b in bbox)
+        with self._lock:
+            region = self.regions.get(key)
+            if region is not None:
+                self.regions.move_to_end(key)
+                return region
+        region = region_indices(self.model, grid, bbox)
+        with self._lock:
+            self.regions[key] = region
+            self.regions.move_to_end(key)
+            while len(self.regions) > self.max_size:
+                self.regions.popitem(last=False)
+        return region
+
+    def clear(self):
+        with self._lock:
+            self.regions = OrderedDict()
+
+
+#: Methods of :func:`coarsen`
+COARSEN_METHODS = ('mean', 'stride')
+
+#: Grid types of which values can be coarsened
+STRUCTURED_GRIDS = frozenset({'uniform_rectilinear', 'rectilinear', 'structured_quadrilateral'})
+
+
+class CoarsenedValues(NamedTuple):
+    values: numpy.ndarray
+    #: Spacing of coarse grid, only for uniform rectilinear grids
+    spacing: numpy.ndarray
+    #: Origin of coarse grid, only for uniform rectilinear grids
+    origin: numpy.ndarray
+
+
+def coarsen(values: numpy.ndarray, shape: Sequence[int], factors: Sequence[int], method: str = 'mean') -> numpy.ndarray:
+    """Reduces resolution of values on a structured grid.
+
+    Args:
+        values: Values of each node of grid
+        shape: Shape of grid
+        factors: Factor to reduce each axis with, or a single factor for all axes
+        method: ``mean`` to average blocks of nodes, ignoring NaN, or ``stride`` to take every n-th node
+
+    Returns: Values on coarse grid, averages are returned as float64
+    """
+    if method not in COARSEN_METHODS:
+        raise ValueError(f'Unknown method {method}, choose from {", ".join(COARSEN_METHODS)}')
+    factors = list(factors)
+    if len(factors) == 1:
+        factors = factors * len(shape)
+    if len(factors) != len(shape) or any(f < 1 for f in factors):
+        raise ValueError(f'Expected a factor of at least 1 for each of the {len(shape)} axes, got {factors}')
+    values = numpy.reshape(values, shape)
+    if method == 'stride':
+        return values[tuple(slice(None, None, f) for f in factors)].copy()
+    coarse_shape = [-(-n // f) for n, f in zip(shape, factors)]
+    padded = numpy.full([n * f for n, f in zip(coarse_shape, factors)], numpy.nan)
+    padded[tuple(slice(0, n) for n in shape)] = values
+    blocks = padded.reshape([d for n, f in zip(coarse_shape, factors) for d in (n, f)])
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        valid = ~numpy.isnan(blocks)
+        axes = tuple(range(1, 2 * len(shape), 2))
+        return numpy.where(valid, blocks, 0.0).sum(axis=axes) / valid.sum(axis=axes)
+
+
+def coarsen_grid(model, grid: int, values: numpy.ndarray, factors: Sequence[int], method: str = 'mean') \
+        -> CoarsenedValues:
+    """Reduces resolution of values of each node of a structured grid, see :func:`coarsen`."""
+    grid_type = model.get_grid_type(grid)
+    if grid_type not in STRUCTURED_GRIDS:
+        raise ValueError(f'Grid {grid} is {grid_type}, only structured grids can be coarsened')
+    rank = model.get_grid_rank(grid)
+    shape = model.get_grid_shape(grid, numpy.empty(rank, dtype=numpy.int64))
+    if values.size != numpy.prod(shape):
+        raise ValueError(f'Variable has {values.size} values, but only a value per node of its grid with shape '
+                         f'{tuple(shape)} can be coarsened')
+    coarse = coarsen(values, shape, factors, method)
+    spacing = origin = numpy.empty(0)
+    if grid_type == 'uniform_rectilinear':
+        factors = numpy.broadcast_to(numpy.asarray(factors, dtype=numpy.float64), (rank,))
+        spacing = model.get_grid_spacing(grid, numpy.empty(rank, dtype=numpy.float64))
+        origin = model.get_grid_origin(grid, numpy.empty(rank, dtype=numpy.float64))
+        if method == 'mean':
+            # Node of coarse grid is at center of its block
+            origin = origin + spacing * (factors - 1) / 2
+        spacing = spacing * factors
+    return CoarsenedValues(coarse, spacing, origin)
@@ -0,0 +1,329 @@
+"""Trace BMI calls across clients, servers and models.
+
+The trace context is propagated from client to server in the gRPC metadata with a
+`W3C traceparent <https://www.w3.org/TR/trace-context/#traceparent-header>`_ header.
+Spans are written as `Chrome trace events <https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU>`_,
+which can be opened in https://ui.perfetto.dev or chrome://tracing.
+
+Each process writes its own trace file, use :func:`merge_traces` to combine them into a single timeline.
+"""
+import contextvars
+import json
+import logging
+import os
+import re
+import secrets
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+import grpc
+
+log = logging.getLogger(__name__)
+
+#: Key of trace context in gRPC metadata
+TRACEPARENT = 'traceparent'
+
+_TRACEPARENT_PATTERN = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$')
+
+
+class SpanContext(NamedTuple):
+    """Identifies a span and the trace it belongs to."""
+    trace_id: str
+    span_id: str
+
+    def to_traceparent(self) -> str:
+        return f'00-{self.trace_id}-{self.span_id}-01'
+
+    @staticmethod
+    def from_traceparent(value: str) -> Optional['SpanContext']:
+        """Parses a traceparent header, returns None when it is malformed."""
+        match = _TRACEPARENT_PATTERN.match(value.strip().lower())
+        if match is None:
+            return None
+        return SpanContext(match.group(1), match.group(2))
+
+
+# Native thread ids match the ids shown by profilers, they are only available on Python 3.8 and later
+_thread_id = getattr(threading, 'get_native_id', threading.get_ident)
+
+_current_span = contextvars.ContextVar('grpc4bmi_span', default=None)
+
+
+def current_span() -> Optional[SpanContext]:
+    """Span which is active in the current thread or task."""
+    return _current_span.get()
+
+
+class ChromeTraceExporter(object):
+    """Collects spans and writes them as Chrome trace JSON file.
+
+    Spans are kept in memory until ``buffer_size`` of them have been collected, they are then moved to a
+    temporary file next to the trace file. So a long running process does not keep all its spans in memory.
+
+    Args:
+        path: Path of file to write trace to
+        process_name: Name of process shown in the timeline. Defaults to name of program and process id.
+        buffer_size: Number of spans kept in memory before they are moved to disk
+    """
+
+    def __init__(self, path: str, process_name: Optional[str] = None, buffer_size: int = 10000):
+        self.path = path
+        self.pid = os.getpid()
+        self.buffer_size = buffer_size
+        self._lock = threading.Lock()
+        #: Spans which have not been moved to disk yet
+        self.events: List[Dict[str, Any]] = [{
+            'name': 'process_name',
+            'ph': 'M',
+            'pid': self.pid,
+            'args': {'name': process_name or f'pid {self.pid}'},
+        }]
+        # Spans moved to disk, one JSON document per line
+        self._spool = tempfile.TemporaryFile('w+', dir=os.path.dirname(os.path.abspath(path)))
+
+    def export(self, event: Dict[str, Any]):
+        event['pid'] = self.pid
+        with self._lock:
+            self.events.append(event)
+            if len(self.events) >= self.buffer_size:
+                self._spool_events()
+
+    def _spool_events(self):
+        for event in self.events:
+            self._spool.write(json.dumps(event))
+            self._spool.write('\n')
+        self.events = []
+
+    def flush(self):
+        """Writes all collected spans to file."""
+        tmp_path = f'{self.path}.tmp'
+        with self._lock, open(tmp_path, 'w') as f:
+            self._spool_events()
+            self._spool.seek(0)
+            f.write('{"displayTimeUnit": "ms", "traceEvents": [')
+            for index, line in enumerate(self._spool):
+                if index:
+                    f.write(',\n')
+                f.write(line.rstrip('\n'))
+            f.write(']}')
+            self._spool.seek(0, os.SEEK_END)
+        os.replace(tmp_path, self.path)
+        log.info(f'Written trace to {self.path}')
+
+    def close(self):
+        """Removes the spans moved to disk, call :func:`flush` first to keep them."""
+        with self._lock:
+            self._spool.close()
+
+
+class Tracer(object):
+    """Creates spans and passes them to an exporter.
+
+    Timestamps are taken from the wall clock, so spans of processes on the same machine line up.
+
+    Example:
+
+        >>> from grpc4bmi.tracing import ChromeTraceExporter, Tracer
+        >>> tracer = Tracer(ChromeTraceExporter('client.json', 'coupler'))
+        >>> model.trace(tracer)
+        >>> with tracer.span('timestep'):
+        ...     model.update()
+        >>> tracer.exporter.flush()
+
+    Args:
+        exporter: Receiver of finished spans
+    """
+
+    def __init__(self, exporter: ChromeTraceExporter):
+        self.exporter = exporter
+
+    @contextmanager
+    def span(self, name: str, category: str = 'user', parent: Optional[SpanContext] = None,
+             **attributes) -> Iterator[SpanContext]:
+        """Records the with block as a span.
+
+        Args:
+            name: Name of span
+            category: Category of span, like ``rpc.client``, ``rpc.server`` or ``model``
+            parent: Parent span. Defaults to the span active in the current thread or task.
+                Without a parent a new trace is started.
+            attributes: Extra information stored with the span
+        """
+        parent = parent or _current_span.get()
+        context = SpanContext(parent.trace_id if parent else secrets.token_hex(16), secrets.token_hex(8))
+        token = _current_span.set(context)
+        start = time.time_ns()
+        error = None
+        try:
+            yield context
+        except BaseException as e:
+            error = repr(e)
+            raise
+        finally:
+            end = time.time_ns()
+            _current_span.reset(token)
+            args = dict(attributes, trace_id=context.trace_id, span_id=context.span_id)
+            if parent:
+                args['parent_id'] = parent.span_id
+            if error is not None:
+                args['error'] = error
+            self.exporter.export({
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': start / 1000,
+                'dur': (end - start) / 1000,
+                'tid': _thread_id(),
+                'args': args,
+            })
+
+
+def merge_traces(paths: Iterable[str], output: str):
+    """Combines trace files of several processes into a single timeline.
+
+    Processes are renumbered, as processes in different containers can have the same process id.
+    """
+    events = []
+    for number, path in enumerate(paths, start=1):
+        with open(path) as f:
+            for event in json.load(f)['traceEvents']:
+                event['pid'] = number
+                events.append(event)
+    with open(output, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+class TracedModel(object):
+    """Wrapper around a BMI model which records a span for each call to the model.
+
+    Args:
+        origin: BMI model to wrap
+        tracer: Tracer to record spans with
+    """
+
+    def __init__(self, origin, tracer: Tracer):
+        self.origin = origin
+        self.tracer = tracer
+
+    def __getattr__(self, item):
+        attr = getattr(self.origin, item)
+        if not callable(attr):
+            return attr
+        name = f'{type(self.origin).__name__}.{item}'
+
+        def traced(*args, **kwargs):
+            with self.tracer.span(name, 'model'):
+                return attr(*args, **kwargs)
+
+        return traced
+
+    def __repr__(self):
+        return self.origin.__repr__()
+
+
+class _TracedMethod(object):
+    def __init__(self, name, method, tracer):
+        self.name = name
+        self.method = method
+        self.tracer = tracer
+
+    @staticmethod
+    def _with_traceparent(context, kwargs):
+        metadata = list(kwargs.pop('metadata', None) or [])
+        metadata.append((TRACEPARENT, context.to_traceparent()))
+        return dict(kwargs, metadata=metadata)
+
+    def __call__(self, request, *args, **kwargs):
+        with self.tracer.span(self.name, 'rpc.client') as context:
+            return self.method(request, *args, **self._with_traceparent(context, kwargs))
+
+    def future(self, request, *args, **kwargs):
+        # Span covers sending the request, the server span shows how long the call ran
+        with self.tracer.span(self.name, 'rpc.client', future=True) as context:
+            return self.method.future(request, *args, **self._with_traceparent(context, kwargs))
+
+
+class TracedStub(object):
+    """Wrapper around a BMI gRPC stub which records a span for each call and passes the trace context to the server.
+
+    Args:
+        stub: Stub to wrap
+        tracer: Tracer to record spans with
+    """
+
+    def __init__(self, stub, tracer: Tracer):
+        self.stub = stub
+        self.tracer = tracer
+
+    def __getattr__(self, item):
+        attr = getattr(self.stub, item)
+        if not callable(attr) or item.startswith('_'):
+            return attr
+        return _TracedMethod(item, attr, self.tracer)
+
+
+def _parent_of(handler_call_details) -> Optional[SpanContext]:
+    for key, value in handler_call_details.invocation_metadata or ():
+        if key == TRACEPARENT:
+            return SpanContext.from_traceparent(value)
+    return None
+
+
+def _replace_behavior(handler, behavior):
+    return grpc.unary_unary_rpc_method_handler(
+        behavior,
+        request_deserializer=handler.request_deserializer,
+        response_serializer=handler.response_serializer,
+    )
+
+
+class TracingInterceptor(grpc.ServerInterceptor):
+    """Server interceptor which records a span for each unary call.
+
+    The span is a child of the client span passed in the gRPC metadata.
+    Model calls made while handling the call are recorded as its children by :class:`TracedModel`.
+
+    Args:
+        tracer: Tracer to record spans with
+    """
+
+    def __init__(self, tracer: Tracer):
+        self.tracer = tracer
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+        name = handler_call_details.method.rsplit('/', 1)[-1]
+        parent = _parent_of(handler_call_details)
+        behavior = handler.unary_unary
+
+        def traced_behavior(request, context):
+            with self.tracer.span(name, 'rpc.server', parent):
+                return behavior(request, context)
+
+        return _replace_behavior(handler, traced_behavior)
+
+
+class AioTracingInterceptor(grpc.aio.ServerInterceptor):
+    """Same as :class:`TracingInterceptor`, but for a :func:`grpc.aio.server`."""
+
+    def __init__(self, tracer: Tracer):
+        self.tracer = tracer
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+        name = handler_call_details.method.rsplit('/', 1)[-1]
+        parent = _parent_of(handler_call_details)
+        behavior = handler.unary_unary
+
+        async def traced_behavior(request, context):
+            with self.tracer.span(name, 'rpc.server', parent):
+                return await behavior(request, context)
+
+        return _replace_behavior(handler, traced_behavior)
@@ -1,5 +1,15 @@
+import asyncio
+import threading
+from concurrent import futures
+
+import grpc
 import pytest
 
+from grpc4bmi import bmi_pb2_grpc
+from grpc4bmi.bmi_grpc_aio_server import BmiAioServer
+from grpc4bmi.bmi_grpc_client import BmiClient
+from grpc4bmi.bmi_grpc_server import BmiServer
+
 
 def write_config(p, data_fn):
     p.write_text(f"""data: {data_fn}
@@ -78,3 +88,72 @@ def walrus_2input_dirs(tmp_path):
         'input_dirs': (input_dir, forcings_dir),
         'cfg': str(cfg)
     }
+
+
+@pytest.fixture
+def serve_port():
+    """Factory which serves a BMI model with a gRPC server in this process on localhost and returns its port"""
+    servers = []
+
+    def serve(model, debug=False, **kwargs):
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+        bmi_pb2_grpc.add_BmiServiceServicer_to_server(BmiServer(model, debug, **kwargs), server)
+        port = server.add_insecure_port('localhost:0')
+        server.start()
+        servers.append(server)
+        return port
+
+    yield serve
+    for server in servers:
+        server.stop(0)
+
+
+@pytest.fixture
+def serve_model(serve_port):
+    """Factory which serves a BMI model with a gRPC server in this process and returns a client connected to it"""
+    def serve(model, debug=False, **kwargs):
+        return BmiClient(BmiClient.create_grpc_channel(serve_port(model, debug, **kwargs)), timeout=5)
+
+    return serve
+
+
+@pytest.fixture
+def serve_aio_port():
+    """Factory which serves a BMI model with an asyncio gRPC server in this process on localhost and returns its port
+
+    The server runs on an event loop in a background thread, so the test can call it with a synchronous client.
+    """
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    servers = []
+
+    def serve(model, debug=False, interceptors=(), **kwargs):
+        async def start():
+            server = grpc.aio.server(interceptors=interceptors)
+            servicer = BmiAioServer(BmiServer(model, debug, **kwargs))
+            bmi_pb2_grpc.add_BmiServiceServicer_to_server(servicer, server)
+            port = server.add_insecure_port('localhost:0')
+            await server.start()
+            servers.append((server, servicer))
+            return port
+
+        return asyncio.run_coroutine_threadsafe(start(), loop).result(5)
+
+    yield serve
+    for server, servicer in servers:
+        asyncio.run_coroutine_threadsafe(server.stop(0), loop).result(5)
+        servicer.shutdown()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+@pytest.fixture
+def serve_aio_model(serve_aio_port):
+    """Factory which serves a BMI model with an asyncio gRPC server and returns a client connected to it"""
+    def serve(model, debug=False, interceptors=(), **kwargs):
+        port = serve_aio_port(model, debug, interceptors, **kwargs)
+        return BmiClient(BmiClient.create_grpc_channel(port), timeout=5)
+
+    return serve
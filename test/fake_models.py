@@ -1,3 +1,5 @@
+import json
+import threading
 from typing import Tuple
 
 import numpy
@@ -419,4 +421,189 @@ class WithItemSizeZeroAndVarTypeFloat32Model(Float32Model):
 
 class WithItemSizeZeroAndUnknownVarType(WithItemSizeZeroAndVarTypeFloat32Model):
     def get_var_type(self, name):
-        return 'real'
\ No newline at end of file
+        return 'real'
+
+
+class StepModel(GridModel):
+    """Model with a 3x4 uniform rectilinear grid of which every value increases by one each time step"""
+    def __init__(self):
+        super().__init__()
+        self.time = 0.0
+        self.value = numpy.arange(12, dtype=numpy.float64)
+
+    def update(self):
+        self.time += 1.0
+        self.value += 1.0
+
+    def update_until(self, time: float) -> None:
+        while self.time < time:
+            self.update()
+
+    def finalize(self):
+        pass
+
+    def get_component_name(self):
+        return 'step'
+
+    def get_input_var_names(self):
+        return 'plate_surface__temperature',
+
+    def get_start_time(self):
+        return 0.0
+
+    def get_current_time(self):
+        return self.time
+
+    def get_end_time(self):
+        return 10.0
+
+    def get_time_step(self):
+        return 1.0
+
+    def get_time_units(self):
+        return 's'
+
+    def get_var_type(self, name):
+        return 'float64'
+
+    def get_var_units(self, name):
+        return 'K'
+
+    def get_var_itemsize(self, name):
+        return self.value.itemsize
+
+    def get_var_nbytes(self, name):
+        return self.value.nbytes
+
+    def get_var_location(self, name: str) -> str:
+        return 'node'
+
+    def get_value(self, name, dest):
+        numpy.copyto(src=self.value, dst=dest)
+        return dest
+
+    def get_value_at_indices(self, name, dest, inds):
+        numpy.copyto(src=self.value[inds], dst=dest)
+        return dest
+
+    def set_value(self, name, src):
+        self.value[:] = src
+
+    def set_value_at_indices(self, name, inds, src):
+        self.value[inds] = src
+
+    def get_grid_type(self, grid):
+        return 'uniform_rectilinear'
+
+    def get_grid_rank(self, grid):
+        return 2
+
+    def get_grid_size(self, grid):
+        return 12
+
+    def get_grid_shape(self, grid, shape):
+        numpy.copyto(src=[3, 4], dst=shape)
+        return shape
+
+    def get_grid_spacing(self, grid, spacing):
+        numpy.copyto(src=[1.0, 2.0], dst=spacing)
+        return spacing
+
+    def get_grid_origin(self, grid, origin):
+        numpy.copyto(src=[0.0, 0.0], dst=origin)
+        return origin
+
+
+class HugeStepModel(StepModel):
+    """Step model on a 1000x1000 grid, of which the values do not fit in a single message"""
+    def __init__(self):
+        super().__init__()
+        self.value = numpy.arange(1000 * 1000, dtype=numpy.float64)
+
+    def get_grid_size(self, grid):
+        return self.value.size
+
+    def get_grid_shape(self, grid, shape):
+        numpy.copyto(src=[1000, 1000], dst=shape)
+        return shape
+
+
+class BlockingStepModel(StepModel):
+    """Step model of which a time step only completes after the test releases it"""
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def update(self):
+        self.started.set()
+        self.release.wait(5)
+        super().update()
+
+
+class UnpicklableModel(StepModel):
+    """Step model which can not be pickled, as it holds a lock"""
+    def __init__(self):
+        super().__init__()
+        self.handle = threading.Lock()
+
+
+class NewArrayStepModel(StepModel):
+    """Step model which returns new arrays and leaves dest unfilled, which is allowed by OptionalDestBmi"""
+    def get_value(self, name, dest):
+        return self.value.copy()
+
+    def get_value_at_indices(self, name, dest, inds):
+        return self.value[inds]
+
+    def get_grid_shape(self, grid, shape):
+        return numpy.array([3, 4])
+
+
+class SyntheticModel(DTypeModel):
+    """Model with a single variable of configurable size and type on a 1D uniform rectilinear grid.
+
+    Used by the benchmarks in ``benchmarks/``, initialize it with a JSON config file like
+    ``{"size": 1000000, "dtype": "float64"}``.
+    """
+    def initialize(self, filename):
+        with open(filename) as f:
+            config = json.load(f)
+        self.dtype = numpy.dtype(config['dtype'])
+        self.value = numpy.arange(config['size']).astype(self.dtype)
+
+    def get_component_name(self):
+        return 'synthetic'
+
+    def get_input_var_names(self):
+        return 'plate_surface__temperature',
+
+    def get_var_units(self, name):
+        return 'K'
+
+    def get_var_location(self, name):
+        return 'node'
+
+    def get_current_time(self):
+        return 0.0
+
+    def get_grid_type(self, grid):
+        return 'uniform_rectilinear'
+
+    def get_grid_rank(self, grid):
+        return 1
+
+    def get_grid_size(self, grid):
+        return self.value.size
+
+    def get_grid_shape(self, grid, shape):
+        numpy.copyto(src=[self.value.size], dst=shape)
+        return shape
+
+    def get_grid_spacing(self, grid, spacing):
+        numpy.copyto(src=[1.0], dst=spacing)
+        return spacing
+
+    def get_grid_origin(self, grid, origin):
+        numpy.copyto(src=[0.0], dst=origin)
+        return origin
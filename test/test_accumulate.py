@@ -0,0 +1,214 @@
+import threading
+import time
+from concurrent import futures
+
+import grpc
+import numpy as np
+import pytest
+
+from grpc4bmi.accumulate import Accumulator, accumulate
+from test.fake_models import HugeStepModel, StepModel
+
+VAR = 'plate_surface__temperature'
+
+
+class BlockingValueModel(StepModel):
+    """Step model of which get_value waits for the test after blocking has been switched on"""
+    def __init__(self):
+        super().__init__()
+        self.block = False
+        self.reading = threading.Event()
+        self.release = threading.Event()
+
+    def get_value(self, name, dest):
+        if self.block:
+            self.reading.set()
+            self.release.wait(5)
+        return super().get_value(name, dest)
+
+
+class TestAccumulator:
+    @pytest.mark.parametrize('operation,expected', [
+        ('mean', [2.0, 5.0]),
+        ('sum', [6.0, 15.0]),
+        ('min', [1.0, 4.0]),
+        ('max', [3.0, 6.0]),
+    ])
+    def test_operation(self, operation, expected):
+        accumulator = Accumulator(VAR, operation, 0.0)
+
+        for time in (1.0, 2.0, 3.0):
+            accumulator.add(np.array([time, time + 3]), time)
+
+        result = accumulator.result()
+        np.testing.assert_array_equal(result.values, expected)
+        assert (result.start_time, result.end_time, result.steps) == (0.0, 3.0, 3)
+
+    def test_ignores_nan(self):
+        accumulator = Accumulator(VAR, 'mean', 0.0)
+
+        accumulator.add(np.array([1.0, np.nan]), 1.0)
+        accumulator.add(np.array([3.0, np.nan]), 2.0)
+
+        np.testing.assert_array_equal(accumulator.result().values, [2.0, np.nan])
+
+    def test_integers(self):
+        accumulator = Accumulator(VAR, 'sum', 0.0)
+
+        accumulator.add(np.array([1, 2], dtype=np.int32), 1.0)
+        accumulator.add(np.array([1, 2], dtype=np.int32), 2.0)
+
+        np.testing.assert_array_equal(accumulator.result().values, [2, 4])
+
+    def test_period(self):
+        accumulator = Accumulator(VAR, 'sum', 0.0, period=3.0)
+
+        for time in range(1, 6):
+            accumulator.add(np.array([1.0]), float(time))
+
+        assert accumulator.completed.steps == 3
+        assert (accumulator.completed.start_time, accumulator.completed.end_time) == (0.0, 3.0)
+        result = accumulator.result()
+        assert (result.start_time, result.end_time, result.steps) == (3.0, 5.0, 2)
+
+    def test_period_skipped(self):
+        accumulator = Accumulator(VAR, 'sum', 0.0, period=3.0)
+        accumulator.add(np.array([1.0]), 1.0)
+
+        accumulator.add(np.array([1.0]), 9.0)
+
+        assert accumulator.completed.end_time == 1.0
+        assert accumulator.result().start_time == 6.0
+
+    def test_reset(self):
+        accumulator = Accumulator(VAR, 'max', 0.0)
+        accumulator.add(np.array([5.0]), 1.0)
+
+        accumulator.reset()
+        accumulator.add(np.array([2.0]), 2.0)
+
+        result = accumulator.result()
+        np.testing.assert_array_equal(result.values, [2.0])
+        assert result.start_time == 1.0
+
+    def test_take(self):
+        accumulator = Accumulator(VAR, 'max', 0.0)
+        accumulator.add(np.array([5.0]), 1.0)
+
+        taken = accumulator.take()
+
+        np.testing.assert_array_equal(taken.values, [5.0])
+        assert accumulator.taken is taken
+        assert accumulator.steps == 0
+
+    def test_unknown_operation(self):
+        with pytest.raises(ValueError, match='Unknown accumulation'):
+            Accumulator(VAR, 'median', 0.0)
+
+    def test_accumulate_fetches_variable_once(self):
+        model = StepModel()
+        calls = []
+        get_value = model.get_value
+        model.get_value = lambda name, dest: calls.append(name) or get_value(name, dest)
+        accumulators = {'mean': Accumulator(VAR, 'mean', 0.0), 'max': Accumulator(VAR, 'max', 0.0)}
+
+        accumulate(accumulators, model, 1.0)
+
+        assert calls == [VAR]
+
+
+class TestServer:
+    @pytest.fixture
+    def client(self, serve_model):
+        client = serve_model(StepModel())
+        client.initialize(None)
+        return client
+
+    def test_mean(self, client):
+        client.add_accumulator('mean', VAR)
+        client.update()
+        client.update()
+
+        result = client.get_accumulator('mean')
+
+        np.testing.assert_array_equal(result.values, np.arange(12) + 1.5)
+        assert (result.start_time, result.end_time, result.steps) == (0.0, 2.0, 2)
+
+    def test_update_until(self, client):
+        client.add_accumulator('max', VAR, 'max')
+
+        client.update_until(4.0)
+
+        result = client.get_accumulator('max')
+        np.testing.assert_array_equal(result.values, np.arange(12) + 4)
+        assert result.steps == 1
+
+    def test_completed_period(self, client):
+        client.add_accumulator('sum', VAR, 'sum', period=2.0)
+        for _ in range(3):
+            client.update()
+
+        result = client.get_accumulator('sum', completed=True)
+
+        np.testing.assert_array_equal(result.values, 2 * np.arange(12) + 3)
+        assert result.steps == 2
+
+    def test_no_completed_period(self, client):
+        client.add_accumulator('sum', VAR, 'sum', period=2.0)
+
+        with pytest.raises(grpc.RpcError, match='not completed a period'):
+            client.get_accumulator('sum', completed=True)
+
+    def test_reset(self, client):
+        client.add_accumulator('sum', VAR, 'sum')
+        client.update()
+
+        client.get_accumulator('sum', reset=True)
+        client.update()
+
+        np.testing.assert_array_equal(client.get_accumulator('sum').values, np.arange(12) + 2)
+
+    def test_larger_than_message(self, serve_model):
+        client = serve_model(HugeStepModel())
+        client.initialize(None)
+        client.add_accumulator('sum', VAR, 'sum')
+        client.update()
+        client.update()
+
+        result = client.get_accumulator('sum', reset=True)
+        client.update()
+
+        np.testing.assert_array_equal(result.values, 2 * np.arange(10 ** 6) + 3)
+        assert result.steps == 2
+        np.testing.assert_array_equal(client.get_accumulator('sum').values, np.arange(10 ** 6) + 3)
+
+    def test_remove(self, client):
+        client.add_accumulator('sum', VAR, 'sum')
+
+        client.remove_accumulator('sum')
+
+        with pytest.raises(grpc.RpcError, match='Unknown accumulator'):
+            client.get_accumulator('sum')
+
+    def test_unknown_operation(self, client):
+        with pytest.raises(grpc.RpcError, match='Unknown accumulation'):
+            client.add_accumulator('median', VAR, 'median')
+
+    def test_add_while_accumulating(self, serve_model):
+        model = BlockingValueModel()
+        client = serve_model(model)
+        client.initialize(None)
+        client.add_accumulator('mean', VAR)
+        model.block = True
+        with futures.ThreadPoolExecutor(max_workers=2) as executor:
+            update = executor.submit(client.update)
+            assert model.reading.wait(5)
+            add = executor.submit(client.add_accumulator, 'max', VAR, 'max')
+            time.sleep(0.05)
+            model.release.set()
+            update.result(5)
+            add.result(5)
+
+        assert client.get_status().state == 'initialized'
+        assert client.get_accumulator('mean').steps == 1
+        assert client.get_accumulator('max').steps == 0
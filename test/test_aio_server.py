@@ -0,0 +1,82 @@
+import threading
+import time
+from concurrent import futures
+
+import grpc
+import numpy
+import pytest
+
+from grpc4bmi.bmi_grpc_client import RemoteException
+from grpc4bmi.run_server import build_parser
+from test.fake_models import BlockingStepModel, Float32Model, FailingModel, SomeException
+
+
+def test_get_value(serve_aio_model):
+    client = serve_aio_model(Float32Model())
+
+    result = client.get_value('plate_surface__temperature', numpy.empty(3, dtype=numpy.float32))
+
+    numpy.testing.assert_allclose(result, [1.1, 2.2, 3.3], rtol=1e-6)
+
+
+def test_model_calls_run_on_single_thread(serve_aio_model):
+    class ThreadRecordingModel(Float32Model):
+        def __init__(self):
+            super().__init__()
+            self.threads = set()
+
+        def get_component_name(self):
+            self.threads.add(threading.get_ident())
+            return 'thread recorder'
+
+    model = ThreadRecordingModel()
+    client = serve_aio_model(model)
+
+    for _ in range(5):
+        client.get_component_name()
+
+    assert len(model.threads) == 1
+    assert threading.get_ident() not in model.threads
+
+
+def test_cached_metadata_while_updating(serve_aio_model):
+    model = BlockingStepModel()
+    client = serve_aio_model(model)
+    client.get_var_units('plate_surface__temperature')
+
+    with futures.ThreadPoolExecutor(max_workers=1) as executor:
+        update = executor.submit(client.update)
+        assert model.started.wait(5)
+        start = time.monotonic()
+        units = client.get_var_units('plate_surface__temperature')
+        seconds = time.monotonic() - start
+        running = not update.done()
+        model.release.set()
+        update.result(5)
+
+    assert units == 'K'
+    assert seconds < 1
+    assert running
+
+
+def test_model_exception(serve_aio_model):
+    client = serve_aio_model(FailingModel(SomeException('bar')), debug=True)
+
+    with pytest.raises(RemoteException, match='bar'):
+        client.update()
+
+
+def test_model_exception_without_debug(serve_aio_model):
+    client = serve_aio_model(FailingModel(SomeException('bar')))
+
+    with pytest.raises(grpc.RpcError) as excinfo:
+        client.update()
+
+    assert excinfo.value.code() == grpc.StatusCode.INTERNAL
+    assert excinfo.value.details() == 'bar'
+
+
+def test_parser_async_flag():
+    args = build_parser().parse_args(['--name', 'mypackage.MyModel', '--async'])
+
+    assert args.use_async
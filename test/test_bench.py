@@ -0,0 +1,82 @@
+import json
+import time
+
+import pytest
+
+from grpc4bmi import bench
+from grpc4bmi.bench import discover, main, report, run, Variable
+from grpc4bmi.bmi_grpc_client import BmiClient
+from test.fake_models import StepModel
+
+
+@pytest.fixture
+def port(serve_port):
+    return serve_port(StepModel())
+
+
+@pytest.fixture
+def connect(port):
+    def connect():
+        return BmiClient(BmiClient.create_grpc_channel(port), timeout=5)
+    return connect
+
+
+def test_discover(connect):
+    variables = discover(connect())
+
+    assert variables == [Variable('plate_surface__temperature', 0, 'float64', 12, True)]
+
+
+@pytest.mark.parametrize('workload,method', [
+    ('step', 'update'),
+    ('fetch', 'getValue'),
+    ('indices', 'getValueAtIndices'),
+    ('metadata', 'getVarUnits'),
+])
+def test_run(connect, workload, method):
+    result = run(connect, workload, clients=2, iterations=5, indices=4)
+
+    assert result.iterations == 10
+    assert result.errors == []
+    assert result.metrics.as_dict()[method]['calls'] == 10
+
+
+def test_run_duration(connect):
+    result = run(connect, 'fetch', duration=0.1)
+
+    assert result.seconds >= 0.1
+    assert result.iterations > 0
+
+
+def test_run_duration_excludes_setup(connect, monkeypatch):
+    build_workload = bench.build_workload
+
+    def slow_build_workload(*args, **kwargs):
+        time.sleep(0.2)
+        return build_workload(*args, **kwargs)
+    monkeypatch.setattr(bench, 'build_workload', slow_build_workload)
+
+    result = run(connect, 'fetch', clients=2, duration=0.1)
+
+    assert result.seconds < 0.2
+    assert result.iterations > 0
+
+
+def test_report(connect):
+    result = run(connect, 'fetch', iterations=3)
+
+    summary = report(result)
+
+    method = summary['methods']['getValue']
+    assert method['calls'] == 3
+    assert sum(method['histogram'].values()) == 3
+    assert method['calls_per_second'] > 0
+
+
+def test_main(port, tmp_path, capsys):
+    output = tmp_path / 'report.json'
+
+    main(['--port', str(port), '--workload', 'metadata', '--iterations', '2', '--output', str(output)])
+
+    assert 'getVarType: 2 calls' in capsys.readouterr().out
+    assert json.loads(output.read_text())['iterations'] == 2
@@ -0,0 +1,25 @@
+import json
+
+from benchmarks.transport import compare, main, run
+
+
+def test_run_inprocess():
+    results = run(['inprocess'], [10], ['float64'], ['get_value', 'get_grid_shape'], repeat=3, max_seconds=0.1)
+
+    assert [(r['method'], r['calls']) for r in results] == [('get_value', 3), ('get_grid_shape', 3)]
+    assert results[0]['bytes_per_call'] == 80
+    assert results[0]['path'] == 'single'
+    assert results[0]['latency_p50'] > 0
+
+
+def test_main_and_compare(tmp_path, capsys):
+    output = tmp_path / 'results.json'
+
+    main(['--modes', 'inprocess', '--sizes', '10', '--dtypes', 'int32', '--methods', 'set_value',
+          '--repeat', '3', '--output', str(output)])
+    compare(str(output), str(output))
+
+    document = json.loads(output.read_text())
+    assert document['results'][0]['method'] == 'set_value'
+    assert 'grpcio' in document['environment']
+    assert '+0.0%' in capsys.readouterr().out
@@ -0,0 +1,182 @@
+import json
+import pickle
+
+import grpc
+import numpy as np
+import pytest
+
+from grpc4bmi.checkpoint import load_state, save_state
+from test.fake_models import StepModel, UnpicklableModel
+
+VAR = 'plate_surface__temperature'
+
+
+class NativeStateModel(StepModel):
+    def save_state(self, path):
+        with open(path, 'w') as f:
+            json.dump({'time': self.time, 'value': self.value.tolist()}, f)
+
+    def load_state(self, path):
+        with open(path) as f:
+            state = json.load(f)
+        self.time = state['time']
+        self.value = np.array(state['value'])
+
+
+def spin_up(model):
+    model.initialize(None)
+    for _ in range(3):
+        model.update()
+
+
+@pytest.mark.parametrize('model_class,kind', [
+    (StepModel, 'pickle'),
+    (NativeStateModel, 'native'),
+])
+def test_restores_state(tmp_path, model_class, kind):
+    path = str(tmp_path / 'state')
+    model = model_class()
+    spin_up(model)
+
+    assert save_state(model, path) == kind
+    model.update()
+    assert load_state(model, path) == kind
+
+    assert model.get_current_time() == 3.0
+    np.testing.assert_array_equal(model.get_value(VAR, np.empty(12)), np.arange(12) + 3)
+
+
+def test_restores_into_same_object(tmp_path):
+    path = str(tmp_path / 'state')
+    model = StepModel()
+    spin_up(model)
+    save_state(model, path)
+
+    other = StepModel()
+    load_state(other, path)
+
+    assert other.get_current_time() == 3.0
+
+
+def test_unpicklable_model_saves_variables(tmp_path):
+    path = str(tmp_path / 'state')
+    model = UnpicklableModel()
+    spin_up(model)
+
+    assert save_state(model, path) == 'variables'
+    model.set_value(VAR, np.zeros(12))
+    assert load_state(model, path) == 'variables'
+
+    np.testing.assert_array_equal(model.get_value(VAR, np.empty(12)), np.arange(12) + 3)
+
+
+def test_variables_into_uninitialized_model(tmp_path):
+    path = str(tmp_path / 'state')
+    model = UnpicklableModel()
+    spin_up(model)
+    save_state(model, path)
+
+    with pytest.raises(ValueError, match='only be restored into an initialized model'):
+        load_state(UnpicklableModel(), path, initialized=False)
+
+
+def test_creates_directory(tmp_path):
+    path = tmp_path / 'checkpoints' / 'state'
+
+    save_state(StepModel(), str(path))
+
+    assert path.exists()
+
+
+def test_load_other_file(tmp_path):
+    path = tmp_path / 'state'
+    path.write_bytes(pickle.dumps({'some': 'thing'}))
+
+    with pytest.raises(ValueError, match='not a state saved by grpc4bmi'):
+        load_state(StepModel(), str(path))
+
+
+def test_load_state_of_other_model(tmp_path):
+    path = str(tmp_path / 'state')
+    save_state(StepModel(), path)
+
+    with pytest.raises(ValueError, match='StepModel model, not of a UnpicklableModel'):
+        load_state(UnpicklableModel(), path)
+
+
+class TestServer:
+    def test_save_and_load(self, tmp_path, serve_model):
+        client = serve_model(StepModel(), work_dir=str(tmp_path))
+        spin_up(client)
+
+        assert client.save_state('state') == 'pickle'
+        client.update()
+        assert client.load_state('state') == 'pickle'
+
+        assert (tmp_path / 'state').exists()
+        assert client.get_current_time() == 3.0
+        np.testing.assert_array_equal(client.get_value(VAR, np.empty(12)), np.arange(12) + 3)
+        assert client.get_status().current_time == 3.0
+
+    def test_default_work_dir_is_current_directory(self, tmp_path, serve_model, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        client = serve_model(StepModel())
+
+        client.save_state('checkpoints/state')
+
+        assert (tmp_path / 'checkpoints' / 'state').exists()
+
+    def test_load_pipelined(self, tmp_path, serve_model):
+        client = serve_model(StepModel(), pipeline=True, work_dir=str(tmp_path))
+        spin_up(client)
+        client.save_state('state')
+        client.update()
+
+        client.load_state('state')
+
+        np.testing.assert_array_equal(client.get_value(VAR, np.empty(12)), np.arange(12) + 3)
+
+    def test_load_missing_file(self, tmp_path, serve_model):
+        client = serve_model(StepModel(), work_dir=str(tmp_path))
+
+        with pytest.raises(grpc.RpcError, match='No such file'):
+            client.load_state('missing')
+
+    @pytest.mark.parametrize('path,message', [
+        ('/etc/passwd', 'should be relative'),
+        ('../state', 'outside the work directory'),
+        ('checkpoints/../../state', 'outside the work directory'),
+        ('', 'should not be empty'),
+    ])
+    def test_path_outside_work_dir(self, tmp_path, serve_model, path, message):
+        work_dir = tmp_path / 'work'
+        work_dir.mkdir()
+        client = serve_model(StepModel(), work_dir=str(work_dir))
+
+        with pytest.raises(grpc.RpcError, match=message):
+            client.save_state(path)
+        with pytest.raises(grpc.RpcError, match=message):
+            client.load_state(path)
+
+        assert list(tmp_path.iterdir()) == [work_dir]
+
+    def test_symlink_outside_work_dir(self, tmp_path, serve_model):
+        work_dir = tmp_path / 'work'
+        work_dir.mkdir()
+        (work_dir / 'link').symlink_to(tmp_path)
+        client = serve_model(StepModel(), work_dir=str(work_dir))
+
+        with pytest.raises(grpc.RpcError, match='outside the work directory'):
+            client.load_state('link/state')
+
+    def test_proxied_client_uses_native_hooks(self, tmp_path, serve_model, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        upstream = serve_model(StepModel())
+        client = serve_model(upstream)
+        spin_up(client)
+
+        assert client.save_state('state') == 'native'
+        client.update()
+        client.load_state('state')
+
+        assert upstream.get_current_time() == 3.0
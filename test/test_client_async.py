@@ -0,0 +1,70 @@
+from concurrent import futures
+
+import pytest
+
+from grpc4bmi.bmi_grpc_client import BmiFuture, RemoteException, wait_all
+from test.fake_models import BlockingStepModel, FailingModel, SomeException, StepModel
+
+
+def test_update_async(serve_model):
+    model = BlockingStepModel()
+    client = serve_model(model)
+
+    handle = client.update_async()
+
+    assert isinstance(handle, BmiFuture)
+    assert not handle.done()
+    model.release.set()
+    assert handle.result(timeout=5) is None
+    assert client.get_current_time() == 1.0
+
+
+def test_update_until_async(serve_model):
+    client = serve_model(StepModel())
+
+    handle = client.update_until_async(3.0)
+
+    handle.result(timeout=5)
+    assert client.get_current_time() == 3.0
+
+
+def test_update_async_remote_exception(serve_model):
+    client = serve_model(FailingModel(SomeException('bar')), debug=True)
+
+    handle = client.update_async()
+
+    with pytest.raises(RemoteException, match='bar'):
+        handle.result(timeout=5)
+
+
+def test_wait_all(serve_model):
+    clients = [serve_model(StepModel()) for _ in range(3)]
+
+    handles = [client.update_until_async(2.0) for client in clients]
+    results = wait_all(handles, timeout=5)
+
+    assert results == [None, None, None]
+    assert [client.get_current_time() for client in clients] == [2.0, 2.0, 2.0]
+
+
+def test_wait_all_timeout(serve_model):
+    model = BlockingStepModel()
+    client = serve_model(model)
+    handle = client.update_async()
+
+    with pytest.raises(futures.TimeoutError):
+        wait_all([handle], timeout=0.1)
+
+    model.release.set()
+    handle.result(timeout=5)
+
+
+def test_wait_all_raises_error(serve_model):
+    good = serve_model(StepModel())
+    bad = serve_model(FailingModel(SomeException('bar')), debug=True)
+
+    handles = [good.update_async(), bad.update_async()]
+
+    with pytest.raises(RemoteException, match='bar'):
+        wait_all(handles, timeout=5)
+    assert handles[0].done()
@@ -0,0 +1,138 @@
+import json
+from unittest.mock import Mock
+
+import grpc
+import numpy as np
+import pytest
+
+from grpc4bmi import bmi_pb2
+from grpc4bmi.bmi_grpc_client import BmiClient
+from grpc4bmi.metrics import LATENCY_SAMPLE_SIZE, ClientMetrics, InstrumentedStub
+from test.fake_models import StepModel
+
+VAR = 'plate_surface__temperature'
+
+
+class TestClientMetrics:
+    def test_as_dict(self):
+        metrics = ClientMetrics()
+        for seconds in (0.1, 0.2, 0.3, 0.4):
+            metrics.observe('update', seconds, 2, 0)
+        metrics.observe('update', 0.5, 2, 0, failed=True)
+
+        result = metrics.as_dict()['update']
+
+        assert result['calls'] == 5
+        assert result['errors'] == 1
+        assert result['seconds_total'] == pytest.approx(1.5)
+        assert result['latency_p50'] == pytest.approx(0.3)
+        assert result['latency_max'] == pytest.approx(0.5)
+        assert result['request_bytes'] == 10
+
+    def test_memory_bounded(self):
+        metrics = ClientMetrics()
+        calls = LATENCY_SAMPLE_SIZE * 3
+        for seconds in np.linspace(0.0, 1.0, calls):
+            metrics.observe('update', float(seconds), 0, 0)
+
+        result = metrics.as_dict()['update']
+
+        assert len(metrics.latencies()['update']) == LATENCY_SAMPLE_SIZE
+        assert result['calls'] == calls
+        assert result['seconds_total'] == pytest.approx(calls / 2)
+        assert result['latency_max'] == 1.0
+        assert result['latency_p50'] == pytest.approx(0.5, abs=0.05)
+        assert sum(metrics.latency_buckets()['update']) == calls
+
+    def test_to_json(self, tmp_path):
+        metrics = ClientMetrics()
+        metrics.observe('update', 0.1, 0, 0)
+        path = tmp_path / 'metrics.json'
+
+        document = metrics.to_json(path)
+
+        assert json.loads(path.read_text()) == json.loads(document)
+        assert json.loads(document)['update']['calls'] == 1
+
+    def test_reset(self):
+        metrics = ClientMetrics()
+        metrics.observe('update', 0.1, 0, 0)
+
+        metrics.reset()
+
+        assert metrics.as_dict() == {}
+
+
+class TestInstrumentedClient:
+    def test_instrument(self, serve_model):
+        client = serve_model(StepModel())
+        metrics = client.instrument()
+
+        client.initialize(None)
+        client.get_value(VAR, np.empty(12))
+
+        result = metrics.as_dict()
+        assert result['initialize']['calls'] == 1
+        assert result['getValue']['calls'] == 1
+        assert result['getValue']['request_bytes'] > len(VAR)
+        assert result['getValue']['response_bytes'] > 12 * 8
+        assert client.metrics is metrics
+
+    def test_instrument_twice(self, serve_model):
+        client = serve_model(StepModel())
+
+        assert client.instrument() is client.instrument()
+
+    def test_errors(self, serve_model):
+        client = serve_model(StepModel())
+        metrics = client.instrument()
+
+        with pytest.raises(grpc.RpcError):
+            client.set_value('unknown', np.ones(3))
+
+        assert metrics.as_dict()['setValue']['errors'] == 1
+
+    def test_profile(self, serve_model):
+        client = serve_model(StepModel())
+        client.initialize(None)
+
+        with client.profile() as metrics:
+            client.update()
+            client.update()
+        client.update()
+
+        assert list(metrics.as_dict()) == ['update']
+        assert metrics.as_dict()['update']['calls'] == 2
+
+    def test_profile_and_instrument(self, serve_model):
+        client = serve_model(StepModel())
+        total = client.instrument()
+        client.initialize(None)
+
+        with client.profile() as metrics:
+            client.update()
+
+        assert metrics.as_dict()['update']['calls'] == 1
+        assert total.as_dict()['update']['calls'] == 1
+        assert total.as_dict()['initialize']['calls'] == 1
+
+    def test_update_async(self, serve_model):
+        client = serve_model(StepModel())
+        client.initialize(None)
+
+        with client.profile() as metrics:
+            client.update_async().result(5)
+
+        assert metrics.as_dict()['update']['calls'] == 1
+
+    def test_custom_stub(self):
+        stub = Mock()
+        stub.getComponentName.return_value = bmi_pb2.GetComponentNameResponse(name='step')
+        client = BmiClient(stub=stub)
+
+        with client.profile() as metrics:
+            name = client.get_component_name()
+
+        assert name == 'step'
+        assert metrics.as_dict()['getComponentName']['response_bytes'] == len('step') + 2
+        assert isinstance(client.stub, InstrumentedStub)
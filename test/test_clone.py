@@ -0,0 +1,86 @@
+import os
+import sys
+
+import grpc
+import numpy as np
+import pytest
+
+from grpc4bmi.clone import Cloner
+from grpc4bmi.exceptions import DeadContainerException
+from grpc4bmi.run_server import build_parser, clone_command
+from test.fake_models import StepModel, UnpicklableModel
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VAR = 'plate_surface__temperature'
+
+
+@pytest.fixture
+def cloner(monkeypatch):
+    # Run clone from root of repository, so the pickled test.fake_models.StepModel can be imported
+    monkeypatch.chdir(ROOT)
+    cloner = Cloner([sys.executable, '-m', 'grpc4bmi.run_server', '--name', 'test.fake_models.StepModel'], timeout=30)
+    yield cloner
+    cloner.stop()
+
+
+def test_not_clonable(serve_model):
+    client = serve_model(StepModel())
+
+    with pytest.raises(grpc.RpcError, match='can not be cloned'):
+        client.clone()
+
+
+def test_clone(serve_model, cloner):
+    client = serve_model(StepModel(), cloner=cloner)
+    client.initialize(None)
+    client.update()
+    client.update()
+
+    clone = client.clone(timeout=30)
+    clone.update()
+
+    assert clone.get_current_time() == 3.0
+    np.testing.assert_array_equal(clone.get_value(VAR, np.empty(12)), np.arange(12) + 3)
+    assert client.get_current_time() == 2.0
+    assert clone.get_status().state == 'initialized'
+
+
+def test_clone_unpicklable_model(serve_model, cloner):
+    client = serve_model(UnpicklableModel(), cloner=cloner)
+    client.initialize(None)
+
+    with pytest.raises(grpc.RpcError, match='can only be cloned') as excinfo:
+        client.clone(timeout=30)
+
+    assert excinfo.value.code() == grpc.StatusCode.FAILED_PRECONDITION
+    assert cloner.processes == []
+
+
+def test_stop(serve_model, cloner):
+    client = serve_model(StepModel(), cloner=cloner)
+    client.clone(timeout=30)
+    process = cloner.processes[0]
+
+    cloner.stop()
+
+    assert process.poll() is not None
+    assert cloner.processes == []
+
+
+def test_clone_which_can_not_start(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    cloner = Cloner([sys.executable, '-m', 'grpc4bmi.run_server', '--name', 'test.fake_models.NoSuchModel'], timeout=30)
+
+    with pytest.raises(DeadContainerException):
+        cloner.clone(lambda path: 'pickle')
+
+
+def test_clone_command():
+    args = build_parser().parse_args(['--name', 'mypackage.MyBmi', '--path', '/models', '--pipeline',
+                                      '--metrics-port', '9000', '--trace', 'trace.json'])
+
+    command = clone_command(args)
+
+    assert command[:3] == [sys.executable, '-m', 'grpc4bmi.run_server']
+    assert command[3:] == ['--language', 'python', '--workers', '10', '--name', 'mypackage.MyBmi',
+                           '--path', '/models', '--pipeline']
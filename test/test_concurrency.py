@@ -0,0 +1,198 @@
+import threading
+from concurrent import futures
+
+import numpy as np
+import pytest
+
+from grpc4bmi.concurrency import CacheMiss, SerializedModel, cache_only
+from grpc4bmi.metrics import ServerMetrics, _Timer, _model_seconds
+from test.fake_models import BlockingStepModel, NewArrayStepModel, StepModel
+
+VAR = 'plate_surface__temperature'
+
+
+class CountingStepModel(StepModel):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def get_var_units(self, name):
+        self.calls.append('get_var_units')
+        return super().get_var_units(name)
+
+    def get_grid_shape(self, grid, shape):
+        self.calls.append('get_grid_shape')
+        return super().get_grid_shape(grid, shape)
+
+
+class TestSerializedModel:
+    def test_metadata_cached(self):
+        origin = CountingStepModel()
+        model = SerializedModel(origin)
+
+        assert model.get_var_units(VAR) == 'K'
+        assert model.get_var_units(VAR) == 'K'
+
+        assert origin.calls == ['get_var_units']
+
+    def test_array_metadata_cached(self):
+        origin = CountingStepModel()
+        model = SerializedModel(origin)
+        first = model.get_grid_shape(0, np.empty(2, dtype=np.int64))
+        first[:] = 0
+
+        second = model.get_grid_shape(0, np.empty(2, dtype=np.int64))
+
+        np.testing.assert_array_equal(second, [3, 4])
+        assert origin.calls == ['get_grid_shape']
+
+    def test_array_metadata_returned_in_new_array(self):
+        model = SerializedModel(NewArrayStepModel())
+        first = model.get_grid_shape(0, np.zeros(2, dtype=np.int64))
+
+        second = model.get_grid_shape(0, np.zeros(2, dtype=np.int64))
+
+        np.testing.assert_array_equal(first, [3, 4])
+        np.testing.assert_array_equal(second, [3, 4])
+
+    def test_initialize_clears_cache(self):
+        origin = CountingStepModel()
+        model = SerializedModel(origin)
+        model.get_var_units(VAR)
+
+        model.initialize(None)
+        model.get_var_units(VAR)
+
+        assert origin.calls == ['get_var_units', 'get_var_units']
+
+    def test_values_not_cached(self):
+        model = SerializedModel(StepModel())
+        model.update()
+
+        value = model.get_value(VAR, np.empty(12))
+
+        assert value[0] == 1.0
+
+    def test_non_callable_passthrough(self):
+        model = SerializedModel(StepModel())
+
+        assert model.time == 0.0
+
+    def test_cached_metadata_while_updating(self):
+        origin = BlockingStepModel()
+        model = SerializedModel(origin)
+        model.get_var_units(VAR)
+        with futures.ThreadPoolExecutor(max_workers=1) as executor:
+            update = executor.submit(model.update)
+            assert origin.started.wait(5)
+
+            # Would block on lock when not cached
+            assert model.get_var_units(VAR) == 'K'
+            assert not update.done()
+
+            origin.release.set()
+            update.result(5)
+
+    def test_cache_only_hit(self):
+        origin = CountingStepModel()
+        model = SerializedModel(origin)
+        model.get_var_units(VAR)
+
+        with cache_only():
+            assert model.get_var_units(VAR) == 'K'
+
+        assert origin.calls == ['get_var_units']
+
+    @pytest.mark.parametrize('call', [
+        lambda model: model.get_var_units(VAR),
+        lambda model: model.get_current_time(),
+        lambda model: model.initialize(None),
+    ])
+    def test_cache_only_miss(self, call):
+        origin = CountingStepModel()
+        model = SerializedModel(origin)
+
+        with cache_only(), pytest.raises(CacheMiss):
+            call(model)
+
+        assert origin.calls == []
+        assert origin.time == 0.0
+
+    def test_queue_seconds(self):
+        origin = BlockingStepModel()
+        model = SerializedModel(origin)
+        timer = _Timer()
+
+        def wait_then_release():
+            origin.started.wait(5)
+            threading.Timer(0.05, origin.release.set).start()
+        with futures.ThreadPoolExecutor(max_workers=2) as executor:
+            update = executor.submit(model.update)
+            executor.submit(wait_then_release)
+            origin.started.wait(5)
+            token = _model_seconds.set(timer)
+            try:
+                model.get_current_time()
+            finally:
+                _model_seconds.reset(token)
+            update.result(5)
+
+        assert timer.queue_seconds >= 0.04
+
+
+def test_queue_seconds_in_prometheus():
+    metrics = ServerMetrics()
+    metrics.observe_call('/bmi.BmiService/getValue', 0.1, 0.01, queue_seconds=0.05)
+
+    assert 'grpc4bmi_server_queue_seconds_total{method="/bmi.BmiService/getValue"} 0.05' in metrics.to_prometheus()
+
+
+def test_concurrent_clients(serve_model):
+    client = serve_model(StepModel())
+    client.initialize(None)
+
+    def step():
+        for _ in range(20):
+            client.update()
+
+    def read():
+        for _ in range(20):
+            client.get_value(VAR, np.empty(12))
+            client.get_var_units(VAR)
+
+    with futures.ThreadPoolExecutor(max_workers=4) as executor:
+        for job in [executor.submit(step), executor.submit(read), executor.submit(read)]:
+            job.result(10)
+
+    assert client.get_current_time() == 20.0
+
+
+class TestAsyncServer:
+    def test_cached_metadata_while_updating(self, serve_aio_model):
+        model = BlockingStepModel()
+        client = serve_aio_model(model)
+        client.get_grid_shape(0, np.empty(2, dtype=np.int64))
+
+        with futures.ThreadPoolExecutor(max_workers=1) as executor:
+            update = executor.submit(client.update)
+            assert model.started.wait(5)
+            shape = client.get_grid_shape(0, np.empty(2, dtype=np.int64))
+            running = not update.done()
+            model.release.set()
+            update.result(5)
+
+        np.testing.assert_array_equal(shape, [3, 4])
+        assert running
+
+    def test_uncached_call_waits_for_update(self, serve_aio_model):
+        model = BlockingStepModel()
+        client = serve_aio_model(model)
+
+        with futures.ThreadPoolExecutor(max_workers=2) as executor:
+            update = executor.submit(client.update)
+            assert model.started.wait(5)
+            current_time = executor.submit(client.get_current_time)
+            threading.Timer(0.05, model.release.set).start()
+            update.result(5)
+
+            assert current_time.result(5) == 1.0
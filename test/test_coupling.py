@@ -0,0 +1,180 @@
+import time
+
+import numpy as np
+import pytest
+
+from grpc4bmi.coupling import Coupler
+from test.fake_models import StepModel
+
+VAR = 'plate_surface__temperature'
+
+
+class SlowModel(StepModel):
+    def update(self):
+        time.sleep(0.1)
+        super().update()
+
+
+class FailingCouplingModel(StepModel):
+    def update(self):
+        raise ValueError('Model crashed')
+
+
+def values(model):
+    return model.get_value(VAR, np.empty(12))
+
+
+@pytest.fixture
+def coupler():
+    with Coupler(step=1.0) as coupler:
+        yield coupler
+
+
+class TestOrder:
+    def test_dependencies(self, coupler):
+        for name in ('a', 'b', 'c'):
+            coupler.add_model(name, StepModel())
+        coupler.add_exchange('b', VAR, 'a', VAR)
+        coupler.add_exchange('c', VAR, 'b', VAR)
+        coupler.add_exchange('a', VAR, 'c', VAR, lagged=True)
+
+        assert coupler.dependencies() == {'a': ['b'], 'b': ['c'], 'c': []}
+        assert coupler.order() == ['c', 'b', 'a']
+
+    def test_cycle(self, coupler):
+        coupler.add_model('a', StepModel())
+        coupler.add_model('b', StepModel())
+        coupler.add_exchange('a', VAR, 'b', VAR)
+        coupler.add_exchange('b', VAR, 'a', VAR)
+
+        with pytest.raises(ValueError, match='form a cycle'):
+            coupler.order()
+
+    def test_unknown_model(self, coupler):
+        coupler.add_model('a', StepModel())
+
+        with pytest.raises(ValueError, match='Unknown model b'):
+            coupler.add_exchange('a', VAR, 'b', VAR)
+
+    def test_duplicate_model(self, coupler):
+        coupler.add_model('a', StepModel())
+
+        with pytest.raises(ValueError, match='already been added'):
+            coupler.add_model('a', StepModel())
+
+
+class TestRun:
+    def test_exchange_after_source_step(self, coupler):
+        source, target = StepModel(), StepModel()
+        coupler.add_model('target', target)
+        coupler.add_model('source', source)
+        coupler.add_exchange('source', VAR, 'target', VAR)
+
+        coupler.run(2.0)
+
+        np.testing.assert_array_equal(values(source), np.arange(12) + 2)
+        # Received values at end of each step of source, then stepped once more
+        np.testing.assert_array_equal(values(target), np.arange(12) + 3)
+        assert coupler.time == 2.0
+
+    def test_lagged_exchange(self, coupler):
+        source, target = StepModel(), StepModel()
+        coupler.add_model('source', source)
+        coupler.add_model('target', target)
+        coupler.add_exchange('source', VAR, 'target', VAR, lagged=True)
+
+        coupler.run(2.0)
+
+        np.testing.assert_array_equal(values(target), np.arange(12) + 2)
+
+    def test_indices_and_transform(self, coupler):
+        source, target = StepModel(), StepModel()
+        coupler.add_model('source', source)
+        coupler.add_model('target', target)
+        coupler.add_exchange('source', VAR, 'target', VAR, lagged=True, src_indices=np.array([11]),
+                             dest_indices=np.array([0]), transform=lambda v: v * 10)
+
+        coupler.run(1.0)
+
+        np.testing.assert_array_equal(values(target)[:2], [111, 2])
+
+    def test_time_alignment(self, coupler):
+        fast, slow = StepModel(), StepModel()
+        coupler.add_model('fast', fast, scale=3.0)
+        coupler.add_model('slow', slow)
+
+        coupler.run(2.0)
+
+        assert fast.get_current_time() == 6.0
+        assert slow.get_current_time() == 2.0
+
+    def test_shortened_last_step(self):
+        model = StepModel()
+        with Coupler(step=2.0) as coupler:
+            coupler.add_model('model', model)
+
+            coupler.run(3.0)
+
+        assert model.get_current_time() == 3.0
+        assert coupler.time == 3.0
+
+    def test_starts_at_current_time(self, coupler):
+        model = StepModel()
+        model.update_until(5.0)
+        coupler.add_model('model', model)
+
+        coupler.run(6.0)
+
+        assert model.get_current_time() == 6.0
+
+    def test_independent_models_run_concurrently(self, coupler):
+        for name in ('a', 'b', 'c'):
+            coupler.add_model(name, SlowModel())
+        coupler.add_exchange('a', VAR, 'b', VAR, lagged=True)
+
+        start = time.monotonic()
+        coupler.run(3.0)
+
+        # Sequentially 3 models times 3 steps would take 0.9s
+        assert time.monotonic() - start < 0.6
+
+    def test_error(self, coupler):
+        model = StepModel()
+        coupler.add_model('model', model)
+        coupler.add_model('failing', FailingCouplingModel())
+        coupler.add_exchange('failing', VAR, 'model', VAR)
+
+        with pytest.raises(ValueError, match='Model crashed'):
+            coupler.run(3.0)
+
+        assert model.get_current_time() == 0.0
+        assert coupler.time == 0.0
+
+
+class TestServers:
+    def test_clients(self, coupler, serve_model):
+        source, target = serve_model(StepModel()), serve_model(StepModel())
+        coupler.add_model('source', source)
+        coupler.add_model('target', target)
+        coupler.add_exchange('source', VAR, 'target', VAR)
+
+        coupler.run(1.0)
+
+        np.testing.assert_array_equal(target.get_value(VAR, np.empty(12)), np.arange(12) + 2)
+
+    def test_push_to_address(self, coupler, serve_model, serve_port):
+        source, target = serve_model(StepModel()), StepModel()
+        coupler.add_model('source', source)
+        coupler.add_model('target', target)
+        coupler.add_exchange('source', VAR, 'target', VAR, address=f'localhost:{serve_port(target)}')
+
+        coupler.run(1.0)
+
+        np.testing.assert_array_equal(values(target), np.arange(12) + 2)
+
+    def test_push_with_transform(self, coupler):
+        coupler.add_model('source', StepModel())
+        coupler.add_model('target', StepModel())
+
+        with pytest.raises(ValueError, match='can not be transformed'):
+            coupler.add_exchange('source', VAR, 'target', VAR, transform=np.sqrt, address='localhost:1')
@@ -0,0 +1,115 @@
+import numpy
+import pytest
+from numpy.testing import assert_array_equal
+
+from grpc4bmi.ensemble import Ensemble, EnsembleFailedError
+from test.fake_models import StepModel, SomeException
+
+
+class FailAtStepModel(StepModel):
+    def __init__(self, fail_at=None):
+        super().__init__()
+        self.fail_at = fail_at
+        self.config = None
+
+    def initialize(self, filename):
+        self.config = filename
+
+    def update(self):
+        if self.time + 1 == self.fail_at:
+            raise SomeException('member failed')
+        super().update()
+
+
+def test_launch():
+    with Ensemble.launch(FailAtStepModel, [{}, {'fail_at': 2}]) as ensemble:
+        assert len(ensemble) == 2
+        assert ensemble.members[1].fail_at == 2
+
+
+def test_launch_failure():
+    def factory(fail):
+        if fail:
+            raise SomeException('launch failed')
+        return StepModel()
+
+    with Ensemble.launch(factory, [{'fail': False}, {'fail': True}, {'fail': False}]) as ensemble:
+        assert ensemble.active == [0, 2]
+        assert isinstance(ensemble.errors[1], SomeException)
+
+
+def test_initialize_per_member_config():
+    members = [FailAtStepModel(), FailAtStepModel()]
+    with Ensemble(members) as ensemble:
+        ensemble.initialize(['a.yml', 'b.yml'])
+
+    assert [m.config for m in members] == ['a.yml', 'b.yml']
+
+
+def test_initialize_shared_config():
+    members = [FailAtStepModel(), FailAtStepModel()]
+    with Ensemble(members) as ensemble:
+        ensemble.initialize('shared.yml')
+
+    assert [m.config for m in members] == ['shared.yml', 'shared.yml']
+
+
+def test_initialize_wrong_number_of_configs():
+    with Ensemble([StepModel(), StepModel()]) as ensemble:
+        with pytest.raises(ValueError, match='Expected 2 values'):
+            ensemble.initialize(['a.yml'])
+
+
+def test_update_until():
+    with Ensemble([StepModel(), StepModel(), StepModel()]) as ensemble:
+        ensemble.update_until(3.0)
+
+        assert_array_equal(ensemble.get_current_time(), [3.0, 3.0, 3.0])
+
+
+def test_get_value():
+    with Ensemble([StepModel(), StepModel()]) as ensemble:
+        ensemble.update()
+
+        result = ensemble.get_value('plate_surface__temperature')
+
+    expected = numpy.stack([numpy.arange(1, 13), numpy.arange(1, 13)])
+    assert_array_equal(result, expected)
+
+
+def test_set_value():
+    members = [StepModel(), StepModel()]
+    with Ensemble(members) as ensemble:
+        values = numpy.stack([numpy.zeros(12), numpy.ones(12)])
+
+        ensemble.set_value('plate_surface__temperature', values)
+
+    assert_array_equal(members[0].value, numpy.zeros(12))
+    assert_array_equal(members[1].value, numpy.ones(12))
+
+
+def test_set_value_wrong_number_of_members():
+    with Ensemble([StepModel(), StepModel()]) as ensemble:
+        with pytest.raises(ValueError, match='Expected values for 2 active members'):
+            ensemble.set_value('plate_surface__temperature', numpy.zeros((3, 12)))
+
+
+def test_failed_member_is_isolated():
+    with Ensemble([FailAtStepModel(), FailAtStepModel(fail_at=2), FailAtStepModel()]) as ensemble:
+        ensemble.update_until(3.0)
+
+        assert ensemble.active == [0, 2]
+        assert isinstance(ensemble.errors[1], SomeException)
+        assert_array_equal(ensemble.get_current_time(), [3.0, 3.0])
+        assert ensemble.get_value('plate_surface__temperature').shape == (2, 12)
+
+
+def test_all_members_failed():
+    with Ensemble([FailAtStepModel(fail_at=1), FailAtStepModel(fail_at=1)]) as ensemble:
+        with pytest.raises(EnsembleFailedError, match='All 2 members of ensemble have failed'):
+            ensemble.update()
+
+        assert ensemble.active == []
+        assert len(ensemble) == 2
+        with pytest.raises(EnsembleFailedError):
+            ensemble.get_value('plate_surface__temperature')
@@ -0,0 +1,146 @@
+from unittest.mock import Mock
+
+import grpc
+import pytest
+from grpc_health.v1 import health, health_pb2
+
+from grpc4bmi import bmi_pb2
+from grpc4bmi.bmi_grpc_client import ServerStatus
+from grpc4bmi.bmi_grpc_server import BmiServer
+from grpc4bmi.run_server import BMI_SERVICE_NAME, track_health
+from test.fake_models import BlockingStepModel, FailingModel, SomeException, StepModel
+
+
+def health_of(health_servicer, service):
+    request = health_pb2.HealthCheckRequest(service=service)
+    return health_servicer.Check(request, Mock(grpc.ServicerContext)).status
+
+
+class TestBmiServerState:
+    @pytest.fixture
+    def context(self):
+        context = Mock(grpc.ServicerContext)
+        context.abort_with_status.side_effect = grpc.RpcError
+        return context
+
+    def test_created(self):
+        server = BmiServer(StepModel())
+
+        assert server.state == bmi_pb2.GetStatusResponse.CREATED
+
+    def test_initialized(self, context):
+        server = BmiServer(StepModel())
+
+        server.initialize(bmi_pb2.InitializeRequest(), context)
+
+        assert server.state == bmi_pb2.GetStatusResponse.INITIALIZED
+
+    def test_updated(self, context):
+        server = BmiServer(StepModel())
+        server.initialize(bmi_pb2.InitializeRequest(), context)
+
+        server.updateUntil(bmi_pb2.GetTimeResponse(time=3), context)
+
+        response = server.getStatus(bmi_pb2.Empty(), context)
+        assert response.state == bmi_pb2.GetStatusResponse.INITIALIZED
+        assert not response.updating
+        assert response.current_time == 3.0
+
+    def test_finalized(self, context):
+        server = BmiServer(StepModel())
+        server.initialize(bmi_pb2.InitializeRequest(), context)
+
+        server.finalize(bmi_pb2.Empty(), context)
+
+        assert server.state == bmi_pb2.GetStatusResponse.FINALIZED
+
+    def test_failed(self, context):
+        server = BmiServer(FailingModel(SomeException('bar')))
+
+        with pytest.raises(grpc.RpcError):
+            server.update(bmi_pb2.Empty(), context)
+
+        assert server.state == bmi_pb2.GetStatusResponse.FAILED
+        assert not server.updating
+
+    def test_server_error_after_step(self, context):
+        server = BmiServer(StepModel())
+        server.initialize(bmi_pb2.InitializeRequest(), context)
+
+        def fail():
+            raise IOError('disk full')
+        server._record_outputs = fail
+
+        with pytest.raises(grpc.RpcError):
+            server.update(bmi_pb2.Empty(), context)
+
+        assert server.state == bmi_pb2.GetStatusResponse.INITIALIZED
+        assert server.current_time == 1.0
+        assert not server.updating
+
+    def test_state_listener(self, context):
+        server = BmiServer(StepModel())
+        states = []
+        server.add_state_listener(states.append)
+
+        server.initialize(bmi_pb2.InitializeRequest(), context)
+        server.finalize(bmi_pb2.Empty(), context)
+
+        assert states == [bmi_pb2.GetStatusResponse.INITIALIZED, bmi_pb2.GetStatusResponse.FINALIZED]
+
+
+def test_get_status(serve_model):
+    client = serve_model(StepModel())
+    client.initialize(None)
+    client.update()
+
+    assert client.get_status() == ServerStatus(state='initialized', updating=False, current_time=1.0)
+
+
+def test_get_status_during_update(serve_model):
+    model = BlockingStepModel()
+    client = serve_model(model)
+    client.initialize(None)
+    handle = client.update_async()
+    model.started.wait(5)
+
+    status = client.get_status()
+
+    model.release.set()
+    handle.result(timeout=5)
+    assert status == ServerStatus(state='initialized', updating=True, current_time=0.0)
+
+
+def test_get_status_during_update_on_aio_server(serve_aio_model):
+    model = BlockingStepModel()
+    client = serve_aio_model(model)
+
+    handle = client.update_async()
+    assert model.started.wait(5)
+    status = client.get_status()
+    model.release.set()
+    handle.result(5)
+
+    assert status.updating
+
+
+def test_track_health():
+    server = BmiServer(StepModel())
+    health_servicer = health.HealthServicer()
+
+    track_health(server, health_servicer.set)
+
+    assert health_of(health_servicer, '') == health_pb2.HealthCheckResponse.SERVING
+    assert health_of(health_servicer, BMI_SERVICE_NAME) == health_pb2.HealthCheckResponse.NOT_SERVING
+    server.initialize(bmi_pb2.InitializeRequest(), Mock(grpc.ServicerContext))
+    assert health_of(health_servicer, BMI_SERVICE_NAME) == health_pb2.HealthCheckResponse.SERVING
+    server.finalize(bmi_pb2.Empty(), Mock(grpc.ServicerContext))
+    assert health_of(health_servicer, BMI_SERVICE_NAME) == health_pb2.HealthCheckResponse.NOT_SERVING
+
+
+def test_track_health_of_server_without_state():
+    health_servicer = health.HealthServicer()
+
+    track_health(object(), health_servicer.set)
+
+    assert health_of(health_servicer, BMI_SERVICE_NAME) == health_pb2.HealthCheckResponse.SERVING
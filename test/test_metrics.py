@@ -0,0 +1,154 @@
+import urllib.request
+from concurrent import futures
+
+import grpc
+import numpy as np
+import pytest
+
+from grpc4bmi import bmi_pb2_grpc
+from grpc4bmi.bmi_grpc_client import BmiClient
+from grpc4bmi.bmi_grpc_server import BmiServer
+from grpc4bmi.metrics import AioMetricsInterceptor, MetricsInterceptor, ServerMetrics, TimedModel, _Timer, \
+    _model_seconds, start_http_server
+from grpc4bmi.run_server import build_parser, server_metrics
+from test.fake_models import StepModel
+
+
+def sample(text, name, method):
+    for line in text.splitlines():
+        if line.startswith(f'{name}{{method="/bmi.BmiService/{method}"'):
+            return float(line.split(' ')[-1])
+    raise KeyError(f'{name} of {method} not found')
+
+
+class TestServerMetrics:
+    def test_to_prometheus_empty(self):
+        text = ServerMetrics().to_prometheus()
+
+        assert '# TYPE grpc4bmi_server_calls_total counter' in text
+        assert '# TYPE grpc4bmi_server_latency_seconds histogram' in text
+
+    def test_to_prometheus(self):
+        metrics = ServerMetrics()
+        metrics.observe_call('/bmi.BmiService/update', 0.003, 0.002)
+        metrics.observe_call('/bmi.BmiService/update', 0.2, 0.1, failed=True)
+        metrics.observe_request('/bmi.BmiService/update', 10, 0.001)
+        metrics.observe_response('/bmi.BmiService/update', 20, 0.001)
+
+        text = metrics.to_prometheus()
+
+        assert sample(text, 'grpc4bmi_server_calls_total', 'update') == 2
+        assert sample(text, 'grpc4bmi_server_errors_total', 'update') == 1
+        assert 'grpc4bmi_server_latency_seconds_bucket{method="/bmi.BmiService/update",le="0.005"} 1' in text
+        assert 'grpc4bmi_server_latency_seconds_bucket{method="/bmi.BmiService/update",le="+Inf"} 2' in text
+        assert sample(text, 'grpc4bmi_server_latency_seconds_count', 'update') == 2
+        assert sample(text, 'grpc4bmi_server_model_seconds_total', 'update') == pytest.approx(0.102)
+        assert sample(text, 'grpc4bmi_server_serialization_seconds_total', 'update') == pytest.approx(0.002)
+        assert sample(text, 'grpc4bmi_server_request_bytes_total', 'update') == 10
+        assert sample(text, 'grpc4bmi_server_response_bytes_total', 'update') == 20
+
+
+class TestTimedModel:
+    def test_outside_call(self):
+        model = TimedModel(StepModel())
+
+        assert model.get_component_name() == 'step'
+
+    def test_inside_call(self):
+        model = TimedModel(StepModel())
+        timer = _Timer()
+        token = _model_seconds.set(timer)
+        try:
+            model.update()
+        finally:
+            _model_seconds.reset(token)
+
+        assert timer.seconds > 0
+
+
+@pytest.fixture
+def metrics_client():
+    metrics = ServerMetrics()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10), interceptors=[MetricsInterceptor(metrics)])
+    bmi_pb2_grpc.add_BmiServiceServicer_to_server(BmiServer(StepModel(), metrics=metrics), server)
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+    yield BmiClient(BmiClient.create_grpc_channel(port), timeout=5), metrics
+    server.stop(0)
+
+
+class TestMetricsInterceptor:
+    def test_records_calls(self, metrics_client):
+        client, metrics = metrics_client
+        client.initialize(None)
+        client.update()
+        client.update()
+
+        text = client.get_metrics()
+
+        assert sample(text, 'grpc4bmi_server_calls_total', 'update') == 2
+        assert sample(text, 'grpc4bmi_server_errors_total', 'update') == 0
+        assert sample(text, 'grpc4bmi_server_model_seconds_total', 'update') > 0
+
+    def test_records_bytes(self, metrics_client):
+        client, metrics = metrics_client
+        client.initialize(None)
+
+        client.get_value('plate_surface__temperature', np.empty(12))
+
+        text = metrics.to_prometheus()
+        assert sample(text, 'grpc4bmi_server_request_bytes_total', 'getValue') > len('plate_surface__temperature')
+        assert sample(text, 'grpc4bmi_server_response_bytes_total', 'getValue') > 12 * 8
+
+    def test_records_errors(self, metrics_client):
+        client, metrics = metrics_client
+
+        with pytest.raises(grpc.RpcError):
+            client.set_value('unknown', np.ones(3))
+
+        text = metrics.to_prometheus()
+        assert sample(text, 'grpc4bmi_server_errors_total', 'setValue') == 1
+
+
+def test_get_metrics_without_metrics(serve_model):
+    client = serve_model(StepModel())
+
+    with pytest.raises(grpc.RpcError, match='Metrics are not recorded by this server'):
+        client.get_metrics()
+
+
+def test_start_http_server():
+    metrics = ServerMetrics()
+    metrics.observe_call('/bmi.BmiService/update', 0.003, 0.002)
+    server = start_http_server(metrics, 0, 'localhost')
+    try:
+        url = f'http://localhost:{server.server_address[1]}/metrics'
+        with urllib.request.urlopen(url) as response:
+            text = response.read().decode('utf8')
+    finally:
+        server.shutdown()
+
+    assert sample(text, 'grpc4bmi_server_calls_total', 'update') == 1
+
+
+def test_aio_server_records_model_time(serve_aio_model):
+    metrics = ServerMetrics()
+    client = serve_aio_model(StepModel(), interceptors=[AioMetricsInterceptor(metrics)], metrics=metrics)
+
+    client.initialize(None)
+    client.update()
+    text = client.get_metrics()
+
+    assert sample(text, 'grpc4bmi_server_calls_total', 'update') == 1
+    assert sample(text, 'grpc4bmi_server_model_seconds_total', 'update') > 0
+
+
+@pytest.mark.parametrize('argv,enabled', [
+    ([], False),
+    (['--metrics'], True),
+    (['--metrics-port', '9090'], True),
+])
+def test_metrics_options(argv, enabled):
+    args = build_parser().parse_args(['--name', 'mypackage.MyModel'] + argv)
+
+    assert (server_metrics(args) is not None) == enabled
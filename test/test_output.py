@@ -0,0 +1,178 @@
+import json
+import shutil
+
+import grpc
+import numpy as np
+import pytest
+
+from grpc4bmi.output import OutputRecorder, OutputWriter, read_array
+from test.fake_models import StepModel
+
+VAR = 'plate_surface__temperature'
+
+
+class UnstructuredStepModel(StepModel):
+    def get_grid_type(self, grid):
+        return 'unstructured'
+
+
+def run(model, steps=5):
+    model.initialize(None)
+    for _ in range(steps):
+        model.update()
+    model.finalize()
+
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+class TestOutputRecorder:
+    def test_values(self, tmp_path):
+        store = str(tmp_path / 'output.zarr')
+
+        run(OutputRecorder(StepModel(), store, chunk_size=2))
+
+        values = read_array(store, VAR)
+        assert values.shape == (5, 3, 4)
+        for step in range(5):
+            np.testing.assert_array_equal(values[step], np.arange(12).reshape(3, 4) + step + 1)
+        np.testing.assert_array_equal(read_array(store, 'time'), [1, 2, 3, 4, 5])
+
+    def test_zarr_metadata(self, tmp_path):
+        store = tmp_path / 'output.zarr'
+
+        run(OutputRecorder(StepModel(), str(store), chunk_size=2))
+
+        assert read_json(store / '.zgroup') == {'zarr_format': 2}
+        metadata = read_json(store / VAR / '.zarray')
+        assert metadata['shape'] == [5, 3, 4]
+        assert metadata['chunks'] == [2, 3, 4]
+        assert metadata['dtype'] == '<f8'
+        assert sorted(p.name for p in (store / VAR).iterdir()) == ['.zarray', '.zattrs', '0.0.0', '1.0.0', '2.0.0']
+        assert read_json(store / VAR / '.zattrs') == {'units': 'K', '_ARRAY_DIMENSIONS': ['time', 'y_0', 'x_0']}
+
+    def test_coordinates(self, tmp_path):
+        store = str(tmp_path / 'output.zarr')
+
+        run(OutputRecorder(StepModel(), store))
+
+        np.testing.assert_array_equal(read_array(store, 'y_0'), [0, 1, 2])
+        np.testing.assert_array_equal(read_array(store, 'x_0'), [0, 2, 4, 6])
+
+    def test_unstructured(self, tmp_path):
+        store = str(tmp_path / 'output.zarr')
+
+        run(OutputRecorder(UnstructuredStepModel(), store))
+
+        assert read_array(store, VAR).shape == (5, 12)
+        assert read_json(f'{store}/{VAR}/.zattrs')['_ARRAY_DIMENSIONS'] == ['time', 'node_0']
+
+    def test_interval(self, tmp_path):
+        store = str(tmp_path / 'output.zarr')
+
+        run(OutputRecorder(StepModel(), store, interval=2))
+
+        np.testing.assert_array_equal(read_array(store, 'time'), [2, 4])
+
+    def test_update_until(self, tmp_path):
+        store = str(tmp_path / 'output.zarr')
+        model = OutputRecorder(StepModel(), store)
+        model.initialize(None)
+
+        model.update_until(3.0)
+        model.close()
+
+        np.testing.assert_array_equal(read_array(store, 'time'), [3])
+
+    def test_passes_other_calls(self, tmp_path):
+        model = OutputRecorder(StepModel(), str(tmp_path / 'output.zarr'))
+
+        assert model.get_component_name() == 'step'
+
+
+class TestOutputWriter:
+    def test_unknown_variable(self, tmp_path):
+        model = StepModel()
+        model.get_var_grid = lambda name: 1 / 0
+
+        with pytest.raises(ZeroDivisionError):
+            OutputWriter(model, str(tmp_path / 'output.zarr'), names=['unknown'])
+
+    def test_invalid_interval(self, tmp_path):
+        with pytest.raises(ValueError, match='Interval'):
+            OutputWriter(StepModel(), str(tmp_path / 'output.zarr'), interval=0)
+
+    def test_write_error(self, tmp_path):
+        store = tmp_path / 'output.zarr'
+        writer = OutputWriter(StepModel(), str(store), chunk_size=1)
+        shutil.rmtree(store)
+
+        writer.record()
+
+        with pytest.raises(IOError, match='Writing output'):
+            writer.close()
+
+
+class TestServerRecording:
+    def test_record(self, tmp_path, serve_model):
+        store = str(tmp_path / 'output.zarr')
+        client = serve_model(StepModel(), work_dir=str(tmp_path))
+        client.initialize(None)
+
+        client.start_recording('output.zarr', names=[VAR], chunk_size=2)
+        for _ in range(3):
+            client.update()
+        client.update_until(5.0)
+
+        assert client.stop_recording() == 4
+        np.testing.assert_array_equal(read_array(store, 'time'), [1, 2, 3, 5])
+        np.testing.assert_array_equal(read_array(store, VAR)[-1], np.arange(12).reshape(3, 4) + 5)
+
+    def test_interval(self, tmp_path, serve_model):
+        store = str(tmp_path / 'output.zarr')
+        client = serve_model(StepModel(), work_dir=str(tmp_path))
+        client.initialize(None)
+
+        client.start_recording('output.zarr', interval=3)
+        for _ in range(6):
+            client.update()
+        client.stop_recording()
+
+        np.testing.assert_array_equal(read_array(store, 'time'), [3, 6])
+
+    def test_finalize_stops_recording(self, tmp_path, serve_model):
+        store = str(tmp_path / 'output.zarr')
+        client = serve_model(StepModel(), work_dir=str(tmp_path))
+        client.initialize(None)
+        client.start_recording('output.zarr')
+        client.update()
+
+        client.finalize()
+
+        assert read_array(store, VAR).shape == (1, 3, 4)
+        assert client.stop_recording() == 0
+
+    def test_already_recording(self, tmp_path, serve_model):
+        client = serve_model(StepModel(), work_dir=str(tmp_path))
+        client.initialize(None)
+        client.start_recording('output.zarr')
+
+        with pytest.raises(grpc.RpcError, match='Already recording'):
+            client.start_recording('other.zarr')
+
+    @pytest.mark.parametrize('path,message', [
+        ('/tmp/output.zarr', 'should be relative'),
+        ('../output.zarr', 'outside the work directory'),
+    ])
+    def test_path_outside_work_dir(self, tmp_path, serve_model, path, message):
+        work_dir = tmp_path / 'work'
+        work_dir.mkdir()
+        client = serve_model(StepModel(), work_dir=str(work_dir))
+        client.initialize(None)
+
+        with pytest.raises(grpc.RpcError, match=message):
+            client.start_recording(path)
+
+        assert list(tmp_path.iterdir()) == [work_dir]
@@ -0,0 +1,123 @@
+import time
+from concurrent import futures
+
+import grpc
+import numpy as np
+import pytest
+
+from grpc4bmi import bmi_pb2
+from grpc4bmi.bmi_grpc_client import BmiClient
+from grpc4bmi.peers import Peers, push_value
+from test.fake_models import StepModel
+
+VAR = 'plate_surface__temperature'
+
+
+@pytest.fixture
+def serve_address(serve_port):
+    """Factory which serves a BMI model and returns its address"""
+    return lambda model: f'localhost:{serve_port(model)}'
+
+
+class TestPushValue:
+    def test_whole(self):
+        source, target = StepModel(), StepModel()
+        source.update()
+
+        count = push_value(source, VAR, target)
+
+        assert count == 12
+        np.testing.assert_array_equal(target.get_value(VAR, np.empty(12)), np.arange(12) + 1)
+
+    def test_indices(self):
+        source, target = StepModel(), StepModel()
+        source.update()
+
+        push_value(source, VAR, target, src_indices=np.array([0, 1]), dest_indices=np.array([10, 11]))
+
+        np.testing.assert_array_equal(target.get_value(VAR, np.empty(12))[9:], [9, 1, 2])
+
+    def test_indices_of_other_length(self):
+        with pytest.raises(ValueError, match='Got 1 destination indices for 12 values'):
+            push_value(StepModel(), VAR, StepModel(), dest_indices=np.array([1]))
+
+
+class TestPeers:
+    def test_reuses_client(self, serve_address):
+        address = serve_address(StepModel())
+        peers = Peers()
+
+        assert peers.client(address) is peers.client(address)
+        peers.close()
+
+    def test_slow_peer_does_not_block_others(self, serve_address):
+        address = serve_address(StepModel())
+        peers = Peers(timeout=1.0)
+        with futures.ThreadPoolExecutor(max_workers=1) as executor:
+            slow = executor.submit(peers.client, 'localhost:1')
+            time.sleep(0.1)
+
+            start = time.monotonic()
+            peers.client(address)
+
+            assert time.monotonic() - start < 0.5
+            with pytest.raises(ConnectionError):
+                slow.result(5)
+        peers.close()
+
+    def test_is_self(self, serve_port):
+        port = serve_port(StepModel())
+        client = BmiClient(BmiClient.create_grpc_channel(port), timeout=5)
+        server_id = client.stub.getStatus(bmi_pb2.Empty()).server_id
+
+        assert Peers(server_id=server_id).is_self(f'localhost:{port}')
+        assert not Peers(server_id='other').is_self(f'localhost:{port}')
+        assert not Peers().is_self(f'localhost:{port}')
+
+    def test_unreachable(self):
+        peers = Peers(timeout=0.1)
+
+        with pytest.raises(ConnectionError, match='Unable to connect'):
+            peers.client('localhost:1')
+
+
+class TestServer:
+    @pytest.fixture
+    def target(self):
+        return StepModel()
+
+    @pytest.fixture
+    def client(self, serve_model):
+        client = serve_model(StepModel())
+        client.initialize(None)
+        client.update()
+        return client
+
+    def test_push(self, client, target, serve_address):
+        address = serve_address(target)
+
+        client.push_value(VAR, address)
+
+        np.testing.assert_array_equal(target.get_value(VAR, np.empty(12)), np.arange(12) + 1)
+
+    def test_push_indices(self, client, target, serve_address):
+        address = serve_address(target)
+
+        client.push_value(VAR, address, VAR, src_indices=[11], dest_indices=[0])
+
+        np.testing.assert_array_equal(target.get_value(VAR, np.empty(12))[:2], [12, 1])
+
+    def test_error_of_peer(self, client, serve_address):
+        address = serve_address(StepModel())
+
+        with pytest.raises(grpc.RpcError, match='destination indices'):
+            client.push_value(VAR, address, dest_indices=[0])
+
+    def test_push_to_self_on_aio_server(self, serve_aio_port):
+        port = serve_aio_port(StepModel())
+        client = BmiClient(BmiClient.create_grpc_channel(port), timeout=5)
+        client.update()
+
+        client.push_value(VAR, f'localhost:{port}', VAR, src_indices=[11], dest_indices=[0])
+
+        np.testing.assert_array_equal(client.get_value(VAR, np.empty(12))[:2], [12, 2])
@@ -0,0 +1,132 @@
+import numpy as np
+
+from grpc4bmi.pipeline import OutputSnapshots
+from test.fake_models import BlockingStepModel, StepModel
+
+VAR = 'plate_surface__temperature'
+
+
+def encode(values):
+    return values.copy()
+
+
+class TestOutputSnapshots:
+    def test_without_snapshot(self):
+        snapshots = OutputSnapshots(StepModel(), encode)
+
+        assert snapshots.response(VAR) is None
+        assert snapshots.values_at_indices(VAR, np.array([0])) is None
+
+    def test_response_of_last_snapshot(self):
+        model = StepModel()
+        snapshots = OutputSnapshots(model, encode)
+        snapshots.take()
+
+        model.update()
+
+        np.testing.assert_array_equal(snapshots.response(VAR), np.arange(12))
+
+    def test_take_again(self):
+        model = StepModel()
+        snapshots = OutputSnapshots(model, encode)
+        snapshots.take()
+        snapshots.response(VAR)
+
+        model.update()
+        snapshots.take()
+
+        np.testing.assert_array_equal(snapshots.response(VAR), np.arange(12) + 1)
+
+    def test_values_at_indices(self):
+        snapshots = OutputSnapshots(StepModel(), encode)
+        snapshots.take()
+
+        np.testing.assert_array_equal(snapshots.values_at_indices(VAR, np.array([1, 5])), [1.0, 5.0])
+
+    def test_invalidate(self):
+        snapshots = OutputSnapshots(StepModel(), encode)
+        snapshots.take()
+
+        snapshots.invalidate(VAR)
+
+        assert snapshots.response(VAR) is None
+
+    def test_buffers_are_reused(self):
+        snapshots = OutputSnapshots(StepModel(), encode)
+        snapshots.take()
+        snapshots.take()
+        buffers = list(snapshots.buffers[VAR])
+
+        snapshots.take()
+        snapshots.take()
+
+        assert snapshots.buffers[VAR][0] is buffers[0]
+        assert snapshots.buffers[VAR][1] is buffers[1]
+
+    def test_buffer_being_read_is_not_overwritten(self):
+        model = StepModel()
+        snapshots = OutputSnapshots(model, encode)
+        snapshots.take()
+        snapshots.take()
+        index, buffer = snapshots._acquire(VAR)
+
+        model.update()
+        snapshots.take()
+        model.update()
+        snapshots.take()
+
+        np.testing.assert_array_equal(buffer, np.arange(12))
+        snapshots._release(VAR, index)
+        np.testing.assert_array_equal(snapshots.response(VAR), np.arange(12) + 2)
+
+
+class TestPipelinedServer:
+    def test_get_value_after_update(self, serve_model):
+        client = serve_model(StepModel(), pipeline=True)
+        client.initialize(None)
+
+        client.update()
+
+        np.testing.assert_array_equal(client.get_value(VAR, np.empty(12)), np.arange(12) + 1)
+        np.testing.assert_array_equal(client.get_value_at_indices(VAR, np.empty(2), np.array([0, 11])),
+                                      [1.0, 12.0])
+
+    def test_set_value_invalidates_snapshot(self, serve_model):
+        client = serve_model(StepModel(), pipeline=True)
+        client.initialize(None)
+
+        client.set_value(VAR, np.full(12, 42.0))
+
+        np.testing.assert_array_equal(client.get_value(VAR, np.empty(12)), np.full(12, 42.0))
+
+    def test_get_value_while_updating(self, serve_model):
+        model = BlockingStepModel()
+        client = serve_model(model, pipeline=True)
+        model.release.set()
+        client.initialize(None)
+        client.update()
+        model.release.clear()
+
+        step = client.update_async()
+        assert model.started.wait(5)
+        values = client.get_value(VAR, np.empty(12))
+        assert not step.done()
+        model.release.set()
+        step.result(5)
+
+        np.testing.assert_array_equal(values, np.arange(12) + 1)
+        np.testing.assert_array_equal(client.get_value(VAR, np.empty(12)), np.arange(12) + 2)
+
+
+def test_aio_server_encodes_off_model_thread(serve_aio_model):
+    model = BlockingStepModel()
+    client = serve_aio_model(model, pipeline=True)
+    client.initialize(None)
+
+    step = client.update_async()
+    assert model.started.wait(5)
+    values = client.get_value(VAR, np.empty(12))
+    model.release.set()
+    step.result(5)
+
+    np.testing.assert_array_equal(values, np.arange(12))
@@ -0,0 +1,72 @@
+import threading
+
+import pytest
+
+from grpc4bmi.pool import ClientPool
+from test.fake_models import StepModel, SomeException
+
+
+class CountingFactory(object):
+    def __init__(self, fail=False):
+        self.started = 0
+        self.fail = fail
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.started += 1
+        if self.fail:
+            raise SomeException('unable to start')
+        return StepModel()
+
+
+def test_acquire():
+    factory = CountingFactory()
+    with ClientPool(factory, size=2) as pool:
+        client = pool.acquire(timeout=5)
+
+        assert isinstance(client, StepModel)
+
+
+def test_acquire_replenishes():
+    factory = CountingFactory()
+    with ClientPool(factory, size=2) as pool:
+        first = pool.acquire(timeout=5)
+        second = pool.acquire(timeout=5)
+        third = pool.acquire(timeout=5)
+
+    assert len({id(first), id(second), id(third)}) == 3
+    assert factory.started == 5
+
+
+def test_acquire_failed_start():
+    with ClientPool(CountingFactory(fail=True), size=1) as pool:
+        with pytest.raises(SomeException, match='unable to start'):
+            pool.acquire(timeout=5)
+
+
+def test_acquire_timeout():
+    release = threading.Event()
+
+    def slow_factory():
+        release.wait(5)
+        return StepModel()
+
+    with ClientPool(slow_factory, size=1) as pool:
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.1)
+        release.set()
+
+
+def test_acquire_from_closed_pool():
+    pool = ClientPool(CountingFactory(), size=1)
+    pool.close()
+
+    with pytest.raises(ValueError, match='closed pool'):
+        pool.acquire()
+    assert pool.ready == 0
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError, match='at least 1'):
+        ClientPool(CountingFactory(), size=0)
@@ -0,0 +1,73 @@
+import cProfile
+import os
+import pstats
+
+import grpc
+import pytest
+
+from grpc4bmi.profiling import ProfiledModel, collapsed_stacks
+from test.fake_models import StepModel
+
+
+def busy(n):
+    return sum(i * i for i in range(n))
+
+
+def outer():
+    return busy(20000) + busy(10000)
+
+
+class TestCollapsedStacks:
+    def test_stacks(self):
+        profile = cProfile.Profile()
+        profile.enable()
+        outer()
+        profile.disable()
+
+        stacks = collapsed_stacks(pstats.Stats(profile))
+
+        busy_stacks = [stack for stack in stacks if stack.split(';')[-1].startswith('<genexpr>')]
+        assert len(busy_stacks) == 1
+        assert 'outer (test_profiling.py' in busy_stacks[0]
+        assert 'busy (test_profiling.py' in busy_stacks[0]
+        assert all(microseconds > 0 for microseconds in stacks.values())
+
+
+class TestProfiledModel:
+    def test_dump(self, tmp_path):
+        model = ProfiledModel(StepModel(), str(tmp_path))
+        model.update()
+        model.get_current_time()
+
+        files = model.dump()
+
+        assert sorted(os.path.basename(f) for f in files) == [
+            'get_current_time.collapsed', 'get_current_time.prof', 'update.collapsed', 'update.prof',
+        ]
+        stats = pstats.Stats(str(tmp_path / 'update.prof'))
+        assert any(name == 'update' for _, _, name in stats.stats)
+        assert 'update (fake_models.py' in (tmp_path / 'update.collapsed').read_text()
+
+    def test_non_callable_passthrough(self, tmp_path):
+        model = ProfiledModel(StepModel(), str(tmp_path))
+
+        assert model.time == 0.0
+
+
+class TestDumpProfile:
+    def test_dump_profile(self, tmp_path, serve_model):
+        profile_dir = tmp_path / 'profiles'
+        client = serve_model(StepModel(), profile_dir=str(profile_dir))
+        client.initialize(None)
+        client.update()
+
+        files = client.dump_profile()
+
+        assert str(profile_dir / 'update.prof') in files
+        assert (profile_dir / 'update.collapsed').exists()
+
+    def test_not_profiled(self, serve_model):
+        client = serve_model(StepModel())
+
+        with pytest.raises(grpc.RpcError, match='Model is not profiled by this server'):
+            client.dump_profile()
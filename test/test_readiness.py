@@ -0,0 +1,105 @@
+import os
+import threading
+import time
+from concurrent import futures
+
+import grpc
+import pytest
+
+from grpc4bmi import bmi_pb2_grpc
+from grpc4bmi.bmi_client_subproc import BmiClientSubProcess
+from grpc4bmi.bmi_grpc_client import BmiClient, READINESS_CHANNEL_OPTIONS, wait_until_ready
+from grpc4bmi.bmi_grpc_server import BmiServer
+from grpc4bmi.exceptions import DeadContainerException
+from test.fake_models import FailingModel, SomeException, StepModel
+
+
+def start_server(model, port):
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    bmi_pb2_grpc.add_BmiServiceServicer_to_server(BmiServer(model), server)
+    server.add_insecure_port(f'localhost:{port}')
+    server.start()
+    return server
+
+
+def test_ready():
+    port = BmiClient.get_unique_port('localhost')
+    server = start_server(StepModel(), port)
+    try:
+        wait_until_ready(BmiClient.create_grpc_channel(port), timeout=5)
+    finally:
+        server.stop(0)
+
+
+def test_ready_when_model_raises():
+    port = BmiClient.get_unique_port('localhost')
+    server = start_server(FailingModel(SomeException('not initialized')), port)
+    try:
+        wait_until_ready(BmiClient.create_grpc_channel(port), timeout=5)
+    finally:
+        server.stop(0)
+
+
+def test_server_starts_late():
+    port = BmiClient.get_unique_port('localhost')
+    servers = []
+    timer = threading.Timer(0.3, lambda: servers.append(start_server(StepModel(), port)))
+    timer.start()
+    try:
+        start = time.monotonic()
+        wait_until_ready(BmiClient.create_grpc_channel(port, options=READINESS_CHANNEL_OPTIONS), timeout=10)
+
+        assert time.monotonic() - start < 5
+    finally:
+        timer.join()
+        for server in servers:
+            server.stop(0)
+
+
+def test_not_ready_within_timeout():
+    port = BmiClient.get_unique_port('localhost')
+    channel = BmiClient.create_grpc_channel(port, options=READINESS_CHANNEL_OPTIONS)
+
+    with pytest.raises(grpc.FutureTimeoutError):
+        wait_until_ready(channel, timeout=0.2)
+
+
+def test_single_ready_future(monkeypatch):
+    port = BmiClient.get_unique_port('localhost')
+    channel = BmiClient.create_grpc_channel(port, options=READINESS_CHANNEL_OPTIONS)
+    ready_futures = []
+    channel_ready_future = grpc.channel_ready_future
+
+    def recorded_channel_ready_future(channel):
+        ready_futures.append(channel_ready_future(channel))
+        return ready_futures[-1]
+    monkeypatch.setattr(grpc, 'channel_ready_future', recorded_channel_ready_future)
+
+    with pytest.raises(grpc.FutureTimeoutError):
+        wait_until_ready(channel, timeout=0.2)
+
+    assert len(ready_futures) == 1
+    assert ready_futures[0].cancelled()
+
+
+def test_dead_server():
+    port = BmiClient.get_unique_port('localhost')
+
+    def is_alive():
+        raise DeadContainerException('server died', 1, 'some logs')
+
+    with pytest.raises(DeadContainerException, match='server died'):
+        wait_until_ready(BmiClient.create_grpc_channel(port), timeout=5, is_alive=is_alive)
+
+
+def test_subprocess():
+    path = os.path.dirname(os.path.abspath(__file__))
+    client = BmiClientSubProcess('fake_models.StepModel', path=path, timeout=30)
+
+    assert client.get_component_name() == 'step'
+    del client
+
+
+def test_subprocess_dies():
+    with pytest.raises(DeadContainerException, match='prematurely exited'):
+        BmiClientSubProcess('somepackage.DoesNotExist', timeout=30)
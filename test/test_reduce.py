@@ -0,0 +1,107 @@
+import grpc
+import numpy as np
+import pytest
+
+from grpc4bmi.reduce import Zones, reduce_values
+from test.fake_models import StepModel
+
+VAR = 'plate_surface__temperature'
+
+
+class TestReduceValues:
+    def test_whole(self):
+        values = np.arange(1, 11, dtype=np.float64)
+
+        result = reduce_values(values, ['mean', 'sum', 'min', 'max', 'count', 'median', 'p90', 'std'])
+
+        np.testing.assert_allclose(result, [[5.5, 55, 1, 10, 10, 5.5, 9.1, np.std(values)]])
+
+    def test_ignores_nan(self):
+        values = np.array([1.0, np.nan, 3.0])
+
+        result = reduce_values(values, ['mean', 'count', 'min', 'p50'])
+
+        np.testing.assert_allclose(result, [[2.0, 2, 1.0, 2.0]])
+
+    def test_integers(self):
+        result = reduce_values(np.array([1, 2, 3], dtype=np.int32), ['sum'])
+
+        np.testing.assert_array_equal(result, [[6]])
+
+    def test_zones(self):
+        values = np.array([1.0, 2.0, 3.0, 4.0, 5.0, np.nan])
+        zones = Zones(np.array([2, 1, 2, 0, 1, 1]))
+
+        result = reduce_values(values, ['mean', 'max', 'count', 'p50'], zones)
+
+        np.testing.assert_array_equal(zones.ids, [1, 2])
+        np.testing.assert_allclose(result, [[3.5, 5.0, 2, 3.5], [2.0, 3.0, 2, 2.0]])
+
+    def test_zone_with_only_nan(self):
+        zones = Zones(np.array([1, 2]))
+
+        result = reduce_values(np.array([1.0, np.nan]), ['mean', 'min', 'std', 'p50', 'count'], zones)
+
+        np.testing.assert_array_equal(result[1], [np.nan, np.nan, np.nan, np.nan, 0])
+
+    def test_mask(self):
+        zones = Zones(np.array([True, False, True]))
+
+        result = reduce_values(np.array([1.0, 10.0, 3.0]), ['sum'], zones)
+
+        np.testing.assert_array_equal(zones.ids, [1])
+        np.testing.assert_array_equal(result, [[4.0]])
+
+    def test_empty(self):
+        result = reduce_values(np.array([]), ['mean', 'count'])
+
+        np.testing.assert_array_equal(result, [[np.nan, 0]])
+
+    def test_zones_of_other_size(self):
+        with pytest.raises(ValueError, match='Zones are for 2 values'):
+            reduce_values(np.ones(3), ['mean'], Zones(np.ones(2)))
+
+    @pytest.mark.parametrize('operation', ['average', 'p', 'p101', 'pmax'])
+    def test_unknown_operation(self, operation):
+        with pytest.raises(ValueError, match='Unknown reduction'):
+            reduce_values(np.ones(3), [operation])
+
+
+class TestServer:
+    @pytest.fixture
+    def client(self, serve_model):
+        client = serve_model(StepModel())
+        client.initialize(None)
+        return client
+
+    def test_whole(self, client):
+        assert client.reduce_value(VAR, ['mean', 'max']) == {'mean': 5.5, 'max': 11.0}
+
+    def test_default_mean(self, client):
+        client.update()
+
+        assert client.reduce_value(VAR) == {'mean': 6.5}
+
+    def test_indices(self, client):
+        assert client.reduce_value(VAR, ['sum'], indices=np.array([1, 2, 3])) == {'sum': 6.0}
+
+    def test_zones(self, client):
+        client.set_zones('halves', np.repeat([1, 2], 6))
+
+        result = client.reduce_value(VAR, ['min', 'max'], zones='halves')
+
+        assert result == {1: {'min': 0.0, 'max': 5.0}, 2: {'min': 6.0, 'max': 11.0}}
+
+    def test_unknown_zones(self, client):
+        with pytest.raises(grpc.RpcError, match='Unknown zones'):
+            client.reduce_value(VAR, zones='nowhere')
+
+    def test_indices_and_zones(self, client):
+        client.set_zones('all', np.ones(12))
+
+        with pytest.raises(grpc.RpcError, match='not both'):
+            client.reduce_value(VAR, indices=np.array([1]), zones='all')
+
+    def test_unknown_operation(self, client):
+        with pytest.raises(grpc.RpcError, match='Unknown reduction'):
+            client.reduce_value(VAR, ['average'])
@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+
+from grpc4bmi.replay import RecordingModel, ReplayModel, read_records, MAGIC
+from grpc4bmi.reserve import reserve_values
+from grpc4bmi.run_server import build_parser
+from test.fake_models import NewArrayStepModel, StepModel
+
+VAR = 'plate_surface__temperature'
+
+
+@pytest.fixture
+def recording(tmp_path):
+    path = str(tmp_path / 'step.bmirec')
+    with RecordingModel(StepModel(), path) as model:
+        model.initialize(None)
+        for _ in range(2):
+            model.update()
+            model.get_value(VAR, reserve_values(model, VAR))
+        model.get_value_at_indices(VAR, np.empty(2), np.array([1, 3]))
+        with pytest.raises(ValueError):
+            model.set_value(VAR, np.ones(5))
+    return path
+
+
+class TestRecordingModel:
+    def test_records(self, recording):
+        records = list(read_records(recording))
+
+        methods = [r.method for r in records]
+        assert methods[:6] == ['initialize', 'update', 'get_var_type', 'get_var_itemsize', 'get_var_nbytes',
+                               'get_value']
+        assert records[0].args == [None]
+        np.testing.assert_array_equal(records[5].result, np.arange(12) + 1)
+        assert records[5].seconds >= 0
+        assert records[-1].error.startswith('ValueError')
+
+    def test_records_returned_array(self, tmp_path):
+        path = str(tmp_path / 'step.bmirec')
+        with RecordingModel(NewArrayStepModel(), path) as model:
+            model.get_value(VAR, np.zeros(12))
+
+        replayed = ReplayModel(path).get_value(VAR, np.zeros(12))
+
+        np.testing.assert_array_equal(replayed, np.arange(12))
+
+    def test_file_starts_with_magic(self, recording):
+        with open(recording, 'rb') as f:
+            assert f.read(len(MAGIC)) == MAGIC
+
+    def test_passes_other_attributes(self, tmp_path):
+        model = StepModel()
+        recorder = RecordingModel(model, str(tmp_path / 'step.bmirec'))
+
+        assert recorder.value is model.value
+        recorder.close()
+
+
+class TestReplayModel:
+    def test_values_in_order(self, recording):
+        model = ReplayModel(recording)
+        model.initialize(None)
+
+        values = []
+        for _ in range(2):
+            model.update()
+            values.append(model.get_value(VAR, np.empty(12)).copy())
+
+        np.testing.assert_array_equal(values[0], np.arange(12) + 1)
+        np.testing.assert_array_equal(values[1], np.arange(12) + 2)
+
+    def test_last_call_is_repeated(self, recording):
+        model = ReplayModel(recording)
+
+        model.get_var_type(VAR)
+
+        assert model.get_var_type(VAR) == 'float64'
+
+    def test_indices_of_other_type(self, recording):
+        model = ReplayModel(recording)
+
+        result = model.get_value_at_indices(VAR, np.empty(2), np.array([1, 3], dtype=np.int32))
+
+        np.testing.assert_array_equal(result, [3, 5])
+
+    def test_unrecorded_call(self, recording):
+        model = ReplayModel(recording)
+
+        with pytest.raises(LookupError, match='get_current_time'):
+            model.get_current_time()
+
+    def test_recorded_error(self, recording):
+        model = ReplayModel(recording)
+
+        with pytest.raises(RuntimeError, match='ValueError'):
+            model.set_value(VAR, np.ones(12))
+
+    def test_var_info_derived_from_values(self, tmp_path):
+        path = str(tmp_path / 'values.bmirec')
+        with RecordingModel(StepModel(), path) as recorder:
+            recorder.get_value(VAR, np.empty(12))
+        model = ReplayModel(path)
+
+        assert reserve_values(model, VAR).shape == (12,)
+
+    def test_latency(self, tmp_path, monkeypatch):
+        path = str(tmp_path / 'update.bmirec')
+        with RecordingModel(StepModel(), path) as recorder:
+            recorder.update()
+        sleeps = []
+        monkeypatch.setattr('grpc4bmi.replay.time.sleep', sleeps.append)
+
+        ReplayModel(path, latency=True).update()
+
+        assert len(sleeps) == 1
+
+    def test_served(self, recording, serve_model):
+        client = serve_model(ReplayModel(recording))
+
+        client.initialize(None)
+        client.update()
+        result = client.get_value(VAR, np.empty(12))
+
+        np.testing.assert_array_equal(result, np.arange(12) + 1)
+
+
+def test_run_server_replay_options():
+    args = build_parser().parse_args(['--replay', 'step.bmirec', '--replay-latency'])
+
+    assert args.replay == 'step.bmirec'
+    assert args.replay_latency
@@ -0,0 +1,221 @@
+import grpc
+import numpy as np
+import pytest
+
+from grpc4bmi.subset import RegionCache, axis_coordinates, coarsen, coarsen_grid, region_indices
+from test.fake_models import HugeStepModel, Rect3DGridModel, StepModel, Structured2DQuadrilateralsGridModel, \
+    UnstructuredGridBmiModel
+
+VAR = 'plate_surface__temperature'
+
+
+class TestAxisCoordinates:
+    def test_uniform_rectilinear(self):
+        axes = axis_coordinates(StepModel(), 0)
+
+        np.testing.assert_array_equal(axes[0], [0, 1, 2])
+        np.testing.assert_array_equal(axes[1], [0, 2, 4, 6])
+
+    def test_rectilinear(self):
+        axes = axis_coordinates(Rect3DGridModel(), 0)
+
+        np.testing.assert_array_equal(axes[0], [2.1, 2.2])
+        np.testing.assert_array_equal(axes[2], [0.1, 0.2, 0.3, 0.4])
+
+    def test_unstructured(self):
+        assert axis_coordinates(UnstructuredGridBmiModel(), 0) is None
+
+
+class TestRegionIndices:
+    def test_uniform_rectilinear(self):
+        indices, shape = region_indices(StepModel(), 0, (1.0, 0.5, 5.0, 2.0))
+
+        np.testing.assert_array_equal(indices, [5, 6, 9, 10])
+        assert shape == (2, 2)
+
+    def test_crosses_antimeridian(self):
+        indices, shape = region_indices(StepModel(), 0, (5.0, 0.0, 1.0, 0.0))
+
+        np.testing.assert_array_equal(indices, [0, 3])
+        assert shape == (1, 2)
+
+    def test_rectilinear_3d_keeps_all_layers(self):
+        indices, shape = region_indices(Rect3DGridModel(), 0, (0.15, 1.0, 0.25, 1.15))
+
+        np.testing.assert_array_equal(indices, [1, 13])
+        assert shape == (2, 1, 1)
+
+    def test_unstructured(self):
+        indices, shape = region_indices(UnstructuredGridBmiModel(), 0, (0.5, 0.5, 3.5, 2.5))
+
+        np.testing.assert_array_equal(indices, [1, 2])
+        assert shape == (2,)
+
+    def test_structured_quadrilateral(self):
+        indices, shape = region_indices(Structured2DQuadrilateralsGridModel(), 0, (1.0, 0.0, 2.5, 2.5))
+
+        np.testing.assert_array_equal(indices, [0, 2, 3])
+        assert shape == (3,)
+
+    def test_empty(self):
+        indices, shape = region_indices(StepModel(), 0, (100.0, 100.0, 200.0, 200.0))
+
+        assert indices.size == 0
+        assert shape == (0, 0)
+
+    @pytest.mark.parametrize('bbox', [(0.0, 0.0, 1.0), (0.0, 2.0, 1.0, 1.0)])
+    def test_invalid_box(self, bbox):
+        with pytest.raises(ValueError, match='Bounding box'):
+            region_indices(StepModel(), 0, bbox)
+
+
+def test_cache_computes_region_once():
+    model = StepModel()
+    calls = []
+    get_grid_shape = model.get_grid_shape
+    model.get_grid_shape = lambda grid, shape: calls.append(grid) or get_grid_shape(grid, shape)
+    cache = RegionCache(model)
+
+    cache.indices(0, (1, 0, 5, 2))
+    cache.indices(0, (1.0, 0.0, 5.0, 2.0))
+
+    assert calls == [0]
+
+
+def test_cache_keeps_recently_used_regions():
+    cache = RegionCache(StepModel(), max_size=2)
+
+    for bbox in [(0, 0, 1, 1), (0, 0, 2, 2), (0, 0, 1, 1), (0, 0, 3, 3)]:
+        cache.indices(0, bbox)
+
+    assert list(cache.regions) == [(0, 0.0, 0.0, 1.0, 1.0), (0, 0.0, 0.0, 3.0, 3.0)]
+
+
+class TestCoarsen:
+    def test_mean(self):
+        values = coarsen(np.arange(12), (3, 4), (1, 2))
+
+        np.testing.assert_array_equal(values, [[0.5, 2.5], [4.5, 6.5], [8.5, 10.5]])
+
+    def test_mean_partial_block(self):
+        values = coarsen(np.arange(12), (3, 4), [2])
+
+        np.testing.assert_array_equal(values, [[2.5, 4.5], [8.5, 10.5]])
+
+    def test_mean_ignores_nan(self):
+        values = coarsen(np.array([1.0, np.nan, np.nan, np.nan]), (2, 2), [2])
+
+        np.testing.assert_array_equal(values, [[1.0]])
+
+    def test_stride(self):
+        values = coarsen(np.arange(12, dtype=np.int32), (3, 4), (2, 3), 'stride')
+
+        np.testing.assert_array_equal(values, [[0, 3], [8, 11]])
+        assert values.dtype == np.int32
+
+    def test_unknown_method(self):
+        with pytest.raises(ValueError, match='Unknown method'):
+            coarsen(np.arange(12), (3, 4), [2], 'median')
+
+    @pytest.mark.parametrize('factors', [(0, 1), (1, 2, 3)])
+    def test_invalid_factors(self, factors):
+        with pytest.raises(ValueError, match='Expected a factor'):
+            coarsen(np.arange(12), (3, 4), factors)
+
+    def test_grid_mean(self):
+        coarse = coarsen_grid(StepModel(), 0, np.arange(12), [2])
+
+        np.testing.assert_array_equal(coarse.spacing, [2.0, 4.0])
+        np.testing.assert_array_equal(coarse.origin, [0.5, 1.0])
+
+    def test_grid_stride(self):
+        coarse = coarsen_grid(StepModel(), 0, np.arange(12), [2], 'stride')
+
+        np.testing.assert_array_equal(coarse.spacing, [2.0, 4.0])
+        np.testing.assert_array_equal(coarse.origin, [0.0, 0.0])
+
+    def test_grid_rectilinear(self):
+        coarse = coarsen_grid(Rect3DGridModel(), 0, np.ones(24), [2])
+
+        assert coarse.values.shape == (1, 2, 2)
+        assert coarse.spacing.size == 0
+
+    def test_grid_unstructured(self):
+        with pytest.raises(ValueError, match='only structured grids'):
+            coarsen_grid(UnstructuredGridBmiModel(), 0, np.ones(6), [2])
+
+    def test_grid_other_size(self):
+        with pytest.raises(ValueError, match='a value per node'):
+            coarsen_grid(StepModel(), 0, np.ones(5), [2])
+
+
+class TestServer:
+    @pytest.fixture
+    def client(self, serve_model):
+        client = serve_model(StepModel())
+        client.initialize(None)
+        return client
+
+    def test_region(self, client):
+        client.update()
+
+        values = client.get_value_in_region(VAR, (1.0, 0.5, 5.0, 2.0))
+
+        np.testing.assert_array_equal(values, [[6, 7], [10, 11]])
+
+    def test_empty_region(self, client):
+        values = client.get_value_in_region(VAR, (100.0, 100.0, 200.0, 200.0))
+
+        assert values.shape == (0, 0)
+
+    def test_pipelined(self, serve_model):
+        client = serve_model(StepModel(), pipeline=True)
+        client.initialize(None)
+        client.update()
+
+        values = client.get_value_in_region(VAR, (0.0, 0.0, 0.0, 0.0))
+
+        np.testing.assert_array_equal(values, [[1]])
+
+    def test_region_larger_than_message(self, serve_model):
+        client = serve_model(HugeStepModel())
+
+        values = client.get_value_in_region(VAR, (0.0, 0.0, 2000.0, 1000.0))
+
+        np.testing.assert_array_equal(values, np.arange(10 ** 6).reshape(1000, 1000))
+
+    def test_invalid_box(self, client):
+        with pytest.raises(grpc.RpcError, match='Bounding box'):
+            client.get_value_in_region(VAR, (0.0, 0.0, 1.0))
+
+    def test_coarsened(self, client):
+        coarse = client.get_value_coarsened(VAR, 2)
+
+        np.testing.assert_array_equal(coarse.values, [[2.5, 4.5], [8.5, 10.5]])
+        np.testing.assert_array_equal(coarse.spacing, [2.0, 4.0])
+        np.testing.assert_array_equal(coarse.origin, [0.5, 1.0])
+
+    def test_coarsened_larger_than_message(self, serve_model):
+        client = serve_model(HugeStepModel())
+
+        coarse = client.get_value_coarsened(VAR, 1)
+
+        np.testing.assert_array_equal(coarse.values, np.arange(10 ** 6).reshape(1000, 1000))
+
+    def test_coarsened_stride(self, client):
+        coarse = client.get_value_coarsened(VAR, (1, 2), 'stride')
+
+        np.testing.assert_array_equal(coarse.values, [[0, 2], [4, 6], [8, 10]])
+
+    def test_coarsened_pipelined(self, serve_model):
+        client = serve_model(StepModel(), pipeline=True)
+        client.initialize(None)
+        client.update()
+
+        coarse = client.get_value_coarsened(VAR, (3, 4))
+
+        np.testing.assert_array_equal(coarse.values, [[6.5]])
+
+    def test_coarsened_unknown_method(self, client):
+        with pytest.raises(grpc.RpcError, match='Unknown method'):
+            client.get_value_coarsened(VAR, 2, 'median')
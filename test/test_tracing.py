@@ -0,0 +1,184 @@
+import json
+from concurrent import futures
+
+import grpc
+import pytest
+
+from grpc4bmi import bmi_pb2_grpc
+from grpc4bmi.bmi_grpc_client import BmiClient
+from grpc4bmi.bmi_grpc_server import BmiServer
+from grpc4bmi.tracing import AioTracingInterceptor, ChromeTraceExporter, SpanContext, TracedModel, Tracer, \
+    TracingInterceptor, current_span, merge_traces
+from test.fake_models import StepModel
+
+
+class MemoryExporter:
+    def __init__(self):
+        self.events = []
+
+    def export(self, event):
+        self.events.append(event)
+
+    def by_name(self, name):
+        return [e for e in self.events if e['name'] == name]
+
+
+class TestSpanContext:
+    def test_roundtrip(self):
+        context = SpanContext('0af7651916cd43dd8448eb211c80319c', 'b7ad6b7169203331')
+
+        assert SpanContext.from_traceparent(context.to_traceparent()) == context
+
+    def test_malformed(self):
+        assert SpanContext.from_traceparent('garbage') is None
+
+
+class TestTracer:
+    def test_nested_spans(self):
+        exporter = MemoryExporter()
+        tracer = Tracer(exporter)
+
+        with tracer.span('outer') as outer:
+            with tracer.span('inner') as inner:
+                assert current_span() == inner
+
+        assert current_span() is None
+        assert inner.trace_id == outer.trace_id
+        inner_event, outer_event = exporter.events
+        assert inner_event['args']['parent_id'] == outer.span_id
+        assert 'parent_id' not in outer_event['args']
+        assert outer_event['ph'] == 'X'
+        assert outer_event['dur'] >= inner_event['dur']
+
+    def test_error(self):
+        exporter = MemoryExporter()
+        tracer = Tracer(exporter)
+
+        with pytest.raises(ValueError):
+            with tracer.span('failing'):
+                raise ValueError('bad')
+
+        assert exporter.events[0]['args']['error'] == "ValueError('bad')"
+
+    def test_traced_model(self):
+        exporter = MemoryExporter()
+        model = TracedModel(StepModel(), Tracer(exporter))
+
+        model.update()
+
+        assert exporter.events[0]['name'] == 'StepModel.update'
+        assert exporter.events[0]['cat'] == 'model'
+
+
+class TestChromeTraceExporter:
+    def test_flush(self, tmp_path):
+        path = tmp_path / 'trace.json'
+        tracer = Tracer(ChromeTraceExporter(str(path), 'coupler'))
+        with tracer.span('step'):
+            pass
+
+        tracer.exporter.flush()
+
+        events = json.loads(path.read_text())['traceEvents']
+        assert events[0] == {'name': 'process_name', 'ph': 'M', 'pid': tracer.exporter.pid,
+                             'args': {'name': 'coupler'}}
+        assert events[1]['name'] == 'step'
+
+    def test_moves_spans_to_disk(self, tmp_path):
+        path = tmp_path / 'trace.json'
+        exporter = ChromeTraceExporter(str(path), 'coupler', buffer_size=10)
+        tracer = Tracer(exporter)
+        for _ in range(25):
+            with tracer.span('step'):
+                pass
+
+        assert len(exporter.events) == 6
+        exporter.flush()
+        exporter.close()
+
+        events = json.loads(path.read_text())['traceEvents']
+        assert [e['name'] for e in events] == ['process_name'] + ['step'] * 25
+
+    def test_merge_traces(self, tmp_path):
+        paths = []
+        for name in ('client', 'server'):
+            path = str(tmp_path / f'{name}.json')
+            tracer = Tracer(ChromeTraceExporter(path, name))
+            with tracer.span('step'):
+                pass
+            tracer.exporter.flush()
+            paths.append(path)
+        output = tmp_path / 'timeline.json'
+
+        merge_traces(paths, str(output))
+
+        events = json.loads(output.read_text())['traceEvents']
+        assert [e['pid'] for e in events] == [1, 1, 2, 2]
+
+
+@pytest.fixture
+def traced_client():
+    exporter = MemoryExporter()
+    tracer = Tracer(exporter)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10), interceptors=[TracingInterceptor(tracer)])
+    bmi_pb2_grpc.add_BmiServiceServicer_to_server(BmiServer(StepModel(), tracer=tracer), server)
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+    client = BmiClient(BmiClient.create_grpc_channel(port), timeout=5)
+    client.trace(tracer)
+    yield client, tracer, exporter
+    server.stop(0)
+
+
+class TestPropagation:
+    def test_update(self, traced_client):
+        client, tracer, exporter = traced_client
+
+        with tracer.span('timestep') as step:
+            client.update()
+
+        client_span, = [e for e in exporter.by_name('update') if e['cat'] == 'rpc.client']
+        server_span, = [e for e in exporter.by_name('update') if e['cat'] == 'rpc.server']
+        model_span, = exporter.by_name('StepModel.update')
+        assert client_span['args']['parent_id'] == step.span_id
+        assert server_span['args']['parent_id'] == client_span['args']['span_id']
+        assert model_span['args']['parent_id'] == server_span['args']['span_id']
+        assert {client_span['args']['trace_id'], server_span['args']['trace_id'], model_span['args']['trace_id']} \
+            == {step.trace_id}
+
+    def test_update_async(self, traced_client):
+        client, tracer, exporter = traced_client
+
+        client.update_async().result(5)
+
+        client_span, = [e for e in exporter.by_name('update') if e['cat'] == 'rpc.client']
+        server_span, = [e for e in exporter.by_name('update') if e['cat'] == 'rpc.server']
+        assert server_span['args']['parent_id'] == client_span['args']['span_id']
+
+    def test_server_without_client_trace(self):
+        exporter = MemoryExporter()
+        tracer = Tracer(exporter)
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=1), interceptors=[TracingInterceptor(tracer)])
+        bmi_pb2_grpc.add_BmiServiceServicer_to_server(BmiServer(StepModel(), tracer=tracer), server)
+        port = server.add_insecure_port('localhost:0')
+        server.start()
+        try:
+            BmiClient(BmiClient.create_grpc_channel(port), timeout=5).update()
+        finally:
+            server.stop(0)
+
+        server_span, = exporter.by_name('update')
+        assert 'parent_id' not in server_span['args']
+
+
+def test_aio_server_propagates_to_model(serve_aio_model):
+    exporter = MemoryExporter()
+    tracer = Tracer(exporter)
+    client = serve_aio_model(StepModel(), interceptors=[AioTracingInterceptor(tracer)], tracer=tracer)
+    client.trace(tracer)
+
+    client.update()
+
+    server_span, = [e for e in exporter.by_name('update') if e['cat'] == 'rpc.server']
+    model_span, = exporter.by_name('StepModel.update')
+    assert model_span['args']['parent_id'] == server_span['args']['span_id']